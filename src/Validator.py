@@ -20,7 +20,8 @@ Validator object
 """
 
 import asyncio
-import copy
+from collections import defaultdict
+from functools import lru_cache
 import logging
 
 from termcolor import colored
@@ -28,6 +29,15 @@ from termcolor import colored
 from src.rules.rules import SingleRuleFailure
 from src import logging_helper
 
+# How a rule is tracked before any messages arrive, keyed on the leading token of
+# its condition name (e.g. "never" for "never_fire", "may" for "may_pattern").
+# Rules that should never fire start out as passed, may rules are not tracked, and
+# everything else starts out as failed until it is matched.
+RULE_CLASSES = {"never": "pass", "fail": "pass", "may": "skip"}
+
+# The results report colors the same keys and rules every time it is built
+_colored = lru_cache(maxsize=4096)(colored)
+
 
 class MissingRuleError(Exception):
     """
@@ -51,25 +61,46 @@ class Validator:
         logger: logging.Logger = logging_helper.get_logger(),
     ) -> None:
         self.__rules_map = rules_map
-        self.__rules_tracking = copy.deepcopy(rules_map)
-        self.__passed_rules = {}
-        self.__failed_rules = {}
-
-        for key in self.__rules_map.keys():
-            for rule in self.__rules_map[key]:
-                if rule.friendly_str.startswith(
-                    "never_fire"
-                ) or rule.friendly_str.startswith("fail"):
-                    if key not in self.__passed_rules:
-                        self.__passed_rules[key] = []
-                    self.__passed_rules[key].append(rule.friendly_str)
-                elif rule.friendly_str.startswith("may_"):
+        # Rules are not mutated after they are built, so the tracking map only
+        # needs its own list containers
+        self.__rules_tracking = {k: v.copy() for k, v in rules_map.items()}
+        self.__passed_rules = defaultdict(set)
+        self.__failed_rules = defaultdict(set)
+
+        # Evaluation plan for each attribute. Each entry is the rule, its
+        # friendly string, and its constant outcome (None if the rule has to be
+        # called).
+        self.__rule_plans = {}
+
+        buckets = {"pass": self.__passed_rules, "fail": self.__failed_rules}
+        for key, rules in self.__rules_map.items():
+            plan = self.__rule_plans[key] = []
+            reachable = True
+            for rule in rules:
+                friendly_str = rule.friendly_str
+                condition = friendly_str.partition(":")[0]
+
+                if reachable:
+                    # build_rule marks rules whose outcome doesn't depend on
+                    # the message
+                    outcome = getattr(rule, "constant_result", None)
+                    plan.append((rule, friendly_str, outcome))
+
+                    # validate() stops at the first passing rule, so rules after
+                    # one that always passes are never evaluated
+                    reachable = outcome is not True
+
+                rule_class = RULE_CLASSES.get(
+                    condition.partition("_")[0], "fail"
+                )
+                if rule_class == "skip":
                     # May rules are not tracked
                     continue
-                else:
-                    if key not in self.__failed_rules:
-                        self.__failed_rules[key] = []
-                    self.__failed_rules[key].append(rule.friendly_str)
+                buckets[rule_class][key].add(friendly_str)
+
+        # Formatted results keyed on `detailed`, cleared whenever a rule is applied
+        self.__results_cache = {}
+        self.__results_dirty = False
 
         self.__state_completed = state_completed
         self.__logger = logger
@@ -95,49 +126,57 @@ class Validator:
         Returns:
             str: A string representation of the validation results.
         """
+        if self.__results_dirty:
+            self.__results_cache.clear()
+            self.__results_dirty = False
+        elif detailed in self.__results_cache:
+            return self.__results_cache[detailed]
+
         header = "Validation Results\n"
-        output = "\n"
-        output += "-" * (len(header) - 1) + "\n"
-        output += header
-        output += "-" * (len(header) - 1) + "\n"
+        separator = "-" * (len(header) - 1) + "\n"
+        parts = ["\n", separator, header, separator]
+        indent = " " * 4
 
         total = 0
         matched = 0
         for key, value in self.__passed_rules.items():
+            rule_count = len(self.__rules_map[key])
+            failed = self.__failed_rules.get(key)
             key_color = "green"
 
-            if key in self.__failed_rules:
-                key_color = "red"
+            if failed is not None:
+                key_color = "yellow" if len(failed) < rule_count else "red"
 
-                if len(self.__failed_rules[key]) < len(self.__rules_map[key]):
-                    key_color = "yellow"
-
-            total += len(self.__rules_map[key])
+            total += rule_count
             matched += len(value)
 
             if detailed:
-                output += f"{colored(key, key_color)}:\n"
-                for v in value:
-                    output += f"{' ' * 4}{colored(v, 'green')}\n"
-                if key in self.__failed_rules:
-                    for v in self.__failed_rules[key]:
-                        output += f"{' ' * 4}{colored(v, 'red')}\n"
+                parts.append(f"{_colored(key, key_color)}:\n")
+                for v in sorted(value):
+                    parts.append(f"{indent}{_colored(v, 'green')}\n")
+                if failed is not None:
+                    for v in sorted(failed):
+                        parts.append(f"{indent}{_colored(v, 'red')}\n")
             else:
-                output += f"{colored(key, key_color)}: {colored(f'{len(value)}/{len(self.__rules_map[key])}', key_color)}\n"
+                parts.append(f"{_colored(key, key_color)}: {_colored(f'{len(value)}/{rule_count}', key_color)}\n")
 
         for key, values in self.__failed_rules.items():
-            if key not in self.__passed_rules:
-                key_color = "red"
-                total += len(self.__rules_map[key])
-
-                output += f"{colored(key, key_color)}:\n"
-                for v in values:
-                    output += f"{' ' * 4}{colored(v, 'red')}\n"
-
-        output += "-" * (len(header) - 1) + "\n"
-        output += f"Matched: {colored(matched, 'green') if matched > 0 else matched} / {total} "
-        output += f"(Failures: {colored(total - matched, 'red') if total - matched > 0 else total - matched})\n"
-        output += "-" * (len(header) - 1) + "\n"
+            # Attributes with passed rules were fully handled above
+            if key in self.__passed_rules:
+                continue
+
+            total += len(self.__rules_map[key])
+
+            parts.append(f"{_colored(key, 'red')}:\n")
+            for v in sorted(values):
+                parts.append(f"{indent}{_colored(v, 'red')}\n")
+
+        parts.append(separator)
+        parts.append(f"Matched: {_colored(matched, 'green') if matched > 0 else matched} / {total} ")
+        parts.append(f"(Failures: {_colored(total - matched, 'red') if total - matched > 0 else total - matched})\n")
+        parts.append(separator)
+
+        output = self.__results_cache[detailed] = "".join(parts)
         return output
 
     def validate(self, attribute: str, value: str) -> bool:
@@ -160,57 +199,58 @@ class Validator:
             )
             raise MissingRuleError(attribute)
 
-        self.__logger.debug(
-            "Validating attribute: %s, value: %s", attribute, value
-        )
-        self.__logger.debug("Checking rules: %s", self.__rules_map[attribute])
-        for rule in self.__rules_map[attribute]:
-            if hasattr(rule, "friendly_str"):
-                self.__logger.debug("rule params: %s", rule.friendly_str)
-                friendly_str = rule.friendly_str
-            else:
-                friendly_str = {}
+        if self.__logger.isEnabledFor(logging.DEBUG):
+            self.__logger.debug(
+                "Validating attribute: %s, value: %s", attribute, value
+            )
+            self.__logger.debug(
+                "Checking rules: %s", self.__rules_map[attribute]
+            )
+        return self.__apply_rules(attribute, self.__rule_plans[attribute], value)
 
-            try:
-                if rule(value):
-                    if attribute not in self.__passed_rules:
-                        self.__passed_rules[attribute] = []
+    def __apply_rules(self, attribute: str, plan: list, value: str) -> bool:
+        """
+        Runs a value through an attribute's evaluation plan and records the results.
 
-                    if friendly_str not in self.__passed_rules[attribute]:
-                        self.__passed_rules[attribute].append(friendly_str)
+        Args:
+            attribute (str): The attribute being validated.
+            plan (list): The evaluation plan for the attribute.
+            value (str): The value of the attribute.
+
+        Returns:
+            bool: True if a rule passed, False otherwise.
+        """
+        self.__results_dirty = True
+        debug = self.__logger.isEnabledFor(logging.DEBUG)
+        for rule, friendly_str, outcome in plan:
+            if debug:
+                self.__logger.debug("rule params: %s", friendly_str)
+
+            try:
+                if rule(value) if outcome is None else outcome:
+                    self.__passed_rules[attribute].add(friendly_str)
 
                     # If this is a must_fire rule, remove it from failed rules
-                    if (
-                        isinstance(friendly_str, str)
-                        and attribute in self.__failed_rules
-                        and friendly_str in self.__failed_rules[attribute]
-                    ):
-                        self.__failed_rules[attribute].remove(friendly_str)
+                    failed = self.__failed_rules.get(attribute)
+                    if failed is not None and friendly_str in failed:
+                        failed.remove(friendly_str)
 
                         # Clean up if no more failed rules for this attribute
-                        if len(self.__failed_rules[attribute]) == 0:
+                        if not failed:
                             del self.__failed_rules[attribute]
 
                     return True
             except SingleRuleFailure as e:
-                # Add the failed rule to the failed rules list
-                if attribute not in self.__failed_rules:
-                    self.__failed_rules[attribute] = []
-                if e not in self.__failed_rules[attribute]:
-                    self.__failed_rules[attribute].append(e)
+                # Add the failed rule to the failed rules set. Track the message
+                # rather than the exception so repeated failures are deduplicated.
+                self.__failed_rules[attribute].add(e.message)
                 continue
 
-            if attribute not in self.__failed_rules:
-                self.__failed_rules[attribute] = []
-            if friendly_str not in self.__failed_rules[attribute]:
-                self.__failed_rules[attribute].append(friendly_str)
+            self.__failed_rules[attribute].add(friendly_str)
 
-                # Remove from passed rules if it was previously marked as passed
-                if (
-                    attribute in self.__passed_rules
-                    and friendly_str in self.__passed_rules[attribute]
-                ):
-                    self.__passed_rules[attribute].remove(friendly_str)
+            # Remove from passed rules if it was previously marked as passed
+            if attribute in self.__passed_rules:
+                self.__passed_rules[attribute].discard(friendly_str)
 
         return False
 
@@ -219,18 +259,51 @@ class Validator:
         Start validating events from the msg_queue.
 
         Args:
-            msg_queue (asyncio.Queue): The msg_queue to get messages from.
+            msg_queue (asyncio.Queue): The msg_queue to get messages from. Any queue
+                with the same get/get_nowait interface, such as a FastQueue, works too.
         """
         while not self.__state_completed.done():
-            try:
-                msg = await asyncio.wait_for(msg_queue.get(), timeout=None)
-                self.__logger.debug(
-                    "Validating message with trigger: %s and value: %s",
-                    msg[0],
-                    msg[1],
-                )
+            # The validator task is cancelled when the test moves on to the next
+            # state, so there is no need to wrap the get in a timeout
+            msgs = [await msg_queue.get()]
+
+            # Messages tend to arrive in bursts, so drain everything that is
+            # already queued and validate it per attribute
+            while True:
                 try:
-                    result = self.validate(msg[0], msg[1])
+                    msgs.append(msg_queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+
+            # Rule tracking is per attribute, so only the order of messages
+            # within an attribute matters
+            batches = defaultdict(list)
+            for attribute, value in msgs:
+                batches[attribute].append(value)
+
+            # Skip building the debug arguments (including the colored result)
+            # for every message unless they will actually be logged
+            debug = self.__logger.isEnabledFor(logging.DEBUG)
+            for attribute, values in batches.items():
+                plan = self.__rule_plans.get(attribute)
+                if plan is None:
+                    self.__logger.debug(
+                        "Message validation skipped (no rules): %s",
+                        attribute,
+                    )
+                    continue
+
+                for value in values:
+                    if not debug:
+                        self.__apply_rules(attribute, plan, value)
+                        continue
+
+                    self.__logger.debug(
+                        "Validating message with trigger: %s and value: %s",
+                        attribute,
+                        value,
+                    )
+                    result = self.__apply_rules(attribute, plan, value)
 
                     self.__logger.debug(
                         "Message validation result: %s",
@@ -239,11 +312,5 @@ class Validator:
                             "green" if result else "red",
                         ),
                     )
-                except MissingRuleError as e:
-                    self.__logger.debug(
-                        "Message validation skipped (no rules): %s", e
-                    )
-            except asyncio.TimeoutError:
-                continue
 
         self.__logger.debug("Validator finished processing messages.")
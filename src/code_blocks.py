@@ -0,0 +1,66 @@
+"""Copyright (C) 2026 Network RADIUS SAS (legal@networkradius.com)
+
+This software may not be redistributed in any form without the prior
+written consent of Network RADIUS.
+
+THIS SOFTWARE IS PROVIDED BY THE AUTHOR AND CONTRIBUTORS ``AS IS'' AND
+ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+ARE DISCLAIMED.  IN NO EVENT SHALL THE AUTHOR OR CONTRIBUTORS BE LIABLE
+FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS
+OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)
+HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY
+OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF
+SUCH DAMAGE."""
+"""code_blocks.py
+Compile the user code blocks of code rules and code events into functions.
+"""
+
+import ast
+
+
+def compile_block(
+    block: str, arg_names: tuple[str, ...], filename: str
+) -> callable:
+    """
+    Compile a code block into a function.
+
+    The block becomes the body of a function taking `arg_names`, so it can use
+    them and `return` a result. An empty block returns None.
+
+    Args:
+        block (str): The code block to compile.
+        arg_names (tuple[str, ...]): The names of the function's arguments.
+        filename (str): The filename reported in tracebacks and syntax errors.
+
+    Returns:
+        callable: The compiled function.
+
+    Raises:
+        SyntaxError: If the block is not valid Python.
+    """
+    tree = ast.parse(block, filename)
+    wrapped_code = ast.Module(
+        body=[
+            ast.FunctionDef(
+                name="_block",
+                args=ast.arguments(
+                    posonlyargs=[],
+                    args=[ast.arg(name) for name in arg_names],
+                    kwonlyargs=[],
+                    kw_defaults=[],
+                    defaults=[],
+                ),
+                body=tree.body or [ast.Pass()],
+                decorator_list=[],
+            )
+        ],
+        type_ignores=[],
+    )
+    ast.fix_missing_locations(wrapped_code)
+
+    namespace = {}
+    exec(compile(wrapped_code, filename, "exec"), namespace)
+    return namespace["_block"]
@@ -24,6 +24,8 @@ for a multi-server test, and generates two output files:
 """
 
 import argparse
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 import os
 import sys
 from pathlib import Path
@@ -31,36 +33,68 @@ from typing import Tuple
 import jinja2
 import yaml
 
+# Use the libyaml bindings when PyYAML was built with them
+try:
+    from yaml import CSafeLoader as YamlLoader, CSafeDumper as YamlDumper
+except ImportError:
+    from yaml import SafeLoader as YamlLoader, SafeDumper as YamlDumper
 
-class NoQuotedMergeDumper(yaml.SafeDumper):
+
+class NoQuotedMergeDumper(YamlDumper):
     """
     Custom YAML dumper that avoids quoting merge keys (<<).
     """
 
-    def represent_scalar(self, tag, value, style=None):
-        """
-        Custom representer for scalar values to handle multi-line strings as block style.
-        """
-        if isinstance(value, str) and "\n" in value:
-            style = "|"
-        return super().represent_scalar(tag, value, style)
-
 
 def no_quoted_merge_key(dumper, data):
     """
-    Custom representer to avoid quoting merge keys (<<).
+    Custom representer for strings.
+
+    Avoids quoting merge keys (<<) and dumps multi-line strings as block style.
+    Only strings can contain newlines, so handling both here keeps the check
+    off the path for every other scalar type.
     """
     if data == "<<":
         return dumper.represent_scalar(
             "tag:yaml.org,2002:merge", data, style=""
         )
-    return dumper.represent_scalar("tag:yaml.org,2002:str", data)
+    return dumper.represent_scalar(
+        "tag:yaml.org,2002:str", data, style="|" if "\n" in data else None
+    )
 
 
 # Register the custom representer
 NoQuotedMergeDumper.add_representer(str, no_quoted_merge_key)
 
 
+@lru_cache(maxsize=None)
+def _template_env(search_paths: tuple[str, ...]) -> jinja2.Environment:
+    """
+    Get a Jinja2 environment for the given template search paths.
+
+    Environments are cached so that templates are only loaded and compiled once
+    per process, no matter how many times they are rendered.
+
+    Args:
+        search_paths (tuple[str, ...]): The paths to search for templates.
+
+    Returns:
+        jinja2.Environment: The configured environment.
+    """
+    template_loader = jinja2.FileSystemLoader(searchpath=list(search_paths))
+    template_env = jinja2.Environment(
+        loader=template_loader, auto_reload=False, cache_size=-1
+    )
+    template_env.globals.update(
+        os=os,
+    )
+    return template_env
+
+
+# Fixture keys holding services which get the default capabilities merged in
+_SERVICE_PREFIXES = ("services", "hosts")
+
+
 def _parse_config(config: dict) -> Tuple[dict, dict]:
     """
     Parses a configuration dictionary and separates the compose and test configurations.
@@ -81,12 +115,12 @@ def _parse_config(config: dict) -> Tuple[dict, dict]:
             compose_configs["x-common-config"] = default_capabilities
 
             for compose_key, compose_value in value.items():
-                if compose_key.startswith(tuple(["services", "hosts"])):
-                    updated_services = {}
-                    for service_name, service_config in compose_value.items():
-                        service_config["<<"] = default_capabilities
-                        updated_services[service_name] = service_config
-                    compose_configs["services"] = updated_services
+                if compose_key.startswith(_SERVICE_PREFIXES):
+                    # Build new service dicts rather than modifying the caller's config
+                    compose_configs["services"] = {
+                        service_name: {**service_config, "<<": default_capabilities}
+                        for service_name, service_config in compose_value.items()
+                    }
                 else:
                     compose_configs["services"] = compose_value
         else:
@@ -115,17 +149,13 @@ def generate_configs(file_path: Path) -> None:
     # If the config file is already rendered, just parse it
     if file_path.suffix == ".yml":
         with open(file_path, "r", encoding="utf-8") as file:
-            config = yaml.safe_load(file)
+            config = yaml.load(file, Loader=YamlLoader)
     elif file_path.suffix == ".j2":
         # If the config file is a Jinja2 template, render it
-        template_loader = jinja2.FileSystemLoader(searchpath=file_path.parent)
-        template_env = jinja2.Environment(loader=template_loader)
-        template_env.globals.update(
-            os=os,
-        )
+        template_env = _template_env((str(file_path.parent),))
         template = template_env.get_template(file_path.name)
         rendered_config = template.render()
-        config = yaml.safe_load(rendered_config)
+        config = yaml.load(rendered_config, Loader=YamlLoader)
     else:
         raise ValueError(
             "Unsupported file type. Only .yml and .j2 are supported."
@@ -139,18 +169,29 @@ def write_yaml_to_file(data: dict, output_path: Path) -> None:
     """
     Writes a dictionary to a YAML file.
 
+    The file is left untouched if it already holds the same YAML, so its
+    modification time only changes when its contents do.
+
     Args:
         data (dict): The data to write to the YAML file.
         output_path (Path): The path to the output YAML file.
     """
+    output = yaml.dump(
+        data,
+        default_flow_style=False,
+        sort_keys=False,
+        Dumper=NoQuotedMergeDumper,
+    )
+
+    try:
+        with open(output_path, "r", encoding="utf-8") as file:
+            if file.read() == output:
+                return
+    except (FileNotFoundError, UnicodeDecodeError):
+        pass
+
     with open(output_path, "w", encoding="utf-8") as file:
-        yaml.dump(
-            data,
-            file,
-            default_flow_style=False,
-            sort_keys=False,
-            Dumper=NoQuotedMergeDumper,
-        )
+        file.write(output)
 
 
 def generate_config_files(
@@ -202,7 +243,7 @@ def render_template_only(file_path: Path, variables_path: Path = None, include_p
         ValueError: If the configuration file is not a Jinja2 template.
     """
     # If the config file does not exist, raise an error
-    if not file_path.exists():
+    if not file_path.is_file():
         raise FileNotFoundError(
             f"Configuration file {file_path} does not exist."
         )
@@ -213,33 +254,27 @@ def render_template_only(file_path: Path, variables_path: Path = None, include_p
     # Set some variables
     config_vars = {}
     if variables_path is not None:
-        # Check if the variables file exists
-        if not variables_path.exists():
-            # Try to file the variables file treating the path as relative to the configuration file
-            potential_path = file_path.parent / variables_path
-            if potential_path.exists():
-                variables_path = potential_path
-            else:
-                # Try to find the variables treating the path as relative to the include paths
-                found = False
-                for path in include_path or []:
-                    potential_path = Path(path, variables_path)
-                    if potential_path.exists():
-                        variables_path = potential_path
-                        found = True
-                        break
-                if not found:
-                    raise FileNotFoundError(
-                        f"Variables file {variables_path} does not exist."
-                    )
+        # Look for the variables file as given, then relative to the configuration
+        # file, then relative to each of the include paths, stopping at the first hit
+        candidates = (
+            variables_path,
+            file_path.parent / variables_path,
+            *(Path(path, variables_path) for path in include_path or []),
+        )
+        for candidate in candidates:
+            if candidate.is_file():
+                variables_path = candidate
+                break
+        else:
+            raise FileNotFoundError(
+                f"Variables file {variables_path} does not exist."
+            )
         with open(variables_path, "r", encoding="utf-8") as var_file:
-            config_vars = yaml.safe_load(var_file)
+            config_vars = yaml.load(var_file, Loader=YamlLoader)
 
     # Render the Jinja2 template
-    template_loader = jinja2.FileSystemLoader(searchpath=[file_path.parent] + (include_path or []))
-    template_env = jinja2.Environment(loader=template_loader)
-    template_env.globals.update(
-        os=os,
+    template_env = _template_env(
+        (str(file_path.parent), *map(str, include_path or []))
     )
     template = template_env.get_template(file_path.name)
 
@@ -255,6 +290,42 @@ def render_template_only(file_path: Path, variables_path: Path = None, include_p
     with open(output_path, "w", encoding="utf-8") as file:
         file.write(rendered_config)
 
+
+def render_templates(file_paths: list[Path], variables_path: Path = None, include_path: list = None) -> None:
+    """
+    Renders multiple Jinja2 template configuration files in parallel.
+
+    Each template is rendered with `render_template_only` in a separate worker
+    process, writing the output next to the template without the .j2 extension.
+    Rendering is CPU bound, so processes are used rather than threads which
+    would be serialized by the GIL.
+
+    Args:
+        file_paths (list[Path]): The paths to the Jinja2 template configuration files.
+        variables_path (Path, optional): The path to a YAML file containing variables for rendering.
+            Defaults to None.
+        include_path (list, optional): Additional search paths for Jinja2 templates.
+            Defaults to None.
+
+    Raises:
+        FileNotFoundError: If a configuration file does not exist.
+        ValueError: If a configuration file is not a Jinja2 template.
+    """
+    with ProcessPoolExecutor(max_workers=min(len(file_paths), os.cpu_count() or 1)) as executor:
+        futures = [
+            executor.submit(
+                render_template_only,
+                file_path,
+                variables_path=variables_path,
+                include_path=include_path,
+            )
+            for file_path in file_paths
+        ]
+        # Raise the first error in the order the files were given
+        for future in futures:
+            future.result()
+
+
 def parse_args(args=None, prog=__package__) -> argparse.Namespace:
     """
     Parses command line arguments for the configuration parser.
@@ -315,6 +386,16 @@ def parse_args(args=None, prog=__package__) -> argparse.Namespace:
         help="Enable auxiliary features. Enables rendering any auxiliary configurations " +
         "by just skipping other parsing logic and rendering the Jinja2 templates as-is.",
     )
+    parser.add_argument(
+        "--parallel-render",
+        dest="parallel_render",
+        type=str,
+        nargs="+",
+        metavar="FILE",
+        help="Additional auxiliary templates to render along with the configuration file, " +
+        "each in a separate process. Requires --aux-file.",
+        default=[],
+    )
     parser.add_argument(
         "--include-path",
         dest="include_path",
@@ -331,13 +412,25 @@ def interface() -> None:
     """
     parsed_args = parse_args()
 
+    if parsed_args.parallel_render and not parsed_args.auxiliary:
+        print("Error: --parallel-render can only be used with --aux-file.", file=sys.stderr)
+        sys.exit(1)
+
     if parsed_args.auxiliary:
         try:
-            render_template_only(
-                Path(parsed_args.config_file),
-                variables_path=parsed_args.variables_path,
-                include_path=parsed_args.include_path,
-            )
+            if parsed_args.parallel_render:
+                render_templates(
+                    [Path(parsed_args.config_file)]
+                    + [Path(file) for file in parsed_args.parallel_render],
+                    variables_path=parsed_args.variables_path,
+                    include_path=parsed_args.include_path,
+                )
+            else:
+                render_template_only(
+                    Path(parsed_args.config_file),
+                    variables_path=parsed_args.variables_path,
+                    include_path=parsed_args.include_path,
+                )
         except (FileNotFoundError, ValueError) as e:
             print(f"Error: {e}", file=sys.stderr)
             sys.exit(1)
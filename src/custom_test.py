@@ -28,7 +28,7 @@ from python_on_whales import DockerClient
 
 from src import logging_helper
 from src.states.state import State
-from src.listener import Listener, SocketListener, FileListener
+from src.listener import FastQueue, Listener, SocketListener, FileListener
 
 
 def create_test_logger(name: str, env_name: str) -> logging.Logger:
@@ -78,7 +78,7 @@ class Test:
         self.loop = loop
         self.logger = logger or create_test_logger(name, compose_file.stem)
         self.detail_level = detail_level
-        self.queue: asyncio.Queue = asyncio.Queue()
+        self.queue: FastQueue = FastQueue()
         self.listener_task: asyncio.Task = None
         self.client = DockerClient(
             compose_files=[self.compose_file], compose_project_name=self.name
@@ -253,11 +253,7 @@ class Test:
             # Register new validator for the current state
             # Clear the message queue to avoid processing old messages
             self.logger.debug("Clearing message queue for new state.")
-            while not self.queue.empty():
-                try:
-                    self.queue.get_nowait()
-                except asyncio.QueueEmpty:
-                    break
+            self.queue.clear()
 
             # Next, setup the state's validator
             self.logger.debug("Setting up validator for state: %s", state.name)
@@ -325,5 +321,5 @@ class Test:
         file_logger = logging_helper.get_file_logger()
         for result in test_results:
             file_logger.info(
-                "%s %s", f"Test.{self.name}.{self.compose_file.stem}", result
+                "Test.%s.%s %s", self.name, self.compose_file.stem, result
             )
@@ -20,15 +20,41 @@ Module for code events in a multi-server CI environment.
 """
 
 import logging
-from typing import Union
+from typing import Mapping, Union
 from python_on_whales import Container, Network
 
+from src.code_blocks import compile_block
+from src.events._registry import collect_events, event
+
 ValidContainer = Union[Container, str]
 ValidNetwork = Union[Network, str]
 
-EVENTS_MAP = {}  # A mapping of event names to their functions.
+# Compiled event functions, keyed by their code block.
+_COMPILED: dict[str, callable] = {}
+
+
+def _compile_block(block: str) -> callable:
+    """
+    Get the compiled function for a code block.
+
+    The block is compiled the first time it is seen, later calls reuse the
+    cached function.
 
+    Args:
+        block (str): The code block to compile.
 
+    Returns:
+        callable: A function taking the `source` and `logger` of the event.
+    """
+    func = _COMPILED.get(block)
+    if func is None:
+        func = _COMPILED[block] = compile_block(
+            block, ("source", "logger"), "<event>"
+        )
+    return func
+
+
+@event("code")
 def code(block: str, source: ValidContainer, logger: logging.Logger) -> None:
     """
     Execute a block of code for an event.
@@ -41,26 +67,21 @@ def code(block: str, source: ValidContainer, logger: logging.Logger) -> None:
     # TODO: Implement code safety checks before execution
     logger.debug("Executing code block for event.")
 
-    indented_block = "\n".join(f"    {line}" for line in block.splitlines())
-    wrapped_code = f"def _event_func():\n{indented_block}"
-
-    local_vars = {"source": source, "logger": logger}
     try:
-        exec(wrapped_code, local_vars)
-        local_vars.get("_event_func", lambda: None)()
+        _compile_block(block)(source=source, logger=logger)
         logger.debug("Code block executed successfully.")
     except Exception as e:
         logger.error("Error executing code block: %s", e)
 
 
-EVENTS_MAP.update({"code": code})
+EVENTS_MAP = collect_events(globals())  # A mapping of event names to their functions.
 
 
-def get_events() -> dict[str, callable]:
+def get_events() -> Mapping[str, callable]:
     """
-    Returns a dictionary of available code events.
+    Returns a read-only mapping of available code events.
 
     Returns:
-        dict[str, callable]: A dictionary mapping event names to their corresponding functions.
+        Mapping[str, callable]: A mapping of event names to their corresponding functions.
     """
     return EVENTS_MAP
@@ -20,14 +20,21 @@ SUCH DAMAGE."""
 import logging
 import re
 
-from typing import Union
-from python_on_whales import Container, docker
+from typing import Mapping, Union
+from python_on_whales import Container
+
+from src.events._docker_client import exec_in
+from src.events._registry import collect_events, event
+from src.events._shell_pool import get_shell
 
 ValidContainer = Union[Container, str]
 
-EVENTS_MAP = {}  # A mapping of event names to their functions.
+# Matches ${container_name} references in commands
+CONTAINER_VAR_PATTERN = re.compile(r"\$\{([a-zA-Z0-9_-]+)\}")
+_expand_container_vars = CONTAINER_VAR_PATTERN.sub
 
 
+@event("run_command", "execute_command", "command")
 def run_command(
     source: ValidContainer,
     command: str,
@@ -49,30 +56,28 @@ def run_command(
 
     # Using regex, search the command for any ${container_name} patterns and replace them
     # with the actual container name using the docker compose project name as a prefix.
-    pattern = re.compile(r"\$\{([a-zA-Z0-9_-]+)\}")
-    matches = pattern.findall(command)
-    for match in matches:
-        full_container_name = f"{test_name}-{match}-1"
-        command = command.replace(f"${{{match}}}", full_container_name)
+    # Most commands have no such references, so skip the regex for those.
+    if "${" in command:
+        command = _expand_container_vars(
+            lambda match: f"{test_name}-{match.group(1)}-1", command
+        )
 
     logger.debug("Running command in %s: %s", source, command)
-    docker.execute(source, ["bash", "-c", command], detach=detach)
+    if detach:
+        exec_in(source, ["bash", "-c", command], detach=True)
+    else:
+        # Attached commands reuse the container's persistent shell
+        get_shell(source).run(command)
 
 
-EVENTS_MAP.update(
-    {
-        "run_command": run_command,
-        "execute_command": run_command,
-        "command": run_command,
-    }
-)
+EVENTS_MAP = collect_events(globals())  # A mapping of event names to their functions.
 
 
-def get_events() -> dict[str, callable]:
+def get_events() -> Mapping[str, callable]:
     """
-    Returns a dictionary of available events that can be performed on containers.
+    Returns a read-only mapping of available events that can be performed on containers.
 
     Returns:
-        dict[str, callable]: A dictionary mapping event names to their corresponding functions.
+        Mapping[str, callable]: A mapping of event names to their corresponding functions.
     """
     return EVENTS_MAP
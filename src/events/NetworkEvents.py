@@ -17,97 +17,116 @@ SUCH DAMAGE."""
 
 """Network Events for Multi-Server CI tests."""
 
-from typing import Union
+from typing import Callable, Mapping, Union
 import asyncio
-from functools import singledispatch
 import logging
 
 from python_on_whales import Network, Container, docker
 from python_on_whales.exceptions import DockerException
 
+from src.events._docker_client import exec_in
+from src.events._registry import collect_events, event
+
 ValidNetwork = Union[Network, str]
 ValidContainer = Union[Container, str]
 
-EVENTS_MAP = {}  # A mapping of event names to their functions.
-
-
-@singledispatch
-def disconnect(network: ValidNetwork, targets: list[ValidContainer]) -> None:
-    """
-    Simulate network disconnection.
 
-    Args:
-        network (ValidNetwork): The network to disconnect from.
-        targets (list[ValidContainer]): List of valid containers to disconnect.
+async def _parallel(
+    func: Callable[[ValidNetwork, ValidContainer], None],
+    network: ValidNetwork,
+    targets: list[ValidContainer],
+) -> None:
     """
-    for target in targets:
-        docker.network.disconnect(network, target)
-
+    Run a blocking network operation for several containers concurrently.
 
-@disconnect.register
-def _(network: ValidNetwork, source: ValidContainer) -> None:
-    """
-    Simulate network disconnection.
+    Each docker call is run in a worker thread, so the per-call CLI startup
+    overlaps instead of adding up.
 
     Args:
-        network (ValidNetwork): The network to disconnect from.
-        source (ValidContainer): The valid container to disconnect.
+        func (Callable): The operation to run, called as `func(network, target)`.
+        network (ValidNetwork): The network to operate on.
+        targets (list[ValidContainer]): The containers to operate on.
     """
-    docker.network.disconnect(network, source)
+    await asyncio.gather(
+        *(asyncio.to_thread(func, network, target) for target in targets)
+    )
 
 
-@disconnect.register
-async def _(
-    network: ValidNetwork, targets: list[ValidContainer], timeout: int
-) -> None:
+def _targets(
+    source: ValidContainer, targets: ValidContainer | list[ValidContainer] | None
+) -> list[ValidContainer]:
     """
-    Simulate network disconnection with a timeout.
+    Get the containers a network event applies to.
 
     Args:
-        network (ValidNetwork): The network to disconnect from.
-        targets (list[ValidContainer]): List of valid containers to disconnect.
-        timeout (int): Time in seconds to wait before reconnecting.
-    """
-    for target in targets:
-        docker.network.disconnect(network, target)
-
-    await asyncio.sleep(timeout)
-    reconnect(network, targets)
+        source (ValidContainer): The container the event is listed under.
+        targets (ValidContainer | list[ValidContainer] | None): The targets of the event.
 
-
-@disconnect.register
-async def _(
-    network: ValidNetwork, source: ValidContainer, timeout: int
+    Returns:
+        list[ValidContainer]: The targets, or the source if there are none.
+    """
+    if targets is None:
+        return [source]
+    if isinstance(targets, list):
+        return targets
+    return [targets]
+
+
+@event("disconnect", "network_disconnect")
+async def disconnect(
+    network: ValidNetwork,
+    source: ValidContainer,
+    logger: logging.Logger,
+    targets: ValidContainer | list[ValidContainer] | None = None,
+    *,
+    timeout: float | None = None,
 ) -> None:
     """
-    Simulate network disconnection with a timeout.
+    Simulate network disconnection.
 
     Args:
         network (ValidNetwork): The network to disconnect from.
-        source (ValidContainer): The valid container to disconnect.
-        timeout (int): Time in seconds to wait before reconnecting.
+        source (ValidContainer): The container the event is listed under, disconnected
+            if no targets are given.
+        logger (logging.Logger): Logger for debug output.
+        targets (ValidContainer | list[ValidContainer], optional): Container or list of
+            containers to disconnect instead of the source. Defaults to None.
+        timeout (float, optional): Time in seconds to wait before reconnecting. The
+            containers stay disconnected if not given. Defaults to None.
     """
-    await disconnect(network, source, timeout=timeout)
+    logger.debug("Disconnecting %s from %s", targets or source, network)
+    await _parallel(docker.network.disconnect, network, _targets(source, targets))
 
+    if timeout is None:
+        return
 
-EVENTS_MAP.update({"disconnect": disconnect, "network_disconnect": disconnect})
+    await asyncio.sleep(timeout)
+    await reconnect(network, source, logger, targets)
 
 
-def reconnect(network: ValidNetwork, targets: list[ValidContainer]) -> None:
+@event("reconnect", "network_reconnect")
+async def reconnect(
+    network: ValidNetwork,
+    source: ValidContainer,
+    logger: logging.Logger,
+    targets: ValidContainer | list[ValidContainer] | None = None,
+) -> None:
     """
     Simulate network reconnection.
 
     Args:
         network (ValidNetwork): The network to reconnect to.
-        targets (list[ValidContainer]): List of valid containers to reconnect.
+        source (ValidContainer): The container the event is listed under, reconnected
+            if no targets are given.
+        logger (logging.Logger): Logger for debug output.
+        targets (ValidContainer | list[ValidContainer], optional): Container or list of
+            containers to reconnect instead of the source. Defaults to None.
     """
-    for target in targets:
-        docker.network.connect(network, target)
-
-
-EVENTS_MAP.update({"reconnect": reconnect, "network_reconnect": reconnect})
+    logger.debug("Reconnecting %s to %s", targets or source, network)
+    await _parallel(docker.network.connect, network, _targets(source, targets))
 
 
+@event("packet_loss")
 def packet_loss(
     source: ValidContainer, interface: str, loss: float, logger: logging.Logger
 ) -> None:
@@ -119,42 +138,46 @@ def packet_loss(
         interface (str): The network interface to apply packet loss on.
         loss (float): Percentage of packet loss to simulate.
     """
-    docker.execute(
-        source,
-        [
-            "bash",
-            "-c",
-            f"tc qdisc replace dev {interface} root netem loss {loss}%",
-        ],
-        detach=True,
-    )
+    # Apply the packet loss and show the resulting qdisc in a single exec
+    try:
+        result = exec_in(
+            source,
+            [
+                "bash",
+                "-c",
+                f"tc qdisc replace dev {interface} root netem loss {loss}% "
+                f"&& tc qdisc show dev {interface}",
+            ],
+            detach=False,
+        )
+    except DockerException as e:
+        logger.error(
+            "Failed to apply packet loss on %s (%s): %s", source, interface, e
+        )
+        return
 
     # Verify that the packet loss is applied
-    result = docker.execute(
-        source,
-        ["tc", "qdisc", "show", "dev", interface],
-        detach=False,
-    )
-
     if f"loss {loss}%" not in result:
         logger.error(
-            f"Failed to verify packet loss on {source} ({interface})."
+            "Failed to verify packet loss on %s (%s).", source, interface
         )
-        logger.debug(f"tc output:\n{result}")
+        logger.debug("tc output:\n%s", result)
         return
 
-    logger.debug(f"Applied {loss}% packet loss on {source} ({interface})")
+    logger.debug(
+        "Applied %s%% packet loss on %s (%s)", loss, source, interface
+    )
     return
 
 
-EVENTS_MAP.update({"packet_loss": packet_loss})
+EVENTS_MAP = collect_events(globals())  # A mapping of event names to their functions.
 
 
-def get_events() -> dict[str, callable]:
+def get_events() -> Mapping[str, callable]:
     """
-    Returns a dictionary of available network events that can be performed on containers.
+    Returns a read-only mapping of available network events that can be performed on containers.
 
     Returns:
-        dict[str, callable]: A dictionary mapping event names to their corresponding functions.
+        Mapping[str, callable]: A mapping of event names to their corresponding functions.
     """
     return EVENTS_MAP
@@ -18,15 +18,17 @@ SUCH DAMAGE."""
 """Module for RADIUS-related events in a multi-server CI environment."""
 
 import logging
-from typing import Union
-from python_on_whales import Container, docker
+from typing import Mapping, Union
+from python_on_whales import Container
 
+from src.events._docker_client import exec_in
+from src.events._registry import collect_events, event
 
-ValidContainer = Union[Container, str]
 
-EVENTS_MAP = {}  # A mapping of event names to their functions.
+ValidContainer = Union[Container, str]
 
 
+@event("access_request", "radius_request")
 def access_request(
     source: ValidContainer,
     target: ValidContainer,
@@ -51,21 +53,23 @@ def access_request(
         target,
         username,
     )
-    command = f"echo {password} | radtest {username} {password} {target} 0 {secret} || true"
-
-    docker.execute(source, ["bash", "-c", command], detach=True)
+    # radtest takes everything it needs as arguments, so no shell is involved and
+    # the values are passed through as-is
+    exec_in(
+        source,
+        ["radtest", str(username), str(password), str(target), "0", str(secret)],
+        detach=True,
+    )
 
 
-EVENTS_MAP.update(
-    {"access_request": access_request, "radius_request": access_request}
-)
+EVENTS_MAP = collect_events(globals())  # A mapping of event names to their functions.
 
 
-def get_events() -> dict[str, callable]:
+def get_events() -> Mapping[str, callable]:
     """
-    Returns a dictionary of available RADIUS events.
+    Returns a read-only mapping of available RADIUS events.
 
     Returns:
-        dict[str, callable]: A dictionary mapping event names to their corresponding functions.
+        Mapping[str, callable]: A mapping of event names to their corresponding functions.
     """
     return EVENTS_MAP
@@ -0,0 +1,308 @@
+"""Copyright (C) 2026 Network RADIUS SAS (legal@networkradius.com)
+
+This software may not be redistributed in any form without the prior
+written consent of Network RADIUS.
+
+THIS SOFTWARE IS PROVIDED BY THE AUTHOR AND CONTRIBUTORS ``AS IS'' AND
+ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+ARE DISCLAIMED.  IN NO EVENT SHALL THE AUTHOR OR CONTRIBUTORS BE LIABLE
+FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS
+OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)
+HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY
+OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF
+SUCH DAMAGE."""
+
+"""
+Minimal Docker Engine API client for the events.
+
+Running a command through `python_on_whales` spawns the docker CLI for every
+call. The events run commands often enough that this module talks to the
+Engine API over its UNIX socket instead, keeping one connection per thread.
+
+The socket is the one the docker CLI would use for the `python_on_whales`
+client: its configured host or context, else DOCKER_HOST, else the endpoint of
+the current docker context. If that isn't a UNIX socket (e.g. a TCP
+daemon or TLS is configured), or can't be reached, the docker CLI is used as
+before.
+"""
+
+import http.client
+import json
+import os
+import socket
+import threading
+import time
+from functools import lru_cache
+from typing import Union
+from urllib.parse import quote
+
+from python_on_whales import Container, docker
+from python_on_whales.exceptions import DockerException
+
+ValidContainer = Union[Container, str]
+
+# How long to wait for the daemon to report the exit code of a finished exec
+EXIT_CODE_TIMEOUT = 1.0
+EXIT_CODE_POLL_INTERVAL = 0.01
+
+_STDOUT = 1
+_STDERR = 2
+
+
+def _unix_path(host: str) -> str | None:
+    """
+    Get the socket path of a Docker host URL.
+
+    Args:
+        host (str): The Docker host, e.g. unix:///var/run/docker.sock.
+
+    Returns:
+        str | None: The path to the socket, or None if the host isn't a UNIX socket.
+    """
+    if host.startswith("unix://"):
+        return host.removeprefix("unix://")
+    return None
+
+
+@lru_cache(maxsize=None)
+def _socket_path() -> str | None:
+    """
+    Get the path to the Docker Engine socket used by the docker client.
+
+    Resolved the same way as the docker CLI: the client's configured host, then
+    the endpoint of the client's configured context, then DOCKER_HOST, then the
+    endpoint of the current docker context. The result is cached for the process.
+
+    Returns:
+        str | None: The path to the socket, or None if the daemon isn't reached
+            through a plain UNIX socket.
+    """
+    config = docker.client_config
+    if config.tls or config.tlsverify or os.environ.get("DOCKER_TLS_VERIFY"):
+        return None
+
+    # An explicit context takes precedence over DOCKER_HOST, like --context does
+    host = config.host or (None if config.context else os.environ.get("DOCKER_HOST"))
+    if host:
+        return _unix_path(host)
+
+    try:
+        endpoints = docker.context.inspect(config.context).endpoints or {}
+    except Exception:
+        # No docker CLI to ask, use the CLI path which will report the error
+        return None
+
+    endpoint = endpoints.get("docker")
+    if endpoint is None or not endpoint.host:
+        return None
+    return _unix_path(endpoint.host)
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    """
+    HTTP connection to the Docker Engine over a UNIX socket.
+    """
+
+    def __init__(self, path: str) -> None:
+        super().__init__("localhost")
+        self.__path = path
+
+    def connect(self) -> None:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(self.__path)
+        except OSError:
+            sock.close()
+            raise
+        self.sock = sock
+
+
+_local = threading.local()
+
+
+def _connection() -> _UnixHTTPConnection | None:
+    """
+    Get this thread's connection to the Docker Engine.
+
+    Returns:
+        _UnixHTTPConnection | None: The connection, or None if the Engine API
+            can't be reached.
+    """
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        path = _socket_path()
+        if path is None:
+            return None
+
+        conn = _UnixHTTPConnection(path)
+        try:
+            conn.connect()
+        except OSError:
+            return None
+        _local.conn = conn
+    return conn
+
+
+def _request(
+    conn: _UnixHTTPConnection, method: str, path: str, body: dict | None = None
+) -> tuple[int, bytes]:
+    """
+    Send a request to the Docker Engine.
+
+    Args:
+        conn (_UnixHTTPConnection): The connection to send the request on.
+        method (str): The HTTP method.
+        path (str): The API path.
+        body (dict | None, optional): JSON body of the request. Defaults to None.
+
+    Returns:
+        tuple[int, bytes]: The response status and body.
+    """
+    headers = {}
+    payload = None
+    if body is not None:
+        headers["Content-Type"] = "application/json"
+        payload = json.dumps(body).encode()
+
+    try:
+        conn.request(method, path, body=payload, headers=headers)
+        response = conn.getresponse()
+    except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+        # The daemon dropped the idle connection, reconnect and try once more
+        conn.close()
+        conn.request(method, path, body=payload, headers=headers)
+        response = conn.getresponse()
+    return response.status, response.read()
+
+
+def _demux(data: bytes) -> tuple[bytes, bytes]:
+    """
+    Split a multiplexed exec stream into stdout and stderr.
+
+    Each frame has an 8 byte header holding the stream type and the payload size.
+
+    Args:
+        data (bytes): The multiplexed stream.
+
+    Returns:
+        tuple[bytes, bytes]: The stdout and stderr output.
+    """
+    streams = {_STDOUT: bytearray(), _STDERR: bytearray()}
+    view = memoryview(data)
+    offset = 0
+    while offset + 8 <= len(view):
+        stream_type = view[offset]
+        size = int.from_bytes(view[offset + 4 : offset + 8], "big")
+        offset += 8
+        if stream_type in streams:
+            streams[stream_type] += view[offset : offset + size]
+        offset += size
+    return bytes(streams[_STDOUT]), bytes(streams[_STDERR])
+
+
+def exec_in(
+    container: ValidContainer, argv: list[str], detach: bool = False
+) -> str | None:
+    """
+    Execute a command in a container.
+
+    Behaves like `python_on_whales.docker.execute`, falling back to it when the
+    Engine API can't be reached.
+
+    Args:
+        container (ValidContainer): The container to execute the command in.
+        argv (list[str]): The command and its arguments.
+        detach (bool, optional): Whether to run the command in detached mode. Defaults to False.
+
+    Returns:
+        str | None: The stdout of the command without its trailing newline, or None
+            if the command was detached.
+
+    Raises:
+        python_on_whales.exceptions.DockerException: If the exec couldn't be created
+            or the command returned a non-zero exit code.
+    """
+    conn = _connection()
+    if conn is None:
+        return docker.execute(container, argv, detach=detach)
+
+    name = getattr(container, "id", container)
+    command_launched = ["docker", "exec", *(["--detach"] if detach else []), name, *argv]
+
+    status, body = _request(
+        conn,
+        "POST",
+        f"/containers/{quote(name, safe='')}/exec",
+        {"AttachStdout": not detach, "AttachStderr": not detach, "Cmd": argv},
+    )
+    if status != 201:
+        raise DockerException(command_launched, status, stderr=body)
+    exec_id = json.loads(body)["Id"]
+
+    status, body = _request(
+        conn, "POST", f"/exec/{exec_id}/start", {"Detach": detach, "Tty": False}
+    )
+    if status != 200:
+        raise DockerException(command_launched, status, stderr=body)
+    if detach:
+        return None
+
+    stdout, stderr = _demux(body)
+
+    exit_code = _exit_code(conn, exec_id, command_launched, stdout, stderr)
+    if exit_code:
+        raise DockerException(command_launched, exit_code, stdout, stderr)
+
+    output = stdout.decode(errors="replace")
+    return output[:-1] if output.endswith("\n") else output
+
+
+def _exit_code(
+    conn: _UnixHTTPConnection,
+    exec_id: str,
+    command_launched: list[str],
+    stdout: bytes,
+    stderr: bytes,
+) -> int:
+    """
+    Get the exit code of a finished exec.
+
+    The daemon can still report the exec as running for a moment after its output
+    stream closes, so it's polled until the exit code is set.
+
+    Args:
+        conn (_UnixHTTPConnection): The connection to the Docker Engine.
+        exec_id (str): The ID of the exec.
+        command_launched (list[str]): The equivalent docker command, for errors.
+        stdout (bytes): The stdout of the command, for errors.
+        stderr (bytes): The stderr of the command, for errors.
+
+    Returns:
+        int: The exit code.
+
+    Raises:
+        python_on_whales.exceptions.DockerException: If the exec couldn't be
+            inspected or its exit code isn't known.
+    """
+    deadline = time.monotonic() + EXIT_CODE_TIMEOUT
+    while True:
+        status, body = _request(conn, "GET", f"/exec/{exec_id}/json")
+        if status != 200:
+            raise DockerException(command_launched, status, stdout, body)
+
+        exec_info = json.loads(body)
+        exit_code = exec_info.get("ExitCode")
+        if exit_code is not None and not exec_info.get("Running"):
+            return exit_code
+
+        if time.monotonic() >= deadline:
+            raise DockerException(
+                command_launched,
+                -1,
+                stdout,
+                stderr + b"\nThe exit code of the command is unknown.",
+            )
+        time.sleep(EXIT_CODE_POLL_INTERVAL)
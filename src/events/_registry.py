@@ -0,0 +1,64 @@
+"""Copyright (C) 2026 Network RADIUS SAS (legal@networkradius.com)
+
+This software may not be redistributed in any form without the prior
+written consent of Network RADIUS.
+
+THIS SOFTWARE IS PROVIDED BY THE AUTHOR AND CONTRIBUTORS ``AS IS'' AND
+ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+ARE DISCLAIMED.  IN NO EVENT SHALL THE AUTHOR OR CONTRIBUTORS BE LIABLE
+FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS
+OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)
+HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY
+OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF
+SUCH DAMAGE."""
+
+"""
+Registration helpers for events.
+"""
+
+from types import MappingProxyType
+from typing import Callable, Mapping
+
+
+def event(*names: str) -> Callable[[callable], callable]:
+    """
+    Mark a function as an event, available under each of the given names.
+
+    Args:
+        *names (str): The names the event can be referenced by in test configs.
+
+    Returns:
+        Callable[[callable], callable]: Decorator returning the function unchanged
+            apart from its event names.
+    """
+
+    def decorator(func: callable) -> callable:
+        func.__events__ = (*getattr(func, "__events__", ()), *names)
+        return func
+
+    return decorator
+
+
+def collect_events(namespace: dict) -> Mapping[str, callable]:
+    """
+    Build the mapping of event names to functions for a module.
+
+    The mapping is read-only, so it can be handed out by `get_events()` without
+    copying it.
+
+    Args:
+        namespace (dict): The module namespace to collect events from, usually `globals()`.
+
+    Returns:
+        Mapping[str, callable]: A mapping of event names to their corresponding functions.
+    """
+    return MappingProxyType(
+        {
+            name: func
+            for func in namespace.values()
+            for name in getattr(func, "__events__", ())
+        }
+    )
@@ -0,0 +1,191 @@
+"""Copyright (C) 2026 Network RADIUS SAS (legal@networkradius.com)
+
+This software may not be redistributed in any form without the prior
+written consent of Network RADIUS.
+
+THIS SOFTWARE IS PROVIDED BY THE AUTHOR AND CONTRIBUTORS ``AS IS'' AND
+ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+ARE DISCLAIMED.  IN NO EVENT SHALL THE AUTHOR OR CONTRIBUTORS BE LIABLE
+FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS
+OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)
+HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY
+OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF
+SUCH DAMAGE."""
+
+"""
+Persistent shells for running commands in containers.
+
+Every `docker exec` starts a new bash process in the container. Events which
+run many commands can instead send them to a long-lived bash process, which is
+started once per container and kept open for the rest of the run.
+"""
+
+import atexit
+import shlex
+import subprocess
+import threading
+import uuid
+from typing import Union
+
+from python_on_whales import Container
+from python_on_whales.exceptions import DockerException
+
+ValidContainer = Union[Container, str]
+
+# Shell variable holding the path of the file commands' stderr is written to
+STDERR_VARIABLE = "__shell_exec_stderr"
+
+
+class ShellExec:
+    """
+    A bash process in a container which commands are written to over stdin.
+
+    Each command runs in its own subshell with stdin from /dev/null, so commands
+    can't change the state of the shell or read the commands that follow them.
+    A command's stderr is written to a temporary file in the container. After
+    each command the shell prints a sentinel line holding its exit code and the
+    size of its stderr, followed by the stderr itself.
+    """
+
+    def __init__(self, container: str) -> None:
+        self.container = container
+        self.__sentinel = f"__END_{uuid.uuid4().hex}__"
+        self.__process: subprocess.Popen | None = None
+        self.__lock = threading.Lock()
+
+    def __start(self) -> subprocess.Popen:
+        self.__process = subprocess.Popen(
+            ["docker", "exec", "-i", self.container, "bash"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        return self.__process
+
+    def __request(self, command: str) -> bytes:
+        """
+        Build the input that runs a command in the shell.
+
+        Args:
+            command (str): The command to run.
+
+        Returns:
+            bytes: The input to write to the shell.
+        """
+        # The stderr file is created by the first command sent to a new shell.
+        # The leading newline of the sentinel line ends the command's last line
+        # of output if it didn't end with one, and is removed again by run().
+        return (
+            f'[ -n "${STDERR_VARIABLE}" ] || {STDERR_VARIABLE}='
+            f'"$(mktemp 2>/dev/null || echo /tmp/.shell_exec_stderr.$$)"\n'
+            f'( eval {shlex.quote(command)} ) </dev/null 2>"${STDERR_VARIABLE}"\n'
+            f"printf '\\n%s %d %d\\n' {self.__sentinel} $? "
+            f'"$(wc -c <"${STDERR_VARIABLE}")"\n'
+            f'cat "${STDERR_VARIABLE}"\n'
+        ).encode()
+
+    def run(self, command: str) -> str:
+        """
+        Run a command in the shell.
+
+        Args:
+            command (str): The command to run.
+
+        Returns:
+            str: The stdout of the command without its trailing newline.
+
+        Raises:
+            python_on_whales.exceptions.DockerException: If the command returned a
+                non-zero exit code or the shell exited.
+        """
+        docker_command = ["docker", "exec", self.container, "bash", "-c", command]
+        sentinel = self.__sentinel.encode() + b" "
+
+        with self.__lock:
+            process = self.__process
+            if process is None or process.poll() is not None:
+                process = self.__start()
+
+            request = self.__request(command)
+            try:
+                process.stdin.write(request)
+                process.stdin.flush()
+            except BrokenPipeError:
+                # The shell exited since the last command, nothing was run yet
+                process = self.__start()
+                process.stdin.write(request)
+                process.stdin.flush()
+
+            lines = []
+            for line in iter(process.stdout.readline, b""):
+                if line.startswith(sentinel):
+                    exit_code, stderr_size = map(int, line[len(sentinel) :].split())
+                    stderr = process.stdout.read(stderr_size)
+                    break
+                lines.append(line)
+            else:
+                # The shell went away, start a new one for the next command
+                self.__process = None
+                process.stdout.close()
+                raise DockerException(docker_command, process.wait(), b"".join(lines))
+
+        output = b"".join(lines)[:-1]
+        if exit_code:
+            raise DockerException(docker_command, exit_code, output, stderr)
+
+        output = output.decode(errors="replace")
+        return output[:-1] if output.endswith("\n") else output
+
+    def close(self) -> None:
+        """
+        Close the shell.
+        """
+        with self.__lock:
+            if self.__process is not None and self.__process.poll() is None:
+                try:
+                    self.__process.stdin.write(
+                        f'[ -z "${STDERR_VARIABLE}" ] || rm -f "${STDERR_VARIABLE}"\n'.encode()
+                    )
+                    self.__process.stdin.close()
+                except BrokenPipeError:
+                    pass
+                self.__process.wait()
+            if self.__process is not None:
+                self.__process.stdout.close()
+            self.__process = None
+
+
+_shells: dict[str, ShellExec] = {}
+_shells_lock = threading.Lock()
+
+
+def get_shell(container: ValidContainer) -> ShellExec:
+    """
+    Get the persistent shell for a container, creating it on first use.
+
+    Args:
+        container (ValidContainer): The container to get the shell for.
+
+    Returns:
+        ShellExec: The shell for the container.
+    """
+    name = getattr(container, "id", container)
+    shell = _shells.get(name)
+    if shell is None:
+        with _shells_lock:
+            shell = _shells.setdefault(name, ShellExec(name))
+    return shell
+
+
+@atexit.register
+def close_shells() -> None:
+    """
+    Close all of the persistent shells.
+    """
+    with _shells_lock:
+        for shell in _shells.values():
+            shell.close()
+        _shells.clear()
@@ -19,33 +19,50 @@ SUCH DAMAGE."""
 Tools for working with events.
 """
 
-from pathlib import Path
+from functools import lru_cache
+import importlib
+import os
+from types import MappingProxyType
+from typing import Mapping
+
 from src import logging_helper
 
 logger = logging_helper.get_logger()
 
+EVENTS_DIR = os.path.dirname(__file__)
+
+# Modules in the events directory which do not provide events
+_NON_EVENT_MODULES = frozenset({"AbstractEvents", "event_tools"})
+
 
-def get_events() -> dict[str, callable]:
+@lru_cache(maxsize=1)
+def get_events() -> Mapping[str, callable]:
     """
     Retrieve available events from the events directory.
 
+    The events directory is only scanned on the first call, later calls return
+    the same read-only mapping.
+
     Returns:
-        dict[str, callable]: A dictionary mapping event names to their corresponding functions.
+        Mapping[str, callable]: A mapping of event names to their corresponding functions.
     """
     logger.debug("Loading events from events directory.")
+    with os.scandir(EVENTS_DIR) as entries:
+        module_names = sorted(
+            entry.name[: -len(".py")]
+            for entry in entries
+            if entry.name.endswith(".py") and entry.is_file()
+        )
+
     events = {}
-    events_dir = Path(__file__).parent
-    for event_file in events_dir.glob("*.py"):
-        if event_file.name in [
-            "__init__.py",
-            "AbstractEvents.py",
-            "event_tools.py",
-        ]:
+    for module_name in module_names:
+        # Private modules (including __init__) are helpers for the events, not
+        # events themselves
+        if module_name.startswith("_") or module_name in _NON_EVENT_MODULES:
             continue
 
-        module_name = f"src.events.{event_file.stem}"
-        module = __import__(module_name, fromlist=[""])
+        module = importlib.import_module(f"{__package__}.{module_name}")
         events.update(module.get_events())
 
     logger.debug("Loaded events: %s", list(events.keys()))
-    return events
+    return MappingProxyType(events)
@@ -19,17 +19,122 @@ SUCH DAMAGE."""
 
 from abc import ABC, abstractmethod
 import asyncio
+from collections import deque
 from enum import Enum
 import logging
+import os
 from pathlib import Path
-import platform
+import socket
+import sys
+import time
+from typing import Callable, Iterable, Union
 
-import aiofiles
 from watchfiles import awatch, Change
 
 from src import logging_helper
 
 
+# Maximum number of bytes to read from a listener socket at once
+READ_SIZE = 64 * 1024
+
+# Maximum number of bytes to read from a listener file at once
+FILE_READ_SIZE = 1 << 20
+
+# Maximum number of pending connections on a listener socket
+LISTEN_BACKLOG = 100
+
+# Minimum number of seconds between warnings about invalid messages
+INVALID_WARNING_INTERVAL = 1.0
+
+# Maximum length of an invalid message included in a warning
+INVALID_WARNING_LENGTH = 80
+
+
+class FastQueue:
+    """
+    A lightweight message queue for a single consumer.
+
+    Supports the parts of the `asyncio.Queue` interface used by the listeners and
+    the validator, backed by a deque and an event instead of the queue's getter and
+    putter bookkeeping. The queue is unbounded, so `put_nowait` never blocks.
+    """
+
+    def __init__(self) -> None:
+        self.__items = deque()
+        self.__not_empty = asyncio.Event()
+
+    def put_nowait(self, item) -> None:
+        """
+        Put an item into the queue.
+
+        Args:
+            item: The item to put into the queue.
+        """
+        self.__items.append(item)
+        self.__not_empty.set()
+
+    def put_many(self, items: Iterable) -> None:
+        """
+        Put several items into the queue, waking the consumer once.
+
+        Args:
+            items (Iterable): The items to put into the queue, in order.
+        """
+        self.__items.extend(items)
+        if self.__items:
+            self.__not_empty.set()
+
+    def get_nowait(self):
+        """
+        Remove and return an item from the queue.
+
+        Returns:
+            The first item in the queue.
+
+        Raises:
+            asyncio.QueueEmpty: If the queue is empty.
+        """
+        try:
+            return self.__items.popleft()
+        except IndexError:
+            raise asyncio.QueueEmpty from None
+
+    async def get(self):
+        """
+        Remove and return an item from the queue, waiting for one if it is empty.
+
+        Returns:
+            The first item in the queue.
+        """
+        while not self.__items:
+            self.__not_empty.clear()
+            await self.__not_empty.wait()
+        return self.__items.popleft()
+
+    def empty(self) -> bool:
+        """
+        Returns:
+            bool: True if the queue is empty, False otherwise.
+        """
+        return not self.__items
+
+    def qsize(self) -> int:
+        """
+        Returns:
+            int: The number of items in the queue.
+        """
+        return len(self.__items)
+
+    def clear(self) -> None:
+        """
+        Remove all items from the queue.
+        """
+        self.__items.clear()
+
+
+MessageQueue = Union[asyncio.Queue, FastQueue]
+
+
 class ListenerType(Enum):
     """
     Enum for different listener types.
@@ -47,14 +152,14 @@ class Listener(ABC):
 
     listener_dest: Path
     listener_fr_config: Path = None # Filename for the FreeRADIUS config to use this listener
-    msg_queue: asyncio.Queue
+    msg_queue: MessageQueue
     ready_future: asyncio.Future
     logger: logging.Logger
 
     def __init__(
         self,
         listener_dest: Path,
-        msg_queue: asyncio.Queue,
+        msg_queue: MessageQueue,
         ready_future: asyncio.Future,
         logger: logging.Logger = logging_helper.get_logger(),
     ) -> None:
@@ -62,6 +167,8 @@ class Listener(ABC):
         self.msg_queue = msg_queue
         self.ready_future = ready_future
         self.logger = logger
+        self.__last_invalid_warning = float("-inf")
+        self.__invalid_dropped = 0
         super().__init__()
 
     @abstractmethod
@@ -80,30 +187,159 @@ class Listener(ABC):
         Returns:
             bool: True if the listener was successfully stopped and cleaned up, False otherwise.
         """
-        if self.listener_dest.exists():
-            try:
-                self.logger.debug(
-                    "Removing listener socket at %s", self.listener_dest
-                )
-                self.listener_dest.unlink()
-                self.logger.info(
-                    "Listener: Removed logging destination %s",
-                    self.listener_dest,
-                )
-                return True
-            except OSError as e:
-                self.logger.error(
-                    "Listener: Failed to remove logging destination %s: %s",
-                    self.listener_dest,
-                    e,
-                )
-                return False
+        try:
+            self.logger.debug(
+                "Removing listener socket at %s", self.listener_dest
+            )
+            self.listener_dest.unlink()
+        except FileNotFoundError:
+            self.logger.info(
+                "Listener: Logging destination %s does not exist, nothing to remove",
+                self.listener_dest,
+            )
+            return True
+        except OSError as e:
+            self.logger.error(
+                "Listener: Failed to remove logging destination %s: %s",
+                self.listener_dest,
+                e,
+            )
+            return False
+
         self.logger.info(
-            "Listener: Logging destination %s does not exist, nothing to remove",
+            "Listener: Removed logging destination %s",
             self.listener_dest,
         )
         return True
 
+    def _warn_invalid(self, message: str | bytes) -> None:
+        """
+        Warns about an invalid message, at most once every INVALID_WARNING_INTERVAL
+        seconds so a flood of bad input can't flood the log as well.
+
+        Args:
+            message (str | bytes): The invalid message.
+        """
+        now = time.monotonic()
+        if now - self.__last_invalid_warning < INVALID_WARNING_INTERVAL:
+            self.__invalid_dropped += 1
+            return
+
+        self.__last_invalid_warning = now
+        if self.__invalid_dropped:
+            self.logger.warning(
+                "Suppressed warnings for %d invalid messages.",
+                self.__invalid_dropped,
+            )
+            self.__invalid_dropped = 0
+        self.logger.warning(
+            "Invalid message format: %s. Expected 'trigger_name trigger_value'.",
+            message[:INVALID_WARNING_LENGTH],
+        )
+
+    def _put_messages(self, messages: list) -> None:
+        """
+        Puts a batch of parsed messages into the message queue.
+
+        Args:
+            messages (list): The (trigger_name, trigger_value) tuples to queue.
+        """
+        if not messages:
+            return
+        put_many = getattr(self.msg_queue, "put_many", None)
+        if put_many is not None:
+            put_many(messages)
+            return
+        for message in messages:
+            self.msg_queue.put_nowait(message)
+
+    def _remove_stale_dest(self) -> None:
+        """
+        Removes anything left at the listener destination before starting.
+
+        The path may be a directory if compose tried to mount it as a volume before
+        we created it.
+        """
+        try:
+            self.listener_dest.unlink()
+        except FileNotFoundError:
+            return
+        except OSError:
+            # unlink() fails on directories, only stat the path in that case
+            if not self.listener_dest.is_dir():
+                raise
+            self.logger.debug(
+                "Listener destination %s exists as a directory, removing it.",
+                self.listener_dest,
+            )
+            self.listener_dest.rmdir()
+            return
+
+        self.logger.debug(
+            "Removed existing listener destination %s.", self.listener_dest
+        )
+
+
+class _MessageProtocol(asyncio.BufferedProtocol):
+    """
+    Protocol splitting a client's stream into newline terminated messages.
+
+    Data is received straight into a reusable buffer and each message is copied
+    out of it once, skipping the StreamReader layer and its per-read buffers.
+    """
+
+    def __init__(
+        self, on_messages: Callable[[list[bytes]], None], logger: logging.Logger
+    ) -> None:
+        self.__on_messages = on_messages
+        self.__logger = logger
+        self.__buffer = bytearray(READ_SIZE)
+        self.__view = memoryview(self.__buffer)
+        self.__used = 0  # Bytes of a partial message at the start of the buffer
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self.__logger.debug("Client connected.")
+
+    def get_buffer(self, sizehint: int) -> memoryview:
+        if self.__used == len(self.__buffer):
+            # A single message filled the buffer, make room for the rest of it
+            buffer = bytearray(len(self.__buffer) * 2)
+            buffer[: self.__used] = self.__view
+            self.__view.release()
+            self.__buffer = buffer
+            self.__view = memoryview(buffer)
+        return self.__view[self.__used :]
+
+    def buffer_updated(self, nbytes: int) -> None:
+        end = self.__used + nbytes
+        buffer = self.__buffer
+
+        start = 0
+        messages = []
+        # Only the new data can hold a newline
+        newline = buffer.find(b"\n", self.__used, end)
+        while newline != -1:
+            messages.append(bytes(self.__view[start:newline]))
+            start = newline + 1
+            newline = buffer.find(b"\n", start, end)
+
+        # Hand over everything complete in this read at once
+        if messages:
+            self.__on_messages(messages)
+
+        # Move any partial message to the front of the buffer
+        self.__used = end - start
+        if start and self.__used:
+            buffer[: self.__used] = buffer[start:end]
+
+    def eof_received(self) -> bool:
+        # Anything left in the buffer is a partial message and is dropped
+        return False
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        self.__view.release()
+        self.__logger.debug("Client disconnected.")
+
 
 class SocketListener(Listener):
     """
@@ -112,46 +348,44 @@ class SocketListener(Listener):
 
     listener_fr_config: Path = Path("linelog_socket")
 
-    async def __handle_connection(
-        self,
-        reader: asyncio.StreamReader,
-        writer: asyncio.StreamWriter,
-    ) -> None:
+    def __parse_message(self, message: bytes) -> tuple[str, bytes] | None:
         """
-        Handles incoming client connections and processes messages.
+        Parses a single message into its trigger name and value.
 
         Args:
-            reader (asyncio.StreamReader): Reader for the incoming data.
-            writer (asyncio.StreamWriter): Writer for sending responses.
+            message (bytes): The incoming message, without its newline.
+
+        Returns:
+            tuple[str, bytes] | None: The trigger name and value, or None if the
+                message is invalid.
         """
-        self.logger.debug("Client connected.")
-        try:
-            while True:
-                data = await reader.readuntil(b"\n")
-                message = data.rstrip(b"\n")
-
-                space_index = message.find(b" ")
-                if space_index == -1:
-                    self.logger.warning(
-                        "Invalid message format: %s. Expected 'trigger_name trigger_value'.",
-                        message,
-                    )
-                    continue
-                trigger_name = message[:space_index].decode(
-                    "ascii", errors="ignore"
-                )
+        # The value is kept as bytes, only the name is decoded
+        trigger_name, sep, trigger_value = message.partition(b" ")
+        if not sep:
+            self._warn_invalid(message)
+            return None
+
+        # Trigger names are used as dict keys by the validator, interning them
+        # shares one string (and its cached hash) per trigger name
+        return (
+            sys.intern(trigger_name.decode("ascii", errors="ignore")),
+            trigger_value,
+        )
 
-                trigger_value = message[space_index + 1 :]
+    def __process_messages(self, messages: list[bytes]) -> None:
+        """
+        Processes the messages from a single read and puts them into the message queue.
 
+        Args:
+            messages (list[bytes]): The incoming messages, without their newlines.
+        """
+        # Checked once per read, not once per message
+        if self.logger.isEnabledFor(logging.DEBUG):
+            for message in messages:
                 self.logger.debug("Received message: %s", message)
 
-                self.msg_queue.put_nowait((trigger_name, trigger_value))
-        except asyncio.IncompleteReadError:
-            self.logger.debug("Client disconnected.")
-        finally:
-            writer.close()
-            await writer.wait_closed()
-            self.logger.debug("Client disconnected.")
+        parsed = (self.__parse_message(message) for message in messages)
+        self._put_messages([message for message in parsed if message])
 
     async def start(self) -> None:
         """
@@ -159,30 +393,29 @@ class SocketListener(Listener):
         """
         self.logger.debug("Starting listener on %s", self.listener_dest)
 
-        if self.listener_dest.exists():
-            # The path may be a directory if compose tried to mount it as a volume before
-            # we created it
-            self.logger.debug(
-                "Socket path %s exists as a %s, removing it.",
-                self.listener_dest,
-                "directory" if self.listener_dest.is_dir() else "file",
-            )
-            if self.listener_dest.is_dir():
-                self.listener_dest.rmdir()
-            else:
-                self.listener_dest.unlink()
+        self._remove_stale_dest()
 
+        # The stale destination was removed above, so bind the socket ourselves
+        # rather than letting asyncio check the path again
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
         try:
-            server = await asyncio.start_unix_server(
-                self.__handle_connection,
-                path=self.listener_dest,
-            )
+            sock.bind(str(self.listener_dest))
 
-            # Make sure the socket is world writable so containers can connect
+            # Make sure the socket is world writable before containers can connect
             self.listener_dest.chmod(0o777)
+            sock.listen(LISTEN_BACKLOG)
+
+            server = await asyncio.get_running_loop().create_unix_server(
+                lambda: _MessageProtocol(self.__process_messages, self.logger),
+                sock=sock,
+            )
         except PermissionError as e:
+            sock.close()
             self.logger.error("Permission error starting listener: %s", e)
             return
+        except BaseException:
+            sock.close()
+            raise
 
         self.logger.debug("Listener started, setting ready future.")
 
@@ -201,27 +434,106 @@ class FileListener(Listener):
     """
 
     listener_fr_config: Path = Path("linelog_file")
-    listener_source: aiofiles.threadpool.text.AsyncTextIOWrapper = None
+    listener_source: int = None  # File descriptor of the log file
+    __partial: bytes = b""  # Trailing partial line from the last read
 
-    def __process_message(self, message: str) -> None:
+    def __parse_message(self, message: str) -> tuple[str, str] | None:
         """
-        Processes a single message and puts it into the message queue.
+        Parses a single message into its trigger name and value.
 
         Args:
             message (str): The incoming message.
+
+        Returns:
+            tuple[str, str] | None: The trigger name and value, or None if the
+                message is invalid.
         """
         self.logger.debug("Processing message: %s", message)
 
-        if " " not in message:
-            self.logger.warning(
-                "Invalid message format: %s. Expected 'trigger_name trigger_value'.",
-                message,
+        trigger_name, sep, trigger_value = message.partition(" ")
+        if not sep:
+            self._warn_invalid(message)
+            return None
+
+        return (sys.intern(trigger_name), trigger_value)
+
+    def __read_messages(self) -> None:
+        """
+        Reads all new lines from the listener source and puts them into the
+        message queue as a single batch.
+
+        The log file is a regular file, so reading it never blocks and is done
+        directly instead of through a thread pool. A trailing partial line is kept
+        until the rest of it is written. If the file was truncated, it is read
+        again from the start.
+        """
+        # If the file was truncated, start again from its beginning
+        if os.fstat(self.listener_source).st_size < os.lseek(
+            self.listener_source, 0, os.SEEK_CUR
+        ):
+            self.logger.debug("File %s was truncated", self.listener_dest)
+            os.lseek(self.listener_source, 0, os.SEEK_SET)
+            self.__partial = b""
+
+        chunks = [self.__partial]
+        while data := os.read(self.listener_source, FILE_READ_SIZE):
+            chunks.append(data)
+
+        *lines, self.__partial = b"".join(chunks).split(b"\n")
+
+        messages = []
+        debug = self.logger.isEnabledFor(logging.DEBUG)
+        for line in lines:
+            message = line.decode("utf-8", errors="replace").strip()
+            if debug:
+                self.logger.debug("Received message: %s", message)
+            parsed = self.__parse_message(message)
+            if parsed:
+                messages.append(parsed)
+        self._put_messages(messages)
+
+    def __source_is_current(self) -> bool:
+        """
+        Checks whether the listener source is the file currently at the listener
+        destination.
+
+        Returns:
+            bool: True if the source is open and is the file at the destination.
+        """
+        if self.listener_source is None:
+            return False
+        try:
+            current = os.stat(self.listener_dest)
+        except FileNotFoundError:
+            return False
+        source = os.fstat(self.listener_source)
+        return (source.st_dev, source.st_ino) == (current.st_dev, current.st_ino)
+
+    def __open_source(self) -> None:
+        """
+        Opens the file at the listener destination, if there is one, and reads the
+        lines already in it.
+        """
+        try:
+            self.listener_source = os.open(
+                self.listener_dest, os.O_RDONLY | os.O_NONBLOCK
             )
+        except FileNotFoundError:
+            self.logger.debug("No file at %s to open", self.listener_dest)
             return
 
-        trigger_name, trigger_value = message.split(" ", 1)
+        self.logger.debug("Opened listener source for file %s", self.listener_dest)
+        self.__read_messages()
 
-        self.msg_queue.put_nowait((trigger_name, trigger_value))
+    def __close_source(self) -> None:
+        """
+        Closes the listener source, if it is open.
+        """
+        if self.listener_source is None:
+            return
+        os.close(self.listener_source)
+        self.listener_source = None
+        self.__partial = b""
 
     async def start(self) -> None:
         """
@@ -230,16 +542,7 @@ class FileListener(Listener):
         self.logger.debug("Starting file listener on %s", self.listener_dest)
 
         # Remove existing file if it exists
-        if self.listener_dest.exists():
-            self.logger.debug(
-                "Listener destination %s exists, removing it.",
-                self.listener_dest,
-            )
-
-            if self.listener_dest.is_dir():
-                self.listener_dest.rmdir()
-            else:
-                self.listener_dest.unlink()
+        self._remove_stale_dest()
 
         # Notify that the listener is ready
         if not self.ready_future.done():
@@ -251,73 +554,36 @@ class FileListener(Listener):
                 "Starting to watch for changes in %s",
                 self.listener_dest.parent,
             )
+            # watchfiles uses the native backend for the platform (FSEvents on
+            # macOS, inotify on Linux). Polling can still be forced by setting
+            # WATCHFILES_FORCE_POLLING, e.g. for mounts that don't report events.
+            # Only changes to the log file are of interest, filter the rest out
+            # before they are handed to Python. watchfiles reports absolute paths.
+            listener_path = str(self.listener_dest.absolute())
             async for changes in awatch(
                 self.listener_dest.parent,
-                force_polling=platform.system() == "Darwin",
-            ):  # macOS requires polling
-                for change in changes:
-                    change_type, change_path = change
-
-                    # Only process modifications to the log file
-                    if Path(change_path) != self.listener_dest:
-                        continue
-
-                    match change_type:
-                        case Change.added:
-                            self.logger.debug(
-                                "Detected addition of file %s",
-                                self.listener_dest,
-                            )
-                            self.listener_source = await aiofiles.open(
-                                self.listener_dest, mode="r", encoding="utf-8"
-                            )
-                            self.logger.debug(
-                                "Opened listener source for file %s",
-                                self.listener_dest,
-                            )
-                            # Process any lines already in the file when it's first created
-                            async for line in self.listener_source:
-                                message = line.strip()
-                                self.logger.debug(
-                                    "Received message: %s", message
-                                )
-                                self.__process_message(message)
-
-                            self.logger.debug(
-                                "Processed all existing lines in file %s",
-                                self.listener_dest,
-                            )
-                        case Change.deleted:
-                            self.logger.debug(
-                                "Detected deletion of file %s",
-                                self.listener_dest,
-                            )
-                            if self.listener_source:
-                                await self.listener_source.close()
-                                self.listener_source = None
-                                self.logger.debug(
-                                    "Closed listener source for file %s",
-                                    self.listener_dest,
-                                )
-                        case Change.modified:
-                            self.logger.debug(
-                                "Detected modification to file %s",
-                                self.listener_dest,
-                            )
-                            if self.listener_source:
-                                async for line in self.listener_source:
-                                    message = line.strip()
-                                    self.logger.debug(
-                                        "Received message: %s", message
-                                    )
-                                    self.__process_message(message)
-
-                                self.logger.debug(
-                                    "Processed all new lines in file %s",
-                                    self.listener_dest,
-                                )
-                        case _:
-                            pass
+                watch_filter=lambda _, path: path == listener_path,
+            ):
+                # Changes come as a set, so the order of the changes in a batch
+                # isn't known. Read whatever was written to the open file first,
+                # it may have since been deleted or replaced. Then, if the file
+                # was added or deleted, check which file is at the path now.
+                change_types = {change_type for change_type, _ in changes}
+                if self.listener_source is not None:
+                    self.logger.debug(
+                        "Detected changes to file %s: %s",
+                        self.listener_dest,
+                        change_types,
+                    )
+                    self.__read_messages()
+
+                if (
+                    self.listener_source is None
+                    or Change.added in change_types
+                    or Change.deleted in change_types
+                ) and not self.__source_is_current():
+                    self.__close_source()
+                    self.__open_source()
         except FileNotFoundError:
             self.logger.warning(
                 "Listener destination %s not found or removed.",
@@ -335,21 +601,22 @@ class FileListener(Listener):
             bool: True if the listener was successfully stopped and cleaned up, False otherwise.
         """
 
-        loop = asyncio.get_running_loop()
-        if loop.is_running() and self.listener_source:
+        if self.listener_source is not None:
             self.logger.debug(
                 "Closing listener source for file %s", self.listener_dest
             )
-            await self.listener_source.close()
+            self.__close_source()
 
         # Backup the file before removing it
-        if self.listener_dest.exists():
-            backup_path = Path(str(self.listener_dest) + ".bak")
+        backup_path = Path(str(self.listener_dest) + ".bak")
+        try:
+            self.listener_dest.rename(backup_path)
             self.logger.debug(
-                "Backing up log file %s to %s",
+                "Backed up log file %s to %s",
                 self.listener_dest,
                 backup_path,
             )
-            self.listener_dest.rename(backup_path)
+        except FileNotFoundError:
+            pass
 
         return await super().stop()
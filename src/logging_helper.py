@@ -19,12 +19,70 @@ SUCH DAMAGE."""
 Setup logging for the application.
 """
 
+import atexit
 import logging
+import logging.handlers
+import os
+import queue
 import sys
-from termcolor import colored
 
 logger = logging.getLogger("freeradius-multi-server")
 file_logger = logging.getLogger("file")
+_file_listener: logging.handlers.QueueListener = None
+_file_queue_handler: logging.handlers.QueueHandler = None
+
+_LOG_FMT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+_YELLOW_FMT = "\x1b[33m" + _LOG_FMT + "\x1b[0m"
+_RED_FMT = "\x1b[31m" + _LOG_FMT + "\x1b[0m"
+
+
+def _use_colour(stream) -> bool:
+    """
+    Check whether log output to a stream should be coloured.
+
+    Follows the NO_COLOR and FORCE_COLOR conventions, otherwise only colours
+    output to a terminal.
+
+    Args:
+        stream: The stream the log output is written to.
+
+    Returns:
+        bool: True if ANSI colour codes should be used, False otherwise.
+    """
+    if "NO_COLOR" in os.environ:
+        return False
+    if "FORCE_COLOR" in os.environ:
+        return True
+    return hasattr(stream, "isatty") and stream.isatty()
+
+
+class _NameFilter(logging.Filter):
+    """
+    A filter that only passes records from children of the given logger names.
+    """
+
+    def __init__(self, names: list[str]) -> None:
+        super().__init__()
+        self.__prefixes = tuple(name + "." for name in names)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.name.startswith(self.__prefixes)
+
+
+class _MessageFilter(logging.Filter):
+    """
+    A filter that only passes records whose message contains one of the given
+    substrings.
+    """
+
+    def __init__(self, substrings: list[str]) -> None:
+        super().__init__()
+        self.__substrings = tuple(substrings)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        # Format the message once, not once per substring
+        message = record.getMessage()
+        return any(substring in message for substring in self.__substrings)
 
 
 def setup_logging(level: int = logging.INFO) -> None:
@@ -40,16 +98,15 @@ def setup_logging(level: int = logging.INFO) -> None:
     info_handler.addFilter(lambda record: record.levelno == logging.INFO)
     info_handler.setFormatter(logging.Formatter("%(message)s"))
 
+    colour = _use_colour(sys.stderr)
+
     # Create a handler that will make all Warning messages yellow
     warning_handler = logging.StreamHandler(sys.stderr)
     warning_handler.setLevel(logging.WARNING)
     warning_handler.addFilter(lambda record: record.levelno == logging.WARNING)
     warning_handler.setFormatter(
         logging.Formatter(
-            colored(
-                "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-                "yellow",
-            ),
+            _YELLOW_FMT if colour else _LOG_FMT,
             datefmt="%Y-%m-%d %H:%M:%S",
         )
     )
@@ -60,9 +117,7 @@ def setup_logging(level: int = logging.INFO) -> None:
     error_handler.addFilter(lambda record: record.levelno >= logging.ERROR)
     error_handler.setFormatter(
         logging.Formatter(
-            colored(
-                "%(asctime)s - %(name)s - %(levelname)s - %(message)s", "red"
-            ),
+            _RED_FMT if colour else _LOG_FMT,
             datefmt="%Y-%m-%d %H:%M:%S",
         )
     )
@@ -89,7 +144,7 @@ def add_debug_logging(logger_obj: logging.Logger = logger) -> None:
     debug_handler.addFilter(lambda record: record.levelno == logging.DEBUG)
     debug_handler.setFormatter(
         logging.Formatter(
-            "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+            _LOG_FMT,
             datefmt="%Y-%m-%d %H:%M:%S",
         )
     )
@@ -107,17 +162,19 @@ def add_name_filter(
     Args:
         names (list[str]): The list of names to filter logs by.
         logger_obj (logging.Logger): The logger to add the filter to. Defaults to the main logger.
-    """
 
-    class NameFilter(logging.Filter):
-        def filter(self, record: logging.LogRecord) -> bool:
-            return any(record.name.startswith(name + ".") for name in names)
+    Only handlers already on the logger are filtered, so this must be called after
+    the logger's handlers have been set up.
+    """
 
-    logger_obj.addFilter(NameFilter())
+    name_filter = _NameFilter(names)
+    logger_obj.addFilter(name_filter)
 
-    # Update existing handlers to apply the new filter
+    # Test loggers aren't children of this logger, they share its handlers
+    # instead, so the handlers need the filter as well. Handlers check their
+    # level filter first, so each record only reaches this one once.
     for handler in logger_obj.handlers:
-        handler.addFilter(NameFilter())
+        handler.addFilter(name_filter)
 
     logger.debug("Added name filter for: %s", ", ".join(names))
 
@@ -133,17 +190,12 @@ def add_message_filter(
         logger_obj (logging.Logger): The logger to add the filter to. Defaults to the main logger.
     """
 
-    class MessageFilter(logging.Filter):
-        def filter(self, record: logging.LogRecord) -> bool:
-            return any(
-                substring in record.getMessage() for substring in substrings
-            )
-
-    logger_obj.addFilter(MessageFilter())
+    message_filter = _MessageFilter(substrings)
+    logger_obj.addFilter(message_filter)
 
     # Update existing handlers to apply the new filter
     for handler in logger_obj.handlers:
-        handler.addFilter(MessageFilter())
+        handler.addFilter(message_filter)
 
     logger.debug(
         "Added message filter for substring: %s", ", ".join(substrings)
@@ -180,7 +232,12 @@ def setup_file_logging(
         file_path (str): The path to the log file.
         level (int): The logging level for the file. Defaults to logging.DEBUG.
         mode (str): The file mode, e.g., 'w' for write, 'a' for append. Defaults to 'w'.
+
+    Records are written to the file from a background thread, so logging from the
+    event loop never waits on disk. Each record is still flushed once written.
     """
+    global _file_listener, _file_queue_handler
+
     file_handler = logging.FileHandler(file_path, mode)
     file_handler.setLevel(level)
     file_handler.setFormatter(
@@ -189,8 +246,16 @@ def setup_file_logging(
         )
     )
 
+    stop_file_logging()
+    log_queue = queue.SimpleQueue()
+    _file_listener = logging.handlers.QueueListener(log_queue, file_handler)
+    _file_listener.start()
+
+    _file_queue_handler = logging.handlers.QueueHandler(log_queue)
+    _file_queue_handler.setLevel(level)
+
     file_logger.setLevel(level)
-    file_logger.addHandler(file_handler)
+    file_logger.addHandler(_file_queue_handler)
 
     logger.debug(
         "File logging set up at %s with level %s",
@@ -199,6 +264,27 @@ def setup_file_logging(
     )
 
 
+@atexit.register
+def stop_file_logging() -> None:
+    """
+    Write out any queued file log records and stop the file logging thread.
+
+    The log file is closed and records sent to the file logger afterwards are
+    no longer queued.
+    """
+    global _file_listener, _file_queue_handler
+
+    if _file_queue_handler:
+        file_logger.removeHandler(_file_queue_handler)
+        _file_queue_handler = None
+
+    if _file_listener:
+        _file_listener.stop()
+        for handler in _file_listener.handlers:
+            handler.close()
+        _file_listener = None
+
+
 def get_file_logger_name() -> str:
     """
     Get the name of the configured file logger.
@@ -22,13 +22,16 @@ It uses Docker Compose to set up the environment and runs tests against it.
 
 import asyncio
 import argparse
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 import os
 import signal
 import sys
 from pathlib import Path
 
-from src import logging_helper
-from src.states.state_tools import generate_states
+from src import logging_helper, runtime
+from src.states.state_tools import create_states, load_states
 from src.custom_test import (
     Test,
     create_test_logger,
@@ -38,106 +41,103 @@ from src.listener import ListenerType
 DEBUG_LEVEL = 0
 VERBOSE_LEVEL = 0
 
+# Maximum number of tests running at once, across all compose files
+MAX_PARALLEL_TESTS = (os.cpu_count() or 1) * 4
+
 listener_dir: Path = None
 
+# File extension of the listener destination for each listener type
+LISTENER_EXTENSIONS = {
+    ListenerType.SOCKET: ".sock",
+    ListenerType.FILE: ".txt",
+}
+
+# A test's name, logger, listener destination and parsed states, see load_states
+ParsedTest = tuple[str, logging.Logger, Path, tuple[float, str, list[dict]]]
+
 logging_helper.setup_logging()
 logger = logging_helper.get_logger()
 
 
-async def cleanup_and_shutdown() -> None:
+def list_yml_files(directory: Path) -> list[Path]:
     """
-    Clean up the tasks by cancelling them all and waiting for them to finish.
-    """
-    logger.info("Shutting down the tests...")
-    logger.debug("Cleaning up tasks and shutting down the event loop...")
-    tasks = [
-        task
-        for task in asyncio.all_tasks()
-        if task is not asyncio.current_task()
-    ]
-    for task in tasks:
-        logger.debug("Cancelling task: %s", task.get_name())
-        task.cancel()
-    await asyncio.gather(*tasks, return_exceptions=True)
-
-    logger.debug("Cleanup completed.")
-
-    logger.debug("Stopping the event loop...")
-
-    # Stop the event loop if it's running
-    try:
-        loop = asyncio.get_running_loop()
+    List the YAML files in a directory.
+
+    Uses the directory entries' cached types, so only symlinks need a stat.
+    Hidden files are included, as they are by Path.glob("*.yml"). Unlike the
+    glob, directories whose names end in ".yml" are skipped.
 
-        if loop:
-            loop.stop()
+    Args:
+        directory (Path): The directory to list.
 
-    except RuntimeError:
-        # No running event loop
-        pass
-    logger.debug("Event loop stopped.")
+    Returns:
+        list[Path]: Paths to the ".yml" files in the directory.
+    """
+    with os.scandir(directory) as entries:
+        return [
+            Path(entry.path)
+            for entry in entries
+            if entry.name.endswith(".yml") and entry.is_file()
+        ]
 
 
-def build_tests(
-    loop: asyncio.AbstractEventLoop,
+def parse_tests(
     config: Path | dict,
     compose_file: Path,
-    seed: int | None = None,
     listener_type: ListenerType = ListenerType.SOCKET,
-) -> list[Test]:
+) -> list[ParsedTest]:
     """
-    Build a list of Test objects from the configuration.
+    Parse the test configurations to run against a compose file.
+
+    Nothing here touches the event loop, so it's safe to call from a worker
+    thread. Pass the result to create_tests on the event loop's thread.
 
     Args:
-        loop (asyncio.AbstractEventLoop): The event loop to use.
         config (Path | dict): Path to the configuration file/directory or a dictionary
           containing the config.
         compose_file (Path): Path to the Docker Compose file.
-        seed (int | None): Seed for randomizing test states.
+        listener_type (ListenerType): The type of listener to use for the tests.
 
     Returns:
-        list[Test]: List of Test objects.
+        list[ParsedTest]: The name, logger, listener destination and parsed
+            states of each test.
 
     Raises:
         ValueError: If the configuration is invalid.
     """
-    logger.debug("Building tests")
+    logger.debug("Parsing tests")
 
-    tests = []
+    parsed = []
+
+    listener_ext = LISTENER_EXTENSIONS.get(listener_type)
+    if listener_ext is None:
+        raise ValueError(f"Unsupported listener type: {listener_type}")
+    compose_stem = compose_file.stem
 
     if isinstance(config, Path) and config.is_dir():
-        for test_file in config.glob("*.yml"):
-            test_name = test_file.stem + "-" + compose_file.stem
-            test_logger = create_test_logger(test_name, compose_file.stem)
-
-            match listener_type:
-                case ListenerType.SOCKET:
-                    test_listener_path = Path(
-                        listener_dir, test_name + ".sock"
-                    )
-                case ListenerType.FILE:
-                    test_listener_path = Path(
-                        listener_dir, test_name + ".txt"
-                    )
-                case _:
-                    raise ValueError(
-                        f"Unsupported listener type: {listener_type}"
-                    )
+        pending = []
+        for test_file in list_yml_files(config):
+            test_name = f"{test_file.stem}-{compose_stem}"
+            test_logger = create_test_logger(test_name, compose_stem)
+            test_listener_path = Path(listener_dir, test_name + listener_ext)
+
+            pending.append(
+                (test_file, test_name, test_logger, test_listener_path)
+            )
+
+        # Parse the test files concurrently
+        with ThreadPoolExecutor() as executor:
+            futures = [
+                executor.submit(load_states, test_file, test_name)
+                for test_file, test_name, _, _ in pending
+            ]
 
+        for future, (test_file, test_name, test_logger, test_listener_path) in zip(
+            futures, pending
+        ):
             try:
-                timeout, states = generate_states(
-                    loop, test_file, test_name, test_logger, seed=seed
-                )
-                tests.append(
-                    Test(
-                        name=test_name,
-                        states=states,
-                        compose_file=compose_file,
-                        timeout=timeout,
-                        listener_dest=test_listener_path,
-                        detail_level=VERBOSE_LEVEL,
-                        loop=loop,
-                        logger=test_logger,
-                    )
+                parsed.append(
+                    (test_name, test_logger, test_listener_path, future.result())
                 )
             except ValueError as e:
                 # TODO: Log the error to the correct logger
@@ -145,148 +145,315 @@ def build_tests(
                 logger.debug("Skipping invalid test configuration.")
     else:
         try:
-            test_name = "custom_test" + "-" + compose_file.stem
-            test_logger = create_test_logger(test_name, compose_file.stem)
-
-            match listener_type:
-                case ListenerType.SOCKET:
-                    test_listener_path = Path(
-                        listener_dir, test_name + ".sock"
-                    )
-                case ListenerType.FILE:
-                    test_listener_path = Path(
-                        listener_dir, test_name + ".txt"
-                    )
-                case _:
-                    raise ValueError(
-                        f"Unsupported listener type: {listener_type}"
-                    )
-
-            timeout, states = generate_states(
-                loop, config, test_name, test_logger, seed=seed
-            )
-            tests.append(
-                Test(
-                    name=test_name,
-                    states=states,
-                    compose_file=compose_file,
-                    timeout=timeout,
-                    listener_dest=test_listener_path,
-                    detail_level=VERBOSE_LEVEL,
-                    loop=loop,
-                    logger=test_logger,
+            test_name = f"custom_test-{compose_stem}"
+            test_logger = create_test_logger(test_name, compose_stem)
+            test_listener_path = Path(listener_dir, test_name + listener_ext)
+
+            parsed.append(
+                (
+                    test_name,
+                    test_logger,
+                    test_listener_path,
+                    load_states(config, test_name),
                 )
             )
         except ValueError as e:
             raise ValueError(f"Invalid configuration: {e}") from e
 
+    return parsed
+
+
+def create_tests(
+    loop: asyncio.AbstractEventLoop,
+    parsed: list[ParsedTest],
+    compose_file: Path,
+    seed: int | None = None,
+) -> list[Test]:
+    """
+    Create the Test objects for parsed test configurations.
+
+    Tests and their states create futures on the event loop, so this must be
+    called from the event loop's thread.
+
+    Args:
+        loop (asyncio.AbstractEventLoop): The event loop to use.
+        parsed (list[ParsedTest]): The parsed tests, as returned by parse_tests.
+        compose_file (Path): Path to the Docker Compose file.
+        seed (int | None): Seed for randomizing test states.
+
+    Returns:
+        list[Test]: List of Test objects.
+    """
+    tests = []
+    for test_name, test_logger, test_listener_path, test_config in parsed:
+        timeout, states = create_states(
+            loop, test_config, test_name, test_logger, seed=seed
+        )
+        tests.append(
+            Test(
+                name=test_name,
+                states=states,
+                compose_file=compose_file,
+                timeout=timeout,
+                listener_dest=test_listener_path,
+                detail_level=VERBOSE_LEVEL,
+                loop=loop,
+                logger=test_logger,
+            )
+        )
     return tests
 
 
-async def run_tests(tests: list[Test]) -> None:
+def build_tests(
+    loop: asyncio.AbstractEventLoop,
+    config: Path | dict,
+    compose_file: Path,
+    seed: int | None = None,
+    listener_type: ListenerType = ListenerType.SOCKET,
+) -> list[Test]:
+    """
+    Build a list of Test objects from the configuration.
+
+    Must be called from the event loop's thread, see create_tests.
+
+    Args:
+        loop (asyncio.AbstractEventLoop): The event loop to use.
+        config (Path | dict): Path to the configuration file/directory or a dictionary
+          containing the config.
+        compose_file (Path): Path to the Docker Compose file.
+        seed (int | None): Seed for randomizing test states.
+        listener_type (ListenerType): The type of listener to use for the tests.
+
+    Returns:
+        list[Test]: List of Test objects.
+
+    Raises:
+        ValueError: If the configuration is invalid.
+    """
+    logger.debug("Building tests")
+
+    return create_tests(
+        loop,
+        parse_tests(config, compose_file, listener_type=listener_type),
+        compose_file,
+        seed=seed,
+    )
+
+
+async def run_compose_files(
+    loop: asyncio.AbstractEventLoop,
+    configs: Path | dict,
+    compose_files: list[Path],
+    seed: int | None = None,
+    listener_type: ListenerType = ListenerType.SOCKET,
+    slots: asyncio.Semaphore | None = None,
+) -> None:
+    """
+    Run the tests against each of the provided compose files.
+
+    The tests for each compose file are parsed on a worker thread, created on
+    the event loop and start as soon as they're ready, alongside the tests for
+    the other compose files.
+
+    Args:
+        loop (asyncio.AbstractEventLoop): The event loop to use.
+        configs (Path | dict): Path to the test configuration file/directory or a
+            dictionary containing the config.
+        compose_files (list[Path]): Paths to the Docker Compose files.
+        seed (int | None): Seed for randomizing test states.
+        listener_type (ListenerType): The type of listener to use for the tests.
+        slots (asyncio.Semaphore | None): Limits how many tests run at once,
+            shared by all compose files. Defaults to no limit.
+    """
+
+    async def prepare_and_run(compose_file: Path) -> None:
+        logger.info("Running tests for compose file: %s", compose_file)
+
+        try:
+            parsed = await loop.run_in_executor(
+                None,
+                partial(
+                    parse_tests,
+                    configs,
+                    compose_file,
+                    listener_type=listener_type,
+                ),
+            )
+        except ValueError as e:
+            logger.error(
+                "Error building tests for compose file %s: %s", compose_file, e
+            )
+            return
+
+        await run_tests(create_tests(loop, parsed, compose_file, seed=seed), slots)
+
+    await asyncio.gather(
+        *(prepare_and_run(compose_file) for compose_file in compose_files)
+    )
+
+
+async def run_tests(
+    tests: list[Test], slots: asyncio.Semaphore | None = None
+) -> None:
     """
     Run the provided tests.
 
     Args:
         tests (list[Test]): List of Test objects to run.
+        slots (asyncio.Semaphore | None): Limits how many tests run at once. Each
+            test holds the semaphore while it runs. Defaults to no limit.
     """
-    try:
-        async with asyncio.TaskGroup() as tg:
-            for test in tests:
-                tg.create_task(test.run(VERBOSE_LEVEL >= 3))
-    except* ValueError as eg:
-        for e in eg.exceptions:
-            logger.error("An error occurred while running tests: %s", e)
+    log_containers = VERBOSE_LEVEL >= 3
+
+    async def run_test(test: Test) -> None:
+        if slots is None:
+            await test.run(log_containers)
+            return
+        async with slots:
+            await test.run(log_containers)
+
+    results = await asyncio.gather(
+        *(run_test(test) for test in tests),
+        return_exceptions=True,
+    )
+
+    errors = []
+    for result in results:
+        if isinstance(result, ValueError):
+            logger.error("An error occurred while running tests: %s", result)
+        elif isinstance(result, Exception):
+            errors.append(result)
+    if errors:
+        raise ExceptionGroup("Unexpected errors while running tests", errors)
 
     logger.info("All tests completed.")
 
 
-def main(
+async def run_main(
     compose_source: Path,
     configs: Path | dict,
+    seed: int | None = None,
     listener_type: ListenerType = ListenerType.SOCKET,
-    **kwargs,
+    jobs: int = MAX_PARALLEL_TESTS,
 ) -> None:
     """
-    Main function to run the multi-server tests.
+    Run the multi-server tests on the running event loop.
+
+    SIGINT and SIGTERM cancel the tests, which then tear down their containers
+    and listeners before this returns.
 
     Args:
-        compose_source (Path): Path to the Docker Compose file.
+        compose_source (Path): Path to the Docker Compose file or a directory of them.
         configs (Path | dict): Path to the test configuration file or a dictionary
             containing the config.
-        **kwargs: Additional keyword arguments.
+        seed (int | None): Seed for randomizing test states.
+        listener_type (ListenerType): The type of listener to use for the tests.
+        jobs (int): Maximum number of tests to run at once, across all compose files.
+
+    Raises:
+        ValueError: If the configuration is invalid.
     """
-    # Run a test in an asynchronous event loop
-    try:
-        loop = asyncio.get_event_loop()
-    except RuntimeError:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
+    loop = asyncio.get_running_loop()
 
-    try:
-        # Add a signal handler to gracefully handle shutdown
-        for sig in (signal.SIGINT, signal.SIGTERM):
-            loop.add_signal_handler(
-                sig, lambda: asyncio.create_task(cleanup_and_shutdown())
-            )
+    # Add a signal handler to gracefully handle shutdown
+    main_task = asyncio.current_task()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, main_task.cancel)
+
+    slots = asyncio.Semaphore(jobs)
 
+    try:
         if compose_source.is_dir():
             # Run tests for each compose file in the directory
-            for compose_file in compose_source.glob("*.yml"):
-                logger.info("Running tests for compose file: %s", compose_file)
-
-                # Generate the states from the config
-                tests = build_tests(
-                    loop,
-                    configs,
-                    compose_file,
-                    seed=kwargs.get("seed"),
-                    listener_type=listener_type,
-                )
-
-                # Create the test task group
-                test_task = loop.create_task(run_tests(tests))
-
-                # Start the shutdown when the test completes
-                test_task.add_done_callback(
-                    lambda _: asyncio.create_task(cleanup_and_shutdown())
-                )
+            await run_compose_files(
+                loop,
+                configs,
+                list_yml_files(compose_source),
+                seed=seed,
+                listener_type=listener_type,
+                slots=slots,
+            )
         elif compose_source.is_file():
             # Generate the states from the config
             tests = build_tests(
                 loop,
                 configs,
                 compose_source,
-                seed=kwargs.get("seed"),
+                seed=seed,
                 listener_type=listener_type,
             )
-
-            # Create the test task group
-            test_task = loop.create_task(run_tests(tests))
-
-            # Start the shutdown when the test completes
-            test_task.add_done_callback(
-                lambda _: asyncio.create_task(cleanup_and_shutdown())
-            )
-
+            await run_tests(tests, slots)
         else:
             logger.error(
                 "Invalid compose source: %s. Must be a file or directory.",
                 compose_source,
             )
-            return
+    except asyncio.CancelledError:
+        logger.info("Shutting down the tests...")
+    finally:
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.remove_signal_handler(sig)
+
 
-        # Run the event loop until all tasks are complete
-        loop.run_forever()
+def main(
+    compose_source: Path,
+    configs: Path | dict,
+    listener_type: ListenerType = ListenerType.SOCKET,
+    **kwargs,
+) -> None:
+    """
+    Main function to run the multi-server tests.
+
+    Args:
+        compose_source (Path): Path to the Docker Compose file.
+        configs (Path | dict): Path to the test configuration file or a dictionary
+            containing the config.
+        **kwargs: Additional keyword arguments.
+    """
+    try:
+        # Run the tests in an asynchronous event loop, the runner cancels any
+        # tasks left over once they're done and closes the loop
+        with asyncio.Runner(loop_factory=runtime.new_event_loop) as runner:
+            logger.debug(
+                "Using event loop: %s", type(runner.get_loop()).__name__
+            )
+            runner.run(
+                run_main(
+                    compose_source,
+                    configs,
+                    seed=kwargs.get("seed"),
+                    listener_type=listener_type,
+                    jobs=kwargs.get("jobs", MAX_PARALLEL_TESTS),
+                )
+            )
     except Exception as e:
         logger.error("An error occurred while running tests: %s", e)
-    finally:
-        logger.debug("Closing the event loop...")
-        loop.close()
 
     logger.info("Multi-server tests completed.")
 
 
+def positive_int(value: str) -> int:
+    """
+    Parse a command line argument that must be a positive integer.
+
+    Args:
+        value (str): The argument value.
+
+    Returns:
+        int: The parsed value.
+
+    Raises:
+        argparse.ArgumentTypeError: If the value is not a positive integer.
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"{value!r} is not a positive integer")
+    return number
+
+
 def parse_args(args=None, prog=__package__) -> argparse.Namespace:
     """
     Parses command line arguments for the main function.
@@ -372,6 +539,14 @@ def parse_args(args=None, prog=__package__) -> argparse.Namespace:
         help="Use file-based listeners instead of socket-based listeners.",
         default=False,
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        dest="jobs",
+        type=positive_int,
+        help=f"Maximum number of tests to run at once. Defaults to {MAX_PARALLEL_TESTS}.",
+        default=MAX_PARALLEL_TESTS,
+    )
     parser.add_argument(
         "--debug",
         "-x",
@@ -415,6 +590,8 @@ def interface() -> None:
     logging_helper.setup_file_logging(parsed_args.output)
     file_logger = logging_helper.get_file_logger()
 
+    logger.debug("Running at most %d tests at once", parsed_args.jobs)
+
     if parsed_args.verbose:
         global VERBOSE_LEVEL
         VERBOSE_LEVEL = parsed_args.verbose
@@ -478,6 +655,7 @@ def interface() -> None:
                 configs=test_configs,
                 seed=parsed_args.seed,
                 listener_type=listener_type,
+                jobs=parsed_args.jobs,
             )
         else:
             main(
@@ -485,6 +663,7 @@ def interface() -> None:
                 configs=parsed_args.test,
                 seed=parsed_args.seed,
                 listener_type=listener_type,
+                jobs=parsed_args.jobs,
             )
 
     else:
@@ -493,6 +672,7 @@ def interface() -> None:
             configs=parsed_args.test,
             seed=parsed_args.seed,
             listener_type=listener_type,
+            jobs=parsed_args.jobs,
         )
 
 
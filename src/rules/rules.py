@@ -21,6 +21,7 @@ import re
 import logging
 import json
 
+from src.code_blocks import compile_block
 from src.rules.utils import safe_json_load
 
 # All rule methods should return True if the rule passes, False otherwise.
@@ -28,6 +29,18 @@ from src.rules.utils import safe_json_load
 CONTROL_MAP = {}  # A mapping of control rule names to their functions.
 RULES_MAP = {}  # A mapping of rule names to their functions.
 
+# Compiled code rule functions, keyed by their code block.
+_COMPILED: dict[str, callable] = {}
+
+# The anchor options of 'pattern' rules, mapped to the pattern method used.
+PATTERN_ANCHORS = {"match": "match", "fullmatch": "fullmatch", "search": "search"}
+
+# Operations of compiled 'json' rule conditions, see compile_json_conditions.
+_JSON_KEY = "key"
+_JSON_CHECK = "check"
+_JSON_DESCEND = "descend"
+_JSON_ASCEND = "ascend"
+
 
 class SingleRuleFailure(Exception):
     """Exception raised when a single rule fails from a set of rules."""
@@ -55,12 +68,17 @@ def all_pass(
         SingleRuleFailure: If any method returns False.
     """
 
-    logger.debug("Evaluating 'all' rule with %d methods.", len(methods))
+    # Checked once per call, this runs for every message a state receives
+    debug = logger.isEnabledFor(logging.DEBUG)
+    if debug:
+        logger.debug("Evaluating 'all' rule with %d methods.", len(methods))
     for method in methods:
         if not method(string):
-            logger.debug("'all' rule failed on method: %s", method.__name__)
+            if debug:
+                logger.debug("'all' rule failed on method: %s", method.__name__)
             raise SingleRuleFailure(f"all: {method.friendly_str}")
-    logger.debug("'all' rule passed.")
+    if debug:
+        logger.debug("'all' rule passed.")
     return True
 
 
@@ -81,12 +99,16 @@ def any_pass(
     Returns:
         bool: True if any method returns True, False otherwise.
     """
-    logger.debug("Evaluating 'any' rule with %d methods.", len(methods))
+    debug = logger.isEnabledFor(logging.DEBUG)
+    if debug:
+        logger.debug("Evaluating 'any' rule with %d methods.", len(methods))
     for method in methods:
         if method(string):
-            logger.debug("'any' rule passed on method: %s", method.__name__)
+            if debug:
+                logger.debug("'any' rule passed on method: %s", method.__name__)
             return True
-    logger.debug("'any' rule failed.")
+    if debug:
+        logger.debug("'any' rule failed.")
     return False
 
 
@@ -130,7 +152,11 @@ RULES_MAP.update({"pass": pass_rule, "fire": pass_rule})
 
 
 def pattern(
-    reg_pattern: str | re.Pattern[str], logger: logging.Logger, string: str | bytes
+    reg_pattern: str | re.Pattern[str],
+    logger: logging.Logger,
+    string: str | bytes,
+    anchor: str = "match",
+    bytes_pattern: re.Pattern[bytes] | None = None,
 ) -> bool:
     """
     Check if a string matches a given regex pattern.
@@ -139,17 +165,27 @@ def pattern(
         pattern (str | re.Pattern[str]): The regex pattern to match against.
         logger (logging.Logger): Logger for debug output.
         string (str | bytes): The string to be checked.
+        anchor (str): How the pattern is anchored, one of PATTERN_ANCHORS.
+            "match" anchors it at the start of the string, "fullmatch" at both
+            ends, and "search" finds it anywhere. Defaults to "match".
+        bytes_pattern (re.Pattern[bytes] | None): The pattern compiled for bytes,
+            used for ASCII bytes strings so they don't need to be decoded. Set by
+            `build_rule`.
 
     Returns:
         bool: True if the string matches the pattern, False otherwise.
     """
-    if isinstance(string, bytes):
-        string = string.decode("utf-8", errors="ignore")
-
     if isinstance(reg_pattern, str):
         reg_pattern = re.compile(reg_pattern)
 
-    match = reg_pattern.match(string)
+    matcher = reg_pattern
+    if isinstance(string, bytes):
+        if bytes_pattern is not None and string.isascii():
+            matcher = bytes_pattern
+        else:
+            string = string.decode("utf-8", errors="ignore")
+
+    match = getattr(matcher, PATTERN_ANCHORS[anchor])(string)
     if match:
         logger.debug("Pattern matched: %s", reg_pattern.pattern)
         return True
@@ -160,6 +196,33 @@ def pattern(
 RULES_MAP.update({"pattern": pattern, "regex": pattern})
 
 
+def parse_number(string: float | str | bytes) -> float | None:
+    """
+    Parse the number checked by a 'range' rule.
+
+    Args:
+        string (float | str | bytes): The number, or a string holding it. For
+            ':' separated strings, the second field is used.
+
+    Returns:
+        float | None: The number, or None if the string isn't a valid float.
+    """
+    if isinstance(string, bytes) and not string.isascii():
+        string = string.decode("utf-8", errors="ignore")
+
+    if isinstance(string, (str, bytes)):
+        # float() parses ASCII bytes directly. Use the second ':' separated
+        # field, if any, without building a list of all of them.
+        separator = b":" if isinstance(string, bytes) else ":"
+        _, found, tail = string.partition(separator)
+        try:
+            return float(tail.partition(separator)[0] if found else string)
+        except ValueError:
+            return None
+
+    return string
+
+
 def within_range(
     minimum: float, maximum: float, logger: logging.Logger, string: float | str | bytes
 ) -> bool:
@@ -178,26 +241,76 @@ def within_range(
     logger.debug(
         "Checking if number is within range: %f - %f", minimum, maximum
     )
-    if isinstance(string, bytes):
-        string = string.decode("utf-8", errors="ignore")
-
     logger.debug("Number to check: %s", string)
 
-    if isinstance(string, str):
-        try:
-            string_parts = string.split(":")
-            if len(string_parts) == 1:
-                string = float(string_parts[0])
-            else:
-                string = float(string_parts[1])
-        except ValueError:
-            logger.debug("Provided value is not a valid float: %s", string)
-            return False
+    number = parse_number(string)
+    if number is None:
+        logger.debug("Provided value is not a valid float: %s", string)
+        return False
 
-    if minimum <= string <= maximum:
-        logger.debug("Number is within range: %f", string)
+    if minimum <= number <= maximum:
+        logger.debug("Number is within range: %f", number)
         return True
-    logger.debug("Number is out of range: %f", string)
+    logger.debug("Number is out of range: %f", number)
+    return False
+
+
+def all_within_ranges(
+    bounds: tuple, methods: list[callable], logger: logging.Logger, string: float | str | bytes
+) -> bool:
+    """
+    Check if a number is within all of an 'all' rule's ranges.
+
+    Used in place of `all_pass` when all of its rules are 'range' rules, so the
+    number is parsed once rather than once per rule.
+
+    Args:
+        bounds (tuple): The (minimum, maximum) of each rule's range.
+        methods (list[callable]): The rules, reported when their range fails.
+        logger (logging.Logger): Logger for debug output.
+        string (float | str | bytes): The number to be checked.
+
+    Returns:
+        bool: True if the number is within all ranges.
+
+    Raises:
+        SingleRuleFailure: If the number is outside any range.
+    """
+    number = parse_number(string)
+    for (minimum, maximum), method in zip(bounds, methods):
+        if number is None or not minimum <= number <= maximum:
+            logger.debug("'all' rule failed on range: %s - %s", minimum, maximum)
+            raise SingleRuleFailure(f"all: {method.friendly_str}")
+    return True
+
+
+def any_within_ranges(
+    bounds: tuple, logger: logging.Logger, string: float | str | bytes
+) -> bool:
+    """
+    Check if a number is within any of an 'any' rule's ranges.
+
+    Used in place of `any_pass` when all of its rules are 'range' rules, so the
+    number is parsed once rather than once per rule.
+
+    Args:
+        bounds (tuple): The (minimum, maximum) of each rule's range.
+        logger (logging.Logger): Logger for debug output.
+        string (float | str | bytes): The number to be checked.
+
+    Returns:
+        bool: True if the number is within any range, False otherwise.
+    """
+    number = parse_number(string)
+    if number is None:
+        logger.debug("Provided value is not a valid float: %s", string)
+        return False
+
+    for minimum, maximum in bounds:
+        if minimum <= number <= maximum:
+            logger.debug("'any' rule passed on range: %s - %s", minimum, maximum)
+            return True
+    logger.debug("'any' rule failed.")
     return False
 
 
@@ -220,6 +333,27 @@ def is_code_safe(_source: str, logger: logging.Logger) -> bool:
     return True
 
 
+def _compile_block(block: str) -> callable:
+    """
+    Get the compiled function for a code block.
+
+    The block is compiled the first time it is seen, later calls reuse the
+    cached function.
+
+    Args:
+        block (str): The code block to compile.
+
+    Returns:
+        callable: A function taking the `string` being validated and the `logger`.
+    """
+    func = _COMPILED.get(block)
+    if func is None:
+        func = _COMPILED[block] = compile_block(
+            block, ("string", "logger"), "<rule>"
+        )
+    return func
+
+
 def code(block: str, logger: logging.Logger, string: str | bytes) -> bool:
     """
     Execute a custom code block for validation.
@@ -242,13 +376,8 @@ def code(block: str, logger: logging.Logger, string: str | bytes) -> bool:
 
     logger.debug("Executing custom code block.")
 
-    indented_block = "\n".join(f"    {line}" for line in block.splitlines())
-    wrapped_code = f"def _wrapped_func():\n{indented_block}"
-
-    local_vars = {"string": string, "logger": logger}
     try:
-        exec(wrapped_code, local_vars)
-        result = local_vars.get("_wrapped_func", lambda: False)()
+        result = _compile_block(block)(string, logger)
         logger.debug("Custom code block executed with result: %s", result)
         return result
     except Exception as e:
@@ -258,71 +387,92 @@ def code(block: str, logger: logging.Logger, string: str | bytes) -> bool:
 
 RULES_MAP.update({"code": code})
 
-def __json_rule(logger: logging.Logger, string: dict, **kwargs) -> bool:
+def compile_json_conditions(conditions: dict) -> tuple:
+    """
+    Flatten the conditions of a 'json' rule into a sequence of operations.
+
+    This only depends on the rule's parameters, so it can be done once when the
+    rule is built instead of for every message. Nested 'json' conditions are
+    flattened too, between a descend and an ascend operation, so evaluating
+    them doesn't need a recursive call per level.
+
+    Args:
+        conditions (dict): The 'json' rule's parameters, mapping keys in the JSON
+            object to their conditions.
+
+    Returns:
+        tuple: The operations, as tuples starting with one of the _JSON_* codes.
+    """
+    ops = []
+    for key, key_conditions in conditions.items():
+        ops.append((_JSON_KEY, key))
+        for condition, condition_args in key_conditions.items():
+            rule_func = RULES_MAP.get(condition)
+            if rule_func is json_rule:
+                # Nested objects are checked directly, without being parsed again
+                ops.append((_JSON_DESCEND,))
+                ops.extend(compile_json_conditions(condition_args))
+                ops.append((_JSON_ASCEND,))
+            else:
+                ops.append((_JSON_CHECK, condition, rule_func, condition_args))
+    return tuple(ops)
+
+
+def check_json(conditions: tuple, logger: logging.Logger, string: dict) -> bool:
     """
-    Internal helper function for the 'json' rule to validate a JSON object
-    against specified conditions.
+    Check a parsed JSON object against the compiled conditions of a 'json' rule.
 
     Args:
+        conditions (tuple): The operations from `compile_json_conditions`.
         logger (logging.Logger): Logger for debug output.
         string (dict): The JSON object to be validated.
-        **kwargs: Conditions to check within the JSON object.
-    
+
     Returns:
         bool: True if all conditions are met, False otherwise.
     """
-    logger.debug("Evaluating 'json' rule with conditions: %s", kwargs)
-    for key, conditions in kwargs.items():
-        logger.debug(
-            "Processing key '%s' with conditions: %s", key, conditions
-        )
-        if key not in string:
-            logger.debug("Key '%s' not found in JSON object.", key)
-            return False
-        value = string[key]
-        logger.debug("Evaluating key '%s' with value: %s", key, value)
-        for condition, condition_args in conditions.items():
-            logger.debug(
-                "Evaluating condition '%s' for key '%s' with args: %s",
-                condition,
-                key,
-                condition_args,
-            )
-
-            rule_func = RULES_MAP.get(condition)
-            if not rule_func:
+    logger.debug("Evaluating 'json' rule with conditions: %s", conditions)
+
+    # The object whose keys are checked, the current key and its value, with the
+    # enclosing objects' ones saved while checking a nested object
+    current, key, value = string, None, string
+    stack = []
+    for op in conditions:
+        code = op[0]
+        if code is _JSON_KEY:
+            key = op[1]
+            if key not in current:
+                logger.debug("Key '%s' not found in JSON object.", key)
+                return False
+            value = current[key]
+            logger.debug("Evaluating key '%s' with value: %s", key, value)
+        elif code is _JSON_CHECK:
+            _, condition, rule_func, condition_args = op
+            if rule_func is None:
                 logger.debug(
                     "Unknown condition '%s' for key '%s'.", condition, key
                 )
                 return False
 
-            # Cast value to expected type if annotation exists
-            logger.debug("Type of value before casting: %s", type(value))
-
-            if "json_rule" == rule_func.__name__:
-                # Use this internal helper to avoid double JSON parsing and Base64 encoding
-                rule_func = __json_rule
-                value_cast = value
-            else:
-                value_cast = str(value)
-            logger.debug(
-                "Type of value after casting: %s", type(value_cast)
-            )
-
             if not rule_func(
-                **condition_args, logger=logger, string=value_cast
+                **condition_args, logger=logger, string=str(value)
             ):
                 logger.debug(
                     "Condition '%s' failed for key '%s' with value: %s",
                     condition,
                     key,
-                    value_cast,
+                    value,
                 )
                 return False
+        elif code is _JSON_DESCEND:
+            stack.append((current, key, value))
+            current = value
+        else:
+            current, key, value = stack.pop()
 
     logger.debug("'json' rule passed.")
     return True
 
+
 def json_rule(logger: logging.Logger, string: str | bytes, **kwargs) -> bool:
     """
     Check if a JSON string meets specified conditions.
@@ -335,7 +485,23 @@ def json_rule(logger: logging.Logger, string: str | bytes, **kwargs) -> bool:
     Returns:
         bool: True if all conditions are met, False otherwise.
     """
-    logger.debug("Received args: %s", kwargs)
+    return compiled_json_rule(compile_json_conditions(kwargs), logger, string)
+
+
+def compiled_json_rule(
+    conditions: tuple, logger: logging.Logger, string: str | bytes
+) -> bool:
+    """
+    Check if a JSON string meets the compiled conditions of a 'json' rule.
+
+    Args:
+        conditions (tuple): The conditions from `compile_json_conditions`.
+        logger (logging.Logger): Logger for debug output.
+        string (str | bytes): The JSON string to be validated.
+
+    Returns:
+        bool: True if all conditions are met, False otherwise.
+    """
     logger.debug("Received string: %s", string)
 
     try:
@@ -345,7 +511,7 @@ def json_rule(logger: logging.Logger, string: str | bytes, **kwargs) -> bool:
             return False
 
         logger.debug("Parsed JSON data: %s", data)
-        return __json_rule(logger, data, **kwargs)
+        return check_json(conditions, logger, data)
 
     except json.JSONDecodeError as e:
         logger.debug("Failed to parse JSON: %s", e)
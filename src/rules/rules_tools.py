@@ -20,10 +20,274 @@ Tools to build rules from conditions and parameters.
 """
 
 import logging
+import re
 from src.rules import rules
 
 from src import logging_helper
 
+try:
+    import re2
+
+    # Unsupported patterns fall back to re, don't log RE2's parse errors for them
+    RE2_OPTIONS = re2.Options()
+    RE2_OPTIONS.log_errors = False
+except ImportError:
+    re2 = None
+
+# Regex engines a pattern rule can ask for with its 'engine' parameter
+PATTERN_ENGINES = ("re", "re2")
+
+# Regex parameters of each rule, compiled once when the rule is built rather than
+# looked up in the re module's cache on every check
+COMPILED_PARAMS = {
+    "pattern": "reg_pattern",
+    "regex": "reg_pattern",
+}
+
+# Rules whose parameters are compiled once when the rule is built, mapped to the
+# function compiling them and the rule function taking the compiled result
+COMPILED_RULES = {
+    "json": (rules.compile_json_conditions, rules.compiled_json_rule),
+}
+
+
+# Patterns that can't be combined into an alternation, as their group references
+# would point at other patterns' groups
+GROUP_REFERENCE = re.compile(r"\\[1-9]|\(\?P=|\(\?\(")
+
+
+# Patterns setting global flags inline, e.g. "(?i)", which can't be combined into
+# an alternation. Python 3.11+ rejects them anywhere but at the start, and older
+# versions apply them to the whole combined pattern.
+GLOBAL_FLAGS = re.compile(r"\(\?[aiLmsux]+\)")
+
+
+# Patterns using whitespace classes, which match differently for str and bytes
+WHITESPACE_CLASS = re.compile(r"\\[sS]")
+
+
+def compile_pattern(pattern: str | bytes, engine: str = "re") -> re.Pattern:
+    """
+    Compile a regex pattern for a rule.
+
+    Rules ask for RE2 with `engine: re2`. RE2 matches in linear time, so it
+    can't be made to backtrack catastrophically by a message, but its syntax and
+    matching differ from the re module's in places, so it's never used unless
+    asked for. Without google-re2 installed, or for patterns RE2 doesn't
+    support such as backreferences and lookarounds, the re module is used.
+
+    Args:
+        pattern (str | bytes): The regex pattern to compile.
+        engine (str): The regex engine to use, one of PATTERN_ENGINES. Defaults
+            to "re".
+
+    Returns:
+        re.Pattern: The compiled pattern.
+
+    Raises:
+        re.error: If the pattern is invalid.
+    """
+    if engine == "re2" and re2 is not None:
+        try:
+            return re2.compile(pattern, RE2_OPTIONS)
+        except re2.error:
+            pass
+    return re.compile(pattern)
+
+
+def pattern_engine(compiled: re.Pattern) -> str:
+    """
+    Get the regex engine a pattern was compiled with.
+
+    Args:
+        compiled (re.Pattern): A pattern returned by `compile_pattern`.
+
+    Returns:
+        str: The engine, one of PATTERN_ENGINES.
+    """
+    return "re" if isinstance(compiled, re.Pattern) else "re2"
+
+
+# Rules whose result doesn't depend on the string, mapped to that result
+CONSTANT_RULES = {
+    rules.pass_rule: True,
+    rules.never_fire: False,
+}
+
+
+def prune_constant_rules(
+    func: callable, methods: list[callable]
+) -> list[callable]:
+    """
+    Remove the rules an 'all' or 'any' rule doesn't need to evaluate.
+
+    Rules that always pass can't fail an 'all' rule, and rules that always fail
+    can't pass an 'any' rule. Rules after one that always ends the evaluation
+    are never reached. The remaining rules keep their order, so the same rule is
+    still reported when an 'all' rule fails.
+
+    Args:
+        func (callable): The control function, `rules.all_pass` or `rules.any_pass`.
+        methods (list[callable]): The rules built by `build_rule`.
+
+    Returns:
+        list[callable]: The rules that still need to be evaluated.
+    """
+    if func is rules.all_pass:
+        neutral = True
+    elif func is rules.any_pass:
+        neutral = False
+    else:
+        return methods
+
+    pruned = []
+    for method in methods:
+        result = getattr(method, "constant_result", None)
+        if result is neutral:
+            continue
+        pruned.append(method)
+        if result is not None:
+            break
+    return pruned
+
+
+def compile_bytes_pattern(pattern: str, engine: str = "re") -> re.Pattern | None:
+    """
+    Compile a bytes variant of a rule's pattern, to match ASCII messages with.
+
+    ASCII bytes can then be matched directly rather than decoded first. Only
+    ASCII patterns are compiled, and not ones using \\s or \\S: for str patterns
+    those also match the ASCII separator characters \\x1c-\\x1f, which bytes
+    patterns don't.
+
+    Args:
+        pattern (str): The regex pattern.
+        engine (str): The regex engine to use, see `compile_pattern`.
+
+    Returns:
+        re.Pattern | None: The compiled bytes pattern, or None if the pattern
+            can't be used for bytes.
+    """
+    if not pattern.isascii() or WHITESPACE_CLASS.search(pattern):
+        return None
+    try:
+        return compile_pattern(pattern.encode("ascii"), engine)
+    except re.error:
+        return None
+
+
+def combine_patterns(methods: list[callable]) -> re.Pattern | None:
+    """
+    Combine the patterns of a list of pattern rules into a single pattern.
+
+    The combined pattern matches wherever any of the patterns matches, so an 'any'
+    rule over them scans the string once instead of once per pattern. Patterns
+    are only combined with ones compiled by the same regex engine, and the
+    combined pattern uses that engine too.
+
+    Args:
+        methods (list[callable]): The rules built by `build_rule`.
+
+    Returns:
+        re.Pattern | None: The combined pattern, or None if the rules aren't all
+            pattern rules or their patterns can't be combined.
+    """
+    patterns = []
+    engines = set()
+    for method in methods:
+        params = getattr(method, "rule_params", {})
+        if not {"reg_pattern"} <= params.keys() <= {"reg_pattern", "bytes_pattern"}:
+            return None
+        reg_pattern = params["reg_pattern"]
+        if isinstance(reg_pattern, str):
+            engines.add("re")
+        else:
+            engines.add(pattern_engine(reg_pattern))
+            reg_pattern = reg_pattern.pattern
+        if GROUP_REFERENCE.search(reg_pattern) or GLOBAL_FLAGS.search(reg_pattern):
+            return None
+        patterns.append(reg_pattern)
+
+    if len(patterns) < 2 or len(engines) > 1:
+        return None
+
+    try:
+        return compile_pattern(
+            "|".join(f"(?:{p})" for p in patterns), engines.pop()
+        )
+    except re.error:
+        # e.g. duplicate group names
+        return None
+
+
+def combine_ranges(methods: list[callable]) -> tuple | None:
+    """
+    Collect the bounds of a list of range rules.
+
+    Args:
+        methods (list[callable]): The rules built by `build_rule`.
+
+    Returns:
+        tuple | None: The (minimum, maximum) of each rule, or None if the rules
+            aren't all range rules.
+    """
+    bounds = []
+    for method in methods:
+        params = getattr(method, "rule_params", {})
+        if params.keys() != {"minimum", "maximum"}:
+            return None
+        bounds.append((params["minimum"], params["maximum"]))
+    return tuple(bounds) if len(bounds) > 1 else None
+
+
+def bind_rule(
+    func: callable, params: dict, logger: logging.Logger
+) -> callable:
+    """
+    Bind a rule function to its parameters and logger.
+
+    Rule functions take their parameters followed by the logger and the string,
+    and optionally more parameters with defaults. When the parameters are
+    exactly those arguments, they're bound positionally so a check doesn't build
+    a keyword dict per call.
+
+    Args:
+        func (callable): The rule function.
+        params (dict): The parameters for the rule.
+        logger (logging.Logger): Logger passed to the rule.
+
+    Returns:
+        callable: A function that takes a string and returns the rule's result.
+    """
+    code = func.__code__
+    arg_names = code.co_varnames[: code.co_argcount]
+    if "logger" in arg_names:
+        # The arguments before the logger, and the optional ones after the string
+        position = arg_names.index("logger")
+        leading = arg_names[:position]
+        trailing = arg_names[position + 2 :]
+        if (
+            arg_names[position : position + 2] == ("logger", "string")
+            and set(leading) <= params.keys()
+            and params.keys() <= set(leading) | set(trailing)
+        ):
+            args = tuple(params[name] for name in leading)
+            given = [name for name in trailing if name in params]
+            if not given:
+                return lambda x: func(*args, logger, x)
+
+            # Pass the optional arguments up to the last one given positionally
+            # too, with the defaults of the ones in between
+            defaults = dict(
+                zip(reversed(arg_names), reversed(func.__defaults__ or ()))
+            )
+            optional = trailing[: trailing.index(given[-1]) + 1]
+            if all(name in params or name in defaults for name in optional):
+                extra = tuple(params.get(name, defaults.get(name)) for name in optional)
+                return lambda x: func(*args, logger, x, *extra)
+
+    return lambda x: func(**params, logger=logger, string=x)
+
 
 def build_rule(
     condition: str, params: dict, logger: logging.Logger
@@ -49,18 +313,51 @@ def build_rule(
 
     if normalized_condition in known_rules:
         func = known_rules[normalized_condition]
-        rule_params = params
+
+        # The params may be shared with the parsed config, work on a copy
+        rule_params = dict(params)
+        compiled_param = COMPILED_PARAMS.get(normalized_condition)
+        engine = rule_params.pop("engine", "re") if compiled_param else "re"
+        if engine not in PATTERN_ENGINES:
+            raise ValueError(f"Unknown engine '{engine}' for rule {condition}.")
+        if engine == "re2" and re2 is None:
+            logger.warning(
+                "google-re2 isn't installed, rule %s uses the re module.", condition
+            )
+        if compiled_param and isinstance(rule_params.get(compiled_param), str):
+            bytes_pattern = compile_bytes_pattern(
+                rule_params[compiled_param], engine
+            )
+            rule_params[compiled_param] = compile_pattern(
+                rule_params[compiled_param], engine
+            )
+            if bytes_pattern is not None:
+                rule_params["bytes_pattern"] = bytes_pattern
+        # Only pattern rules take an anchor, 'anchor' may be a key of other rules
+        if (
+            compiled_param
+            and rule_params.get("anchor", "match") not in rules.PATTERN_ANCHORS
+        ):
+            raise ValueError(
+                f"Unknown anchor '{rule_params['anchor']}' for rule {condition}."
+            )
+        if normalized_condition in COMPILED_RULES:
+            compile_params, func = COMPILED_RULES[normalized_condition]
+            rule_params = {"conditions": compile_params(rule_params)}
 
         # TODO: Should the test l
-        method = lambda x: func(
-            **rule_params, logger=logging_helper.get_logger(), string=x
-        )
+        if func in CONSTANT_RULES and rule_params.keys() == {"msg"}:
+            result = CONSTANT_RULES[func]
+            method = lambda x: result
+            method.constant_result = result
+        else:
+            method = bind_rule(func, rule_params, logging_helper.get_logger())
         method.rule_params = rule_params
 
         if normalized_condition == "code":
             method.friendly_str = f"{condition.lower()}: code block"
         else:
-            method.friendly_str = f"{condition.lower()}: {', '.join(f'{k}={v}' for k, v in rule_params.items())}"
+            method.friendly_str = f"{condition.lower()}: {', '.join(f'{k}={v}' for k, v in params.items())}"
 
         return method
 
@@ -77,12 +374,52 @@ def build_rule(
 
         logger.debug("Control methods: %s", methods)
 
+        # The friendly string still lists all the rules
+        all_methods = methods
+        methods = prune_constant_rules(func, methods)
+
+        combined = combine_patterns(methods) if func is rules.any_pass else None
+        bounds = combine_ranges(methods)
+
         # TODO: Should the test logger be used here?
-        method = lambda x: func(
-            methods=methods, logger=logging_helper.get_logger(), string=x
-        )
+        if combined is not None:
+            logger.debug("Combined patterns: %s", combined.pattern)
+            combined_params = {"reg_pattern": combined}
+            bytes_pattern = compile_bytes_pattern(
+                combined.pattern, pattern_engine(combined)
+            )
+            if bytes_pattern is not None:
+                combined_params["bytes_pattern"] = bytes_pattern
+            method = bind_rule(
+                rules.pattern, combined_params, logging_helper.get_logger()
+            )
+        elif bounds is not None and func is rules.all_pass:
+            method = bind_rule(
+                rules.all_within_ranges,
+                {"bounds": bounds, "methods": methods},
+                logging_helper.get_logger(),
+            )
+        elif bounds is not None and func is rules.any_pass:
+            method = bind_rule(
+                rules.any_within_ranges,
+                {"bounds": bounds},
+                logging_helper.get_logger(),
+            )
+        else:
+            method = bind_rule(
+                func, {"methods": methods}, logging_helper.get_logger()
+            )
         method.rule_params = {"methods": methods}
-        method.friendly_str = f"{condition.lower()}: {', '.join(m.friendly_str for m in methods)}"
+        method.friendly_str = f"{condition.lower()}: {', '.join(m.friendly_str for m in all_methods)}"
+
+        if not methods:
+            # Nothing left to evaluate, all_pass passes and any_pass fails
+            method.constant_result = func is rules.all_pass
+        elif func is rules.any_pass and len(methods) == 1:
+            # A single rule that always passes, or fails, decides the result
+            result = getattr(methods[0], "constant_result", None)
+            if result is not None:
+                method.constant_result = result
 
         return method
 
@@ -98,19 +435,16 @@ def generate_rules_map(state: dict, logger: logging.Logger) -> dict:
 
     rules_map = {}
     for trigger in state.get("verify", {}).get("triggers", []):
-        trigger_name = list(trigger.keys())[0]
+        trigger_name = next(iter(trigger))
 
         try:
-            for condition in list(trigger.get(trigger_name, {})):
+            conditions = trigger.get(trigger_name, {})
+            for condition in conditions:
                 logger.debug("Condition: %s", condition)
                 if trigger_name not in rules_map:
                     rules_map[trigger_name] = []
                 rules_map[trigger_name].append(
-                    build_rule(
-                        condition,
-                        trigger.get(trigger_name, {}).get(condition, {}),
-                        logger,
-                    )
+                    build_rule(condition, conditions.get(condition, {}), logger)
                 )
                 logger.debug(
                     "Added rule for trigger %s: %s", trigger_name, condition
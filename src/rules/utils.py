@@ -21,6 +21,35 @@ import base64
 import json
 import logging
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _json_loads(raw_data: str):
+    """
+    Parse a JSON document, with orjson when it is installed.
+
+    orjson rejects some documents the json module accepts, such as NaN and
+    Infinity, so those are parsed again with the json module.
+
+    Args:
+        raw_data (str): The JSON document.
+
+    Returns:
+        The parsed JSON value.
+
+    Raises:
+        ValueError: If the document is not valid JSON.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(raw_data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(raw_data)
+
 
 def safe_json_load(logger: logging.Logger, raw_data: bytes | str) -> dict:
     """
@@ -38,9 +67,19 @@ def safe_json_load(logger: logging.Logger, raw_data: bytes | str) -> dict:
         if isinstance(raw_data, bytes):
             raw_data = raw_data.decode("latin1")  # preserves raw bytes
 
-        data = json.loads(raw_data)
+        data = _json_loads(raw_data)
+
+        # Most messages have no octets fields, skip walking the tree for them.
+        # Escapes could spell out "octets" (e.g. "\u006fctets"), so only
+        # documents without any are skipped.
+        if "octets" not in raw_data and "\\" not in raw_data:
+            return data
 
-        def encode_octets(obj) -> None:
+        # Walk the tree with an explicit stack, deeply nested objects can't hit
+        # the recursion limit
+        stack = [data]
+        while stack:
+            obj = stack.pop()
             if isinstance(obj, dict):
                 if obj.get("type") == "octets" and "value" in obj:
                     value = obj["value"]
@@ -59,13 +98,10 @@ def safe_json_load(logger: logging.Logger, raw_data: bytes | str) -> dict:
                         "ascii"
                     )
                 else:
-                    for v in obj.values():
-                        encode_octets(v)
+                    stack.extend(obj.values())
             elif isinstance(obj, list):
-                for item in obj:
-                    encode_octets(item)
+                stack.extend(obj)
 
-        encode_octets(data)
         return data
 
     except Exception as e:
@@ -0,0 +1,66 @@
+"""Copyright (C) 2026 Network RADIUS SAS (legal@networkradius.com)
+
+This software may not be redistributed in any form without the prior
+written consent of Network RADIUS.
+
+THIS SOFTWARE IS PROVIDED BY THE AUTHOR AND CONTRIBUTORS ``AS IS'' AND
+ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+ARE DISCLAIMED.  IN NO EVENT SHALL THE AUTHOR OR CONTRIBUTORS BE LIABLE
+FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS
+OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)
+HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY
+OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF
+SUCH DAMAGE."""
+
+"""runtime.py
+Event loop setup for the multi-server tests.
+Uses uvloop when it is installed, which replaces the pure-Python selector loop
+(and its stream and UNIX server implementations) with libuv. Falls back to the
+standard asyncio loop otherwise.
+On Python 3.12+ tasks are started eagerly, so a task runs up to its first
+suspension point as soon as it is created, without a trip through the loop.
+"""
+
+import asyncio
+import sys
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+
+def uvloop_available() -> bool:
+    """
+    Check whether uvloop can be used for the event loop.
+
+    Returns:
+        bool: True if uvloop is installed and supported on this platform, False otherwise.
+    """
+    return uvloop is not None and sys.platform != "win32"
+
+
+def new_event_loop() -> asyncio.AbstractEventLoop:
+    """
+    Create a new event loop, using uvloop when it is available.
+
+    Tasks created on the loop start eagerly when the Python version supports it.
+    Code creating a task must not rely on the task not having started yet.
+
+    Returns:
+        asyncio.AbstractEventLoop: The new event loop.
+    """
+    if uvloop_available():
+        loop = uvloop.new_event_loop()
+    else:
+        loop = asyncio.new_event_loop()
+
+    # Added in Python 3.12
+    eager_task_factory = getattr(asyncio, "eager_task_factory", None)
+    if eager_task_factory is not None:
+        loop.set_task_factory(eager_task_factory)
+
+    return loop
@@ -19,6 +19,7 @@ SUCH DAMAGE."""
 
 import asyncio
 from collections.abc import Callable
+import inspect
 import logging
 
 from src import logging_helper
@@ -85,11 +86,7 @@ class State:
         """
         Enter the state and execute all actions.
         """
-        try:
-            loop = asyncio.get_event_loop()
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
+        loop = asyncio.get_running_loop()
 
         # Set up the timeout to mark the state as completed after the specified duration
         def on_timeout() -> None:
@@ -104,7 +101,11 @@ class State:
         for action in self.actions:
             self.logger.debug("Executing action: %s", action.__name__)
 
-            await loop.run_in_executor(None, action, self.logger)
+            result = await loop.run_in_executor(None, action, self.logger)
+
+            # Async events hand back a coroutine to run on the event loop
+            if inspect.isawaitable(result):
+                await result
 
     async def wait_for_completion(self) -> None:
         """
@@ -32,6 +32,42 @@ from src.rules.rules_tools import (
 )
 from src.states.state import State
 
+# Use the libyaml bindings when PyYAML was built with them
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
+# Parsed test configuration files, keyed by path. Each entry holds the file's
+# (mtime_ns, size) when it was parsed along with the parsed configuration.
+_RAW_CONFIGS: dict[Path, tuple[tuple[int, int], dict]] = {}
+
+# The parameter names of each action function, see action_parameters.
+_ACTION_PARAMETERS: dict[callable, frozenset[str]] = {}
+
+
+def action_parameters(func: callable) -> frozenset[str]:
+    """
+    Get the names of the parameters an action function takes.
+
+    Only the function's arguments are included, unlike its code's co_varnames
+    which also lists its local variables. The result is cached per function.
+
+    Args:
+        func (callable): The action function.
+
+    Returns:
+        frozenset[str]: The names of the function's parameters.
+    """
+    parameters = _ACTION_PARAMETERS.get(func)
+    if parameters is None:
+        code = func.__code__
+        parameters = frozenset(
+            code.co_varnames[: code.co_argcount + code.co_kwonlyargcount]
+        )
+        _ACTION_PARAMETERS[func] = parameters
+    return parameters
+
 
 def generate_states(
     loop: asyncio.AbstractEventLoop,
@@ -55,18 +91,72 @@ def generate_states(
         timeout (float): Timeout for the test.
         states (list[State]): List of State objects created from the configuration.
 
+    Raises:
+        ValueError: If the configuration file is invalid.
+    """
+    return create_states(
+        loop, load_states(config, test_name), test_name, test_logger, seed=seed
+    )
+
+
+def load_states(
+    config: Path | dict, test_name: str
+) -> tuple[float, str, list[dict]]:
+    """
+    Parse the states of a test configuration.
+
+    Nothing here touches the event loop, so it's safe to call from a worker
+    thread. Pass the result to create_states on the event loop's thread.
+
+    Args:
+        config (Path | dict): Path to the configuration file or a dictionary
+          containing the config.
+        test_name (str): Name of the test.
+
+    Returns:
+        tuple[float, str, list[dict]]: The test's timeout, state order and state
+            configurations, see parse_test_configs.
+
     Raises:
         ValueError: If the configuration file is invalid.
     """
     try:
         # TODO: Should the test logger be used here?
-        timeout, state_order, state_configs = parse_test_configs(
+        return parse_test_configs(
             config, test_name, logger=logging_helper.get_logger()
         )
     except ValueError as e:
         # TODO: Log the error to the correct logger
         raise ValueError(f"Invalid configuration file: {e}") from e
 
+
+def create_states(
+    loop: asyncio.AbstractEventLoop,
+    test_config: tuple[float, str, list[dict]],
+    test_name: str,
+    test_logger: logging.Logger,
+    seed: int | None = None,
+) -> tuple[float, list[State]]:
+    """
+    Create the states of a parsed test configuration.
+
+    Each state creates a future on the event loop, so this must be called from
+    the event loop's thread.
+
+    Args:
+        loop (asyncio.AbstractEventLoop): The event loop to use.
+        test_config (tuple[float, str, list[dict]]): The parsed configuration,
+          as returned by load_states.
+        test_name (str): Name of the test.
+        test_logger (logging.Logger): Logger for the test.
+        seed (int | None): Seed for randomizing test states.
+
+    Returns:
+        timeout (float): Timeout for the test.
+        states (list[State]): List of State objects created from the configuration.
+    """
+    timeout, state_order, state_configs = test_config
+
     states = []
     for state_config in state_configs:
         states.append(
@@ -94,12 +184,40 @@ def generate_states(
             "Shuffling test %s states with seed: %d", test_name, seed
         )
 
-        random.seed(seed)
-        random.shuffle(states)
+        # Use a local generator, states may be generated for several tests at once
+        random.Random(seed).shuffle(states)
 
     return timeout, states
 
 
+def load_test_config(config: Path) -> dict:
+    """
+    Load a test configuration file.
+
+    The same file is parsed again for every compose file it's run against, so
+    the parsed configuration is kept and reused until the file changes. The
+    result is shared and must not be modified.
+
+    Args:
+        config (Path): Path to the configuration file.
+
+    Returns:
+        dict: The parsed configuration.
+    """
+    stat = config.stat()
+    key = (stat.st_mtime_ns, stat.st_size)
+
+    cached = _RAW_CONFIGS.get(config)
+    if cached and cached[0] == key:
+        return cached[1]
+
+    with open(config, "r", encoding="utf-8") as f:
+        raw_configs = yaml.load(f, Loader=YamlLoader)
+
+    _RAW_CONFIGS[config] = (key, raw_configs)
+    return raw_configs
+
+
 def parse_test_configs(
     config: Path | dict, test_name: str, logger: logging.Logger
 ) -> tuple[float, str, list[dict]]:
@@ -137,8 +255,7 @@ def parse_test_configs(
     raw_configs = {}
 
     if isinstance(config, Path):
-        with open(config, "r", encoding="utf-8") as f:
-            raw_configs = yaml.safe_load(f)
+        raw_configs = load_test_config(config)
     else:
         raw_configs = config
 
@@ -165,12 +282,16 @@ def parse_test_configs(
 
                 # Build the action with its parameters
                 def build_action(func, params, host):
+                    # The raw config may be shared, work on a copy of the params
+                    params = dict(params)
+                    func_params = action_parameters(func)
+
                     # if the function takes a source parameter, add it
-                    if "source" in func.__code__.co_varnames:
+                    if "source" in func_params:
                         params["source"] = f"{test_name}-{host}-1"
 
                     # if the function takes a target parameter, update it
-                    if "target" in func.__code__.co_varnames:
+                    if "target" in func_params:
                         if "target" not in params:
                             raise ValueError(
                                 f"Action {action_name} requires a target parameter."
@@ -179,11 +300,11 @@ def parse_test_configs(
                         params["target"] = f"{test_name}-{params['target']}-1"
 
                     # if the function takes a test_name parameter, add it
-                    if "test_name" in func.__code__.co_varnames:
+                    if "test_name" in func_params:
                         params["test_name"] = test_name
 
                     # If the function takes a logger parameter, set a default logger
-                    if "logger" in func.__code__.co_varnames:
+                    if "logger" in func_params:
                         # TODO: Probably want to use the test logger here
                         return lambda logger=logging_helper.get_logger(): func(
                             **params, logger=logger
@@ -0,0 +1,66 @@
+"""Copyright (C) 2026 Network RADIUS SAS (legal@networkradius.com)
+
+This software may not be redistributed in any form without the prior
+written consent of Network RADIUS.
+
+THIS SOFTWARE IS PROVIDED BY THE AUTHOR AND CONTRIBUTORS ``AS IS'' AND
+ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+ARE DISCLAIMED.  IN NO EVENT SHALL THE AUTHOR OR CONTRIBUTORS BE LIABLE
+FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS
+OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)
+HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY
+OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF
+SUCH DAMAGE."""
+"""
+Tests for compiling code blocks.
+"""
+
+import logging
+import unittest
+
+from src.code_blocks import compile_block
+from src.events import CodeEvents
+from src.rules import rules
+
+logger = logging.getLogger("unit_tests")
+
+
+class CompileBlockTests(unittest.TestCase):
+    def test_arguments(self):
+        func = compile_block("return first - second", ("first", "second"), "<test>")
+
+        self.assertEqual(func(5, 3), 2)
+        self.assertEqual(func(second=5, first=3), -2)
+
+    def test_empty_block(self):
+        self.assertIsNone(compile_block("# Nothing", ("x",), "<test>")(1))
+
+    def test_syntax_error_filename(self):
+        with self.assertRaises(SyntaxError) as cm:
+            compile_block("return (", ("x",), "<test>")
+
+        self.assertEqual(cm.exception.filename, "<test>")
+
+    def test_code_filename(self):
+        func = compile_block("return x", ("x",), "<test>")
+
+        self.assertEqual(func.__code__.co_filename, "<test>")
+
+    def test_rules_and_events_cached_separately(self):
+        block = "return logger"
+
+        rule = rules._compile_block(block)
+        code_event = CodeEvents._compile_block(block)
+
+        self.assertIsNot(rule, code_event)
+        self.assertIs(rule(string="x", logger=logger), logger)
+        self.assertIs(code_event(source="x", logger=logger), logger)
+        self.assertIs(rules._compile_block(block), rule)
+        self.assertIs(CodeEvents._compile_block(block), code_event)
+
+
+if __name__ == "__main__":
+    unittest.main()
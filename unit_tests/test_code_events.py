@@ -0,0 +1,66 @@
+"""Copyright (C) 2026 Network RADIUS SAS (legal@networkradius.com)
+
+This software may not be redistributed in any form without the prior
+written consent of Network RADIUS.
+
+THIS SOFTWARE IS PROVIDED BY THE AUTHOR AND CONTRIBUTORS ``AS IS'' AND
+ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+ARE DISCLAIMED.  IN NO EVENT SHALL THE AUTHOR OR CONTRIBUTORS BE LIABLE
+FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS
+OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)
+HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY
+OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF
+SUCH DAMAGE."""
+"""
+Tests for the code events.
+"""
+
+import logging
+import unittest
+
+from src.events import CodeEvents
+
+logger = logging.getLogger("unit_tests")
+
+
+class CodeEventTests(unittest.TestCase):
+    def test_compiles_once(self):
+        block = "logger.info('compiled once for %s', source)"
+
+        func = CodeEvents._compile_block(block)
+
+        self.assertIs(CodeEvents._compile_block(block), func)
+
+    def test_runs_block(self):
+        with self.assertLogs(logger, logging.INFO) as cm:
+            CodeEvents.code("logger.info('ran in %s', source)", "client-1", logger)
+
+        self.assertIn("ran in client-1", cm.output[0])
+
+    def test_return_ends_block(self):
+        with self.assertLogs(logger, logging.INFO) as cm:
+            CodeEvents.code(
+                "logger.info('first')\nreturn\nlogger.info('second')",
+                "client-1",
+                logger,
+            )
+
+        self.assertEqual([r.getMessage() for r in cm.records], ["first"])
+
+    def test_empty_block(self):
+        self.assertIsNone(CodeEvents._compile_block("# Nothing to do")("x", logger))
+
+    def test_errors_logged(self):
+        for block in ("return (", "raise ValueError('bad')"):
+            with self.subTest(block), self.assertLogs(logger, logging.ERROR):
+                CodeEvents.code(block, "client-1", logger)
+
+    def test_registered(self):
+        self.assertIs(CodeEvents.get_events()["code"], CodeEvents.code)
+
+
+if __name__ == "__main__":
+    unittest.main()
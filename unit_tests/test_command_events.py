@@ -0,0 +1,72 @@
+"""Copyright (C) 2026 Network RADIUS SAS (legal@networkradius.com)
+
+This software may not be redistributed in any form without the prior
+written consent of Network RADIUS.
+
+THIS SOFTWARE IS PROVIDED BY THE AUTHOR AND CONTRIBUTORS ``AS IS'' AND
+ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+ARE DISCLAIMED.  IN NO EVENT SHALL THE AUTHOR OR CONTRIBUTORS BE LIABLE
+FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS
+OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)
+HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY
+OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF
+SUCH DAMAGE."""
+"""
+Tests for the command events.
+"""
+
+import logging
+import unittest
+from unittest import mock
+
+from src.events import CommandEvents
+
+logger = logging.getLogger("unit_tests")
+
+
+class RunCommandTests(unittest.TestCase):
+    def setUp(self):
+        patches = (
+            mock.patch.object(CommandEvents, "get_shell"),
+            mock.patch.object(CommandEvents, "exec_in"),
+        )
+        self.get_shell, self.exec_in = (patch.start() for patch in patches)
+        for patch in patches:
+            self.addCleanup(patch.stop)
+
+    def run_command(self, command: str, detach: bool = False) -> None:
+        CommandEvents.run_command(
+            "test-client-1", command, logger, "test", detach=detach
+        )
+
+    def test_expands_container_names(self):
+        self.run_command("ping -c1 ${freeradius} && ping ${radius-client_2}")
+
+        self.get_shell.assert_called_once_with("test-client-1")
+        self.get_shell.return_value.run.assert_called_once_with(
+            "ping -c1 test-freeradius-1 && ping test-radius-client_2-1"
+        )
+
+    def test_leaves_other_variables(self):
+        self.run_command("echo $HOME ${not valid} ${} $freeradius")
+
+        self.get_shell.return_value.run.assert_called_once_with(
+            "echo $HOME ${not valid} ${} $freeradius"
+        )
+
+    def test_detached(self):
+        self.run_command("sleep 10 && ping ${freeradius}", detach=True)
+
+        self.exec_in.assert_called_once_with(
+            "test-client-1",
+            ["bash", "-c", "sleep 10 && ping test-freeradius-1"],
+            detach=True,
+        )
+        self.get_shell.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
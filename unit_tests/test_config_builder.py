@@ -0,0 +1,286 @@
+"""Copyright (C) 2026 Network RADIUS SAS (legal@networkradius.com)
+
+This software may not be redistributed in any form without the prior
+written consent of Network RADIUS.
+
+THIS SOFTWARE IS PROVIDED BY THE AUTHOR AND CONTRIBUTORS ``AS IS'' AND
+ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+ARE DISCLAIMED.  IN NO EVENT SHALL THE AUTHOR OR CONTRIBUTORS BE LIABLE
+FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS
+OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)
+HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY
+OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF
+SUCH DAMAGE."""
+"""
+Tests for the configuration builder.
+"""
+
+import copy
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import yaml
+
+from src import config_builder
+
+
+class ParseArgsTests(unittest.TestCase):
+    def test_single_config_file(self):
+        args = config_builder.parse_args(["example.yml.j2"])
+
+        self.assertEqual(args.config_file, "example.yml.j2")
+        self.assertEqual(args.parallel_render, [])
+
+    def test_extra_positional_rejected(self):
+        with mock.patch("sys.stderr"), self.assertRaises(SystemExit):
+            config_builder.parse_args(["a.yml.j2", "b.yml.j2"])
+
+    def test_parallel_render(self):
+        args = config_builder.parse_args(
+            ["a.conf.j2", "--aux-file", "--parallel-render", "b.conf.j2", "c.conf.j2"]
+        )
+
+        self.assertEqual(args.config_file, "a.conf.j2")
+        self.assertTrue(args.auxiliary)
+        self.assertEqual(args.parallel_render, ["b.conf.j2", "c.conf.j2"])
+
+
+class RenderTemplatesTests(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+
+    def write_template(self, name: str, content: str) -> Path:
+        path = self.directory / name
+        path.write_text(content, encoding="utf-8")
+        return path
+
+    def test_renders_each_template(self):
+        variables = self.write_template("vars.yml", "name: world\n")
+        templates = [
+            self.write_template(f"t{i}.conf.j2", f"{i}: hello {{{{ name }}}}\n")
+            for i in range(3)
+        ]
+
+        config_builder.render_templates(templates, variables_path=variables)
+
+        for i, template in enumerate(templates):
+            self.assertEqual(
+                template.with_suffix("").read_text(encoding="utf-8"),
+                f"{i}: hello world",
+            )
+
+    def test_raises_first_error_in_order(self):
+        templates = [
+            self.write_template("ok.conf.j2", "ok\n"),
+            self.directory / "missing.conf.j2",
+            self.write_template("not_a_template.conf", "x\n"),
+        ]
+
+        with self.assertRaises(FileNotFoundError):
+            config_builder.render_templates(templates)
+
+    def test_variables_next_to_template(self):
+        self.write_template("template_vars.yml", "name: template\n")
+        template = self.write_template("t.conf.j2", "{{ name }}")
+
+        config_builder.render_template_only(
+            template, variables_path=Path("template_vars.yml")
+        )
+
+        self.assertEqual(
+            template.with_suffix("").read_text(encoding="utf-8"), "template"
+        )
+
+    def test_variables_in_include_path(self):
+        include = self.directory / "include"
+        include.mkdir()
+        (include / "include_vars.yml").write_text("name: include\n", encoding="utf-8")
+        template = self.write_template("t.conf.j2", "{{ name }}")
+
+        config_builder.render_template_only(
+            template,
+            variables_path=Path("include_vars.yml"),
+            include_path=[str(self.directory / "missing"), str(include)],
+        )
+
+        self.assertEqual(
+            template.with_suffix("").read_text(encoding="utf-8"), "include"
+        )
+
+    def test_variables_prefer_given_path(self):
+        given = self.write_template("given_vars.yml", "name: given\n")
+        include = self.directory / "include"
+        include.mkdir()
+        (include / "given_vars.yml").write_text("name: include\n", encoding="utf-8")
+        template = self.write_template("t.conf.j2", "{{ name }}")
+
+        config_builder.render_template_only(
+            template, variables_path=given, include_path=[str(include)]
+        )
+
+        self.assertEqual(
+            template.with_suffix("").read_text(encoding="utf-8"), "given"
+        )
+
+    def test_missing_variables(self):
+        template = self.write_template("t.conf.j2", "{{ name }}")
+
+        with self.assertRaises(FileNotFoundError):
+            config_builder.render_template_only(
+                template,
+                variables_path=Path("missing_vars.yml"),
+                include_path=[str(self.directory)],
+            )
+
+    def test_parallel_render_requires_aux_file(self):
+        argv = ["multi-server-test-config", "a.yml.j2", "--parallel-render", "b.j2"]
+        with (
+            mock.patch("sys.argv", argv),
+            mock.patch("sys.stderr"),
+            self.assertRaises(SystemExit) as raised,
+        ):
+            config_builder.interface()
+
+        self.assertEqual(raised.exception.code, 1)
+
+    def test_interface_parallel_render(self):
+        first = self.write_template("a.conf.j2", "a\n")
+        second = self.write_template("b.conf.j2", "b\n")
+        argv = [
+            "multi-server-test-config",
+            str(first),
+            "--aux-file",
+            "--parallel-render",
+            str(second),
+        ]
+        with (
+            mock.patch("sys.argv", argv),
+            mock.patch("sys.stdout"),
+            self.assertRaises(SystemExit) as raised,
+        ):
+            config_builder.interface()
+
+        self.assertEqual(raised.exception.code, 0)
+        self.assertEqual(first.with_suffix("").read_text(encoding="utf-8"), "a")
+        self.assertEqual(second.with_suffix("").read_text(encoding="utf-8"), "b")
+
+
+class DumperTests(unittest.TestCase):
+    def dump(self, data) -> str:
+        return yaml.dump(
+            data, sort_keys=False, Dumper=config_builder.NoQuotedMergeDumper
+        )
+
+    def test_merge_key_unquoted(self):
+        self.assertEqual(self.dump({"<<": {"a": 1}}), "<<:\n  a: 1\n")
+
+    def test_multi_line_strings_block_style(self):
+        output = self.dump({"script": "echo one\necho two\n", "name": "one line"})
+
+        self.assertEqual(
+            output, "script: |\n  echo one\n  echo two\nname: one line\n"
+        )
+        self.assertEqual(
+            yaml.safe_load(output),
+            {"script": "echo one\necho two\n", "name": "one line"},
+        )
+
+    def test_other_scalars(self):
+        data = {"number": 1, "flag": True, "text": "1", "empty": ""}
+
+        self.assertEqual(yaml.safe_load(self.dump(data)), data)
+
+
+class ParseConfigTests(unittest.TestCase):
+    CONFIG = {
+        "fixtures": {
+            "services": {"freeradius": {"image": "fr"}, "client": {"image": "c"}},
+        },
+        "states": {"state_1": {}},
+        "timeout": 10,
+    }
+
+    def test_splits_config(self):
+        compose_configs, other_configs = config_builder._parse_config(self.CONFIG)
+
+        capabilities = {"cap_add": ["NET_ADMIN", "SYS_PTRACE"]}
+        self.assertEqual(
+            compose_configs,
+            {
+                "x-common-config": capabilities,
+                "services": {
+                    "freeradius": {"image": "fr", "<<": capabilities},
+                    "client": {"image": "c", "<<": capabilities},
+                },
+            },
+        )
+        self.assertEqual(other_configs, {"states": {"state_1": {}}, "timeout": 10})
+
+    def test_hosts_prefix(self):
+        config = {"fixtures": {"hosts": {"a": {"image": "a"}}}}
+
+        compose_configs, _ = config_builder._parse_config(config)
+
+        self.assertIn("<<", compose_configs["services"]["a"])
+
+    def test_other_fixtures_not_merged(self):
+        config = {"fixtures": {"networks": {"a": {"driver": "bridge"}}}}
+
+        compose_configs, _ = config_builder._parse_config(config)
+
+        self.assertEqual(compose_configs["services"], {"a": {"driver": "bridge"}})
+
+    def test_config_not_modified(self):
+        config = copy.deepcopy(self.CONFIG)
+
+        config_builder._parse_config(config)
+
+        self.assertEqual(config, self.CONFIG)
+
+
+class WriteYamlToFileTests(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.output = Path(directory.name, "docker-compose.yml")
+
+    def test_writes_new_file(self):
+        config_builder.write_yaml_to_file({"a": "b"}, self.output)
+
+        self.assertEqual(self.output.read_text(encoding="utf-8"), "a: b\n")
+
+    def test_unchanged_file_not_rewritten(self):
+        config_builder.write_yaml_to_file({"a": "b"}, self.output)
+        os.utime(self.output, ns=(0, 0))
+
+        config_builder.write_yaml_to_file({"a": "b"}, self.output)
+
+        self.assertEqual(self.output.stat().st_mtime_ns, 0)
+
+    def test_changed_file_rewritten(self):
+        config_builder.write_yaml_to_file({"a": "b"}, self.output)
+        os.utime(self.output, ns=(0, 0))
+
+        config_builder.write_yaml_to_file({"a": "c"}, self.output)
+
+        self.assertEqual(self.output.read_text(encoding="utf-8"), "a: c\n")
+        self.assertNotEqual(self.output.stat().st_mtime_ns, 0)
+
+    def test_undecodable_file_rewritten(self):
+        self.output.write_bytes(b"\xff")
+
+        config_builder.write_yaml_to_file({"a": "b"}, self.output)
+
+        self.assertEqual(self.output.read_text(encoding="utf-8"), "a: b\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,272 @@
+"""Copyright (C) 2026 Network RADIUS SAS (legal@networkradius.com)
+
+This software may not be redistributed in any form without the prior
+written consent of Network RADIUS.
+
+THIS SOFTWARE IS PROVIDED BY THE AUTHOR AND CONTRIBUTORS ``AS IS'' AND
+ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+ARE DISCLAIMED.  IN NO EVENT SHALL THE AUTHOR OR CONTRIBUTORS BE LIABLE
+FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS
+OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)
+HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY
+OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF
+SUCH DAMAGE."""
+"""
+Tests for the Docker Engine API client used by the events.
+"""
+
+import json
+import os
+import unittest
+from unittest import mock
+
+from python_on_whales.client_config import ClientConfig
+from python_on_whales.components.context.models import ContextEndpoint
+from python_on_whales.exceptions import DockerException
+
+from src.events import _docker_client
+
+
+def frame(stream_type: int, payload: bytes) -> bytes:
+    """Build a frame of a multiplexed exec stream."""
+    return bytes([stream_type, 0, 0, 0]) + len(payload).to_bytes(4, "big") + payload
+
+
+class DemuxTests(unittest.TestCase):
+    def test_splits_interleaved_streams(self):
+        data = frame(1, b"out1 ") + frame(2, b"err1 ") + frame(1, b"out2") + frame(2, b"err2")
+
+        self.assertEqual(_docker_client._demux(data), (b"out1 out2", b"err1 err2"))
+
+    def test_ignores_other_streams(self):
+        data = frame(0, b"stdin") + frame(1, b"out")
+
+        self.assertEqual(_docker_client._demux(data), (b"out", b""))
+
+    def test_ignores_truncated_header(self):
+        data = frame(1, b"out") + b"\x02\x00\x00"
+
+        self.assertEqual(_docker_client._demux(data), (b"out", b""))
+
+    def test_empty_stream(self):
+        self.assertEqual(_docker_client._demux(b""), (b"", b""))
+
+
+class SocketPathTests(unittest.TestCase):
+    def setUp(self):
+        _docker_client._socket_path.cache_clear()
+        self.addCleanup(_docker_client._socket_path.cache_clear)
+
+        environ = {
+            k: v
+            for k, v in os.environ.items()
+            if k not in ("DOCKER_HOST", "DOCKER_TLS_VERIFY")
+        }
+        patcher = mock.patch.dict(os.environ, environ, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.inspect = mock.Mock()
+        patcher = mock.patch.object(_docker_client.docker.context, "inspect", self.inspect)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def set_config(self, **kwargs):
+        patcher = mock.patch.object(
+            _docker_client.docker, "client_config", ClientConfig(**kwargs)
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def set_context_host(self, host):
+        self.inspect.return_value.endpoints = {"docker": ContextEndpoint(host=host)}
+
+    def test_client_host(self):
+        self.set_config(host="unix:///run/client.sock")
+        os.environ["DOCKER_HOST"] = "unix:///run/env.sock"
+
+        self.assertEqual(_docker_client._socket_path(), "/run/client.sock")
+        self.inspect.assert_not_called()
+
+    def test_docker_host(self):
+        self.set_config()
+        os.environ["DOCKER_HOST"] = "unix:///run/env.sock"
+
+        self.assertEqual(_docker_client._socket_path(), "/run/env.sock")
+
+    def test_tcp_docker_host(self):
+        self.set_config()
+        os.environ["DOCKER_HOST"] = "tcp://10.0.0.1:2375"
+
+        self.assertIsNone(_docker_client._socket_path())
+
+    def test_current_context(self):
+        self.set_config()
+        self.set_context_host("unix:///run/context.sock")
+
+        self.assertEqual(_docker_client._socket_path(), "/run/context.sock")
+        self.inspect.assert_called_once_with(None)
+
+    def test_remote_context(self):
+        self.set_config()
+        self.set_context_host("ssh://user@remote")
+
+        self.assertIsNone(_docker_client._socket_path())
+
+    def test_client_context_overrides_docker_host(self):
+        self.set_config(context="other")
+        self.set_context_host("unix:///run/other.sock")
+        os.environ["DOCKER_HOST"] = "unix:///run/env.sock"
+
+        self.assertEqual(_docker_client._socket_path(), "/run/other.sock")
+        self.inspect.assert_called_once_with("other")
+
+    def test_tls(self):
+        self.set_config(tls=True, host="unix:///run/client.sock")
+
+        self.assertIsNone(_docker_client._socket_path())
+
+    def test_tls_verify_env(self):
+        self.set_config()
+        os.environ["DOCKER_TLS_VERIFY"] = "1"
+        self.set_context_host("unix:///run/context.sock")
+
+        self.assertIsNone(_docker_client._socket_path())
+
+    def test_inspect_fails(self):
+        self.set_config()
+        self.inspect.side_effect = DockerException(["docker"], 1)
+
+        self.assertIsNone(_docker_client._socket_path())
+
+
+class ExecInTests(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(_docker_client, "_connection", return_value=object())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.responses = []
+        self.requests = []
+        patcher = mock.patch.object(_docker_client, "_request", self.fake_request)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        patcher = mock.patch.object(_docker_client, "EXIT_CODE_POLL_INTERVAL", 0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def fake_request(self, conn, method, path, body=None):
+        self.requests.append((method, path))
+        return self.responses.pop(0)
+
+    def respond(self, *responses):
+        self.responses.extend(
+            (status, body if isinstance(body, bytes) else json.dumps(body).encode())
+            for status, body in responses
+        )
+
+    def test_returns_stdout(self):
+        self.respond(
+            (201, {"Id": "abc"}),
+            (200, frame(1, b"hello\n") + frame(2, b"warning")),
+            (200, {"Running": False, "ExitCode": 0}),
+        )
+
+        self.assertEqual(_docker_client.exec_in("ctr", ["echo", "hello"]), "hello")
+        self.assertEqual(
+            self.requests,
+            [
+                ("POST", "/containers/ctr/exec"),
+                ("POST", "/exec/abc/start"),
+                ("GET", "/exec/abc/json"),
+            ],
+        )
+
+    def test_detached(self):
+        self.respond((201, {"Id": "abc"}), (200, b""))
+
+        self.assertIsNone(_docker_client.exec_in("ctr", ["sleep", "1"], detach=True))
+        self.assertEqual(len(self.requests), 2)
+
+    def test_create_fails(self):
+        self.respond((404, b"no such container"))
+
+        with self.assertRaises(DockerException) as raised:
+            _docker_client.exec_in("ctr", ["true"])
+
+        self.assertEqual(raised.exception.return_code, 404)
+        self.assertEqual(raised.exception.stderr, "no such container")
+
+    def test_start_fails(self):
+        self.respond((201, {"Id": "abc"}), (409, b"container is paused"))
+
+        with self.assertRaises(DockerException) as raised:
+            _docker_client.exec_in("ctr", ["true"])
+
+        self.assertEqual(raised.exception.return_code, 409)
+
+    def test_non_zero_exit(self):
+        self.respond(
+            (201, {"Id": "abc"}),
+            (200, frame(1, b"partial") + frame(2, b"failed")),
+            (200, {"Running": False, "ExitCode": 3}),
+        )
+
+        with self.assertRaises(DockerException) as raised:
+            _docker_client.exec_in("ctr", ["false"])
+
+        self.assertEqual(raised.exception.return_code, 3)
+        self.assertEqual(raised.exception.stdout, "partial")
+        self.assertEqual(raised.exception.stderr, "failed")
+
+    def test_inspect_fails(self):
+        self.respond(
+            (201, {"Id": "abc"}),
+            (200, frame(1, b"out")),
+            (500, b"server error"),
+        )
+
+        with self.assertRaises(DockerException) as raised:
+            _docker_client.exec_in("ctr", ["true"])
+
+        self.assertEqual(raised.exception.return_code, 500)
+
+    def test_waits_for_exit_code(self):
+        self.respond(
+            (201, {"Id": "abc"}),
+            (200, frame(1, b"out")),
+            (200, {"Running": True, "ExitCode": None}),
+            (200, {"Running": False, "ExitCode": 0}),
+        )
+
+        self.assertEqual(_docker_client.exec_in("ctr", ["true"]), "out")
+
+    def test_unknown_exit_code(self):
+        self.respond((201, {"Id": "abc"}), (200, frame(1, b"out")))
+        self.respond(*[(200, {"Running": False, "ExitCode": None})] * 1000)
+
+        with (
+            mock.patch.object(_docker_client, "EXIT_CODE_TIMEOUT", 0.01),
+            self.assertRaises(DockerException) as raised,
+        ):
+            _docker_client.exec_in("ctr", ["true"])
+
+        self.assertEqual(raised.exception.return_code, -1)
+        self.assertIn("exit code of the command is unknown", raised.exception.stderr)
+
+    def test_falls_back_to_cli(self):
+        with (
+            mock.patch.object(_docker_client, "_connection", return_value=None),
+            mock.patch.object(_docker_client.docker, "execute", return_value="cli") as execute,
+        ):
+            self.assertEqual(_docker_client.exec_in("ctr", ["true"]), "cli")
+
+        execute.assert_called_once_with("ctr", ["true"], detach=False)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+"""Copyright (C) 2026 Network RADIUS SAS (legal@networkradius.com)
+
+This software may not be redistributed in any form without the prior
+written consent of Network RADIUS.
+
+THIS SOFTWARE IS PROVIDED BY THE AUTHOR AND CONTRIBUTORS ``AS IS'' AND
+ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+ARE DISCLAIMED.  IN NO EVENT SHALL THE AUTHOR OR CONTRIBUTORS BE LIABLE
+FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS
+OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)
+HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY
+OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF
+SUCH DAMAGE."""
+"""
+Tests for registering and collecting events.
+"""
+
+import unittest
+
+from src.events import event_tools
+from src.events._registry import collect_events, event
+from src.events.CommandEvents import run_command
+from src.events.NetworkEvents import disconnect
+
+
+@event("first", "alias")
+def first_event():
+    pass
+
+
+@event("second")
+def second_event():
+    pass
+
+
+def not_an_event():
+    pass
+
+
+class EventTests(unittest.TestCase):
+    def test_names(self):
+        self.assertEqual(first_event.__events__, ("first", "alias"))
+
+    def test_returns_function(self):
+        def func():
+            return 1
+
+        self.assertIs(event("name")(func), func)
+        self.assertEqual(func(), 1)
+
+    def test_stacked(self):
+        @event("outer")
+        @event("inner")
+        def func():
+            pass
+
+        self.assertEqual(func.__events__, ("inner", "outer"))
+
+
+class CollectEventsTests(unittest.TestCase):
+    def test_collects_names(self):
+        events = collect_events(
+            {
+                "first_event": first_event,
+                "second_event": second_event,
+                "not_an_event": not_an_event,
+                "value": 1,
+            }
+        )
+
+        self.assertEqual(
+            dict(events),
+            {"first": first_event, "alias": first_event, "second": second_event},
+        )
+
+    def test_read_only(self):
+        events = collect_events({"first_event": first_event})
+
+        with self.assertRaises(TypeError):
+            events["new"] = second_event
+
+
+class GetEventsTests(unittest.TestCase):
+    def test_events_from_modules(self):
+        events = event_tools.get_events()
+
+        self.assertEqual(
+            sorted(events),
+            [
+                "access_request",
+                "code",
+                "command",
+                "disconnect",
+                "execute_command",
+                "network_disconnect",
+                "network_reconnect",
+                "packet_loss",
+                "radius_request",
+                "reconnect",
+                "run_command",
+            ],
+        )
+        self.assertIs(events["execute_command"], run_command)
+        self.assertIs(events["network_disconnect"], disconnect)
+
+    def test_cached(self):
+        self.assertIs(event_tools.get_events(), event_tools.get_events())
+
+        with self.assertRaises(TypeError):
+            event_tools.get_events()["new"] = not_an_event
+
+
+if __name__ == "__main__":
+    unittest.main()
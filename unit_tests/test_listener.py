@@ -0,0 +1,348 @@
+"""Copyright (C) 2026 Network RADIUS SAS (legal@networkradius.com)
+
+This software may not be redistributed in any form without the prior
+written consent of Network RADIUS.
+
+THIS SOFTWARE IS PROVIDED BY THE AUTHOR AND CONTRIBUTORS ``AS IS'' AND
+ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+ARE DISCLAIMED.  IN NO EVENT SHALL THE AUTHOR OR CONTRIBUTORS BE LIABLE
+FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS
+OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)
+HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY
+OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF
+SUCH DAMAGE."""
+"""
+Tests for the listeners and their message queue.
+"""
+
+import asyncio
+import os
+import socket
+import stat
+import sys
+import logging
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from src import listener
+from src.listener import FastQueue, FileListener, SocketListener
+
+# How long to wait for messages to arrive through the listeners
+TIMEOUT = 5.0
+
+
+async def receive(queue: FastQueue, count: int) -> list:
+    """Wait for a number of messages from a queue."""
+    async with asyncio.timeout(TIMEOUT):
+        return [await queue.get() for _ in range(count)]
+
+
+class FastQueueTests(unittest.IsolatedAsyncioTestCase):
+    async def test_keeps_order(self):
+        queue = FastQueue()
+        queue.put_nowait(1)
+        queue.put_many([2, 3])
+        queue.put_nowait(4)
+
+        self.assertEqual(queue.qsize(), 4)
+        self.assertEqual([queue.get_nowait() for _ in range(4)], [1, 2, 3, 4])
+        self.assertTrue(queue.empty())
+
+    async def test_get_nowait_empty(self):
+        with self.assertRaises(asyncio.QueueEmpty):
+            FastQueue().get_nowait()
+
+    async def test_get_waits_for_item(self):
+        queue = FastQueue()
+        getter = asyncio.create_task(queue.get())
+        await asyncio.sleep(0)
+        self.assertFalse(getter.done())
+
+        queue.put_many([])
+        await asyncio.sleep(0)
+        self.assertFalse(getter.done())
+
+        queue.put_many(["a", "b"])
+        self.assertEqual(await getter, "a")
+        self.assertEqual(await queue.get(), "b")
+
+    async def test_get_waits_after_get_nowait_empties(self):
+        queue = FastQueue()
+        queue.put_nowait(1)
+        self.assertEqual(queue.get_nowait(), 1)
+
+        # The queue was woken for an item that has already been taken
+        getter = asyncio.create_task(queue.get())
+        await asyncio.sleep(0)
+        self.assertFalse(getter.done())
+
+        queue.put_nowait(2)
+        self.assertEqual(await getter, 2)
+
+    async def test_cancelled_get_keeps_items(self):
+        queue = FastQueue()
+        getter = asyncio.create_task(queue.get())
+        await asyncio.sleep(0)
+        getter.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await getter
+
+        queue.put_nowait(1)
+        self.assertEqual(queue.qsize(), 1)
+        self.assertEqual(await queue.get(), 1)
+
+    async def test_clear(self):
+        queue = FastQueue()
+        queue.put_many([1, 2])
+        queue.clear()
+
+        self.assertTrue(queue.empty())
+
+
+# The warning logged for an invalid message
+INVALID_WARNING = "Invalid message format: %s. Expected 'trigger_name trigger_value'."
+
+
+class InvalidWarningTests(unittest.TestCase):
+    def setUp(self):
+        self.logger = logging.getLogger("unit_tests.listener")
+        self.listener = SocketListener(
+            Path("unused.sock"), FastQueue(), mock.Mock(), self.logger
+        )
+
+    def warn(self, now: float, message: bytes) -> None:
+        with mock.patch.object(listener.time, "monotonic", return_value=now):
+            self.listener._warn_invalid(message)
+
+    def test_rate_limited(self):
+        with self.assertLogs(self.logger, logging.WARNING) as cm:
+            self.warn(100.0, b"first")
+            self.warn(100.5, b"second")
+            self.warn(100.9, b"third")
+            self.warn(101.0, b"fourth")
+            self.warn(101.5, b"fifth")
+            self.warn(103.0, b"sixth")
+
+        self.assertEqual(
+            [record.getMessage() for record in cm.records],
+            [
+                INVALID_WARNING % b"first",
+                "Suppressed warnings for 2 invalid messages.",
+                INVALID_WARNING % b"fourth",
+                "Suppressed warnings for 1 invalid messages.",
+                INVALID_WARNING % b"sixth",
+            ],
+        )
+
+    def test_truncates_message(self):
+        with self.assertLogs(self.logger, logging.WARNING) as cm:
+            self.warn(100.0, b"x" * (listener.INVALID_WARNING_LENGTH * 2))
+
+        self.assertIn(
+            repr(b"x" * listener.INVALID_WARNING_LENGTH) + ".", cm.output[0]
+        )
+
+
+class ListenerTestCase(unittest.IsolatedAsyncioTestCase):
+    listener_class = None
+    file_name = None
+
+    async def asyncSetUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+        self.dest = self.directory / self.file_name
+
+        self.queue = FastQueue()
+        ready = asyncio.get_running_loop().create_future()
+        self.listener = self.listener_class(self.dest, self.queue, ready)
+        self.task = asyncio.create_task(self.listener.start())
+        async with asyncio.timeout(TIMEOUT):
+            await ready
+
+    async def asyncTearDown(self):
+        self.task.cancel()
+        try:
+            await self.task
+        except asyncio.CancelledError:
+            pass
+        await self.listener.stop()
+
+
+class SocketListenerTests(ListenerTestCase):
+    listener_class = SocketListener
+    file_name = "listener.sock"
+
+    async def send(self, *chunks: bytes) -> None:
+        reader, writer = await asyncio.open_unix_connection(str(self.dest))
+        for chunk in chunks:
+            writer.write(chunk)
+            await writer.drain()
+            await asyncio.sleep(0.01)
+        writer.close()
+        await writer.wait_closed()
+
+    async def test_socket_is_world_writable(self):
+        mode = self.dest.stat().st_mode
+        self.assertTrue(stat.S_ISSOCK(mode))
+        self.assertEqual(stat.S_IMODE(mode), 0o777)
+
+    async def test_receives_messages(self):
+        await self.send(b"request_sent abc request sent\nrequest_complete 7\n")
+
+        self.assertEqual(
+            await receive(self.queue, 2),
+            [("request_sent", b"abc request sent"), ("request_complete", b"7")],
+        )
+
+    async def test_message_split_across_writes(self):
+        await self.send(b"request_sent par", b"tial\nrequest_backlog ", b"12\n")
+
+        self.assertEqual(
+            await receive(self.queue, 2),
+            [("request_sent", b"partial"), ("request_backlog", b"12")],
+        )
+
+    async def test_interns_trigger_names(self):
+        await self.send(b"request_sent a\nrequest_sent b\n")
+
+        (first, _), (second, _) = await receive(self.queue, 2)
+        self.assertIs(first, sys.intern("request_sent"))
+        self.assertIs(second, first)
+
+    async def test_skips_invalid_messages(self):
+        await self.send(b"invalid\nrequest_sent ok\n")
+
+        self.assertEqual(await receive(self.queue, 1), [("request_sent", b"ok")])
+        self.assertTrue(self.queue.empty())
+
+    async def test_stop_removes_socket(self):
+        await self.asyncTearDown()
+        self.task = asyncio.create_task(asyncio.sleep(0))
+
+        self.assertFalse(self.dest.exists())
+
+    async def test_replaces_stale_socket(self):
+        await self.asyncTearDown()
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(str(self.dest))
+        stale.close()
+
+        await self.asyncSetUp()
+        await self.send(b"request_sent new\n")
+
+        self.assertEqual(await receive(self.queue, 1), [("request_sent", b"new")])
+
+
+class FileListenerTests(ListenerTestCase):
+    listener_class = FileListener
+    file_name = "listener.txt"
+
+    def write(self, data: str, mode: str = "a", path: Path = None) -> None:
+        with open(path or self.dest, mode, encoding="utf-8") as file:
+            file.write(data)
+
+    async def test_reads_lines(self):
+        self.write("request_sent abc request sent\nrequest_complete 7\n")
+
+        self.assertEqual(
+            await receive(self.queue, 2),
+            [("request_sent", "abc request sent"), ("request_complete", "7")],
+        )
+
+    async def test_line_split_across_writes(self):
+        self.write("request_sent first\nrequest_backlog 1")
+        self.assertEqual(await receive(self.queue, 1), [("request_sent", "first")])
+
+        # Wait for the partial line to be read before finishing it
+        await asyncio.sleep(0.5)
+        self.assertTrue(self.queue.empty())
+
+        self.write("2\nrequest_complete done\n")
+        self.assertEqual(
+            await receive(self.queue, 2),
+            [("request_backlog", "12"), ("request_complete", "done")],
+        )
+
+    async def test_ignores_other_files(self):
+        self.write("request_sent other\n", path=self.directory / "other.txt")
+        self.write("request_sent mine\n")
+
+        self.assertEqual(await receive(self.queue, 1), [("request_sent", "mine")])
+        await asyncio.sleep(0.2)
+        self.assertTrue(self.queue.empty())
+
+    async def test_interns_trigger_names(self):
+        self.write("request_sent a\nrequest_sent b\n")
+
+        (first, _), (second, _) = await receive(self.queue, 2)
+        self.assertIs(first, sys.intern("request_sent"))
+        self.assertIs(second, first)
+
+    async def test_skips_invalid_lines(self):
+        self.write("invalid\nrequest_sent ok\n")
+
+        self.assertEqual(await receive(self.queue, 1), [("request_sent", "ok")])
+
+    async def test_truncation(self):
+        self.write("request_sent before truncation\n")
+        self.assertEqual(
+            await receive(self.queue, 1), [("request_sent", "before truncation")]
+        )
+
+        self.write("", mode="w")
+        await asyncio.sleep(0.2)
+        self.write("request_complete after\n")
+
+        self.assertEqual(await receive(self.queue, 1), [("request_complete", "after")])
+
+    async def test_delete_and_recreate(self):
+        self.write("request_sent old\n")
+        self.assertEqual(await receive(self.queue, 1), [("request_sent", "old")])
+
+        # Delete and recreate the file before the watcher reports either change,
+        # so both are in the same batch
+        self.write("request_sent last old\n")
+        self.dest.unlink()
+        self.write("request_sent new\n")
+
+        self.assertEqual(
+            await receive(self.queue, 2),
+            [("request_sent", "last old"), ("request_sent", "new")],
+        )
+
+        # The recreated file keeps being read
+        self.write("request_complete later\n")
+        self.assertEqual(await receive(self.queue, 1), [("request_complete", "later")])
+
+    async def test_delete_then_recreate_later(self):
+        self.write("request_sent old\n")
+        self.assertEqual(await receive(self.queue, 1), [("request_sent", "old")])
+
+        self.dest.unlink()
+        await asyncio.sleep(0.5)
+        self.write("request_sent new\n")
+
+        self.assertEqual(await receive(self.queue, 1), [("request_sent", "new")])
+
+    async def test_stop_backs_up_file(self):
+        self.write("request_sent abc\n")
+        await receive(self.queue, 1)
+
+        await self.asyncTearDown()
+        self.task = asyncio.create_task(asyncio.sleep(0))
+
+        self.assertFalse(self.dest.exists())
+        self.assertEqual(
+            Path(str(self.dest) + ".bak").read_text(encoding="utf-8"),
+            "request_sent abc\n",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
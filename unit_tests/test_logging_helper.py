@@ -0,0 +1,127 @@
+"""Copyright (C) 2026 Network RADIUS SAS (legal@networkradius.com)
+
+This software may not be redistributed in any form without the prior
+written consent of Network RADIUS.
+
+THIS SOFTWARE IS PROVIDED BY THE AUTHOR AND CONTRIBUTORS ``AS IS'' AND
+ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+ARE DISCLAIMED.  IN NO EVENT SHALL THE AUTHOR OR CONTRIBUTORS BE LIABLE
+FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS
+OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)
+HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY
+OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF
+SUCH DAMAGE."""
+"""
+Tests for the logging helpers.
+"""
+
+import logging
+import logging.handlers
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from src import logging_helper
+
+logger = logging.getLogger("unit_tests")
+
+
+class FileLoggingTests(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name) / "test.log"
+
+        file_logger = logging_helper.file_logger
+        handlers = file_logger.handlers[:]
+        level = file_logger.level
+        self.addCleanup(setattr, file_logger, "handlers", handlers)
+        self.addCleanup(file_logger.setLevel, level)
+        self.addCleanup(logging_helper.stop_file_logging)
+
+    def test_writes_records_on_stop(self):
+        logging_helper.setup_file_logging(str(self.path))
+
+        logging_helper.get_file_logger().info("first")
+        logging_helper.get_file_logger().info("second")
+        logging_helper.stop_file_logging()
+
+        self.assertEqual(self.path.read_text(encoding="utf-8"), "first\nsecond\n")
+
+    def test_writes_from_background_thread(self):
+        threads = []
+        emit = logging.FileHandler.emit
+
+        def record_thread(handler, record):
+            threads.append(threading.current_thread())
+            emit(handler, record)
+
+        with mock.patch.object(logging.FileHandler, "emit", record_thread):
+            logging_helper.setup_file_logging(str(self.path))
+            logging_helper.get_file_logger().info("message")
+            logging_helper.stop_file_logging()
+
+        self.assertEqual(len(threads), 1)
+        self.assertIsNot(threads[0], threading.current_thread())
+
+    def test_respects_level(self):
+        logging_helper.setup_file_logging(str(self.path), level=logging.WARNING)
+
+        logging_helper.get_file_logger().info("ignored")
+        logging_helper.get_file_logger().warning("kept")
+        logging_helper.stop_file_logging()
+
+        self.assertEqual(self.path.read_text(encoding="utf-8"), "kept\n")
+
+    def test_setup_again_stops_previous_listener(self):
+        logging_helper.setup_file_logging(str(self.path))
+        previous = logging_helper._file_listener
+
+        with mock.patch.object(previous, "stop", wraps=previous.stop) as stop:
+            logging_helper.setup_file_logging(str(self.path), mode="a")
+
+        stop.assert_called_once_with()
+        self.assertIsNot(logging_helper._file_listener, previous)
+        self.assertEqual(
+            [
+                handler
+                for handler in logging_helper.file_logger.handlers
+                if isinstance(handler, logging.handlers.QueueHandler)
+            ],
+            [logging_helper._file_queue_handler],
+        )
+
+    def test_stop_closes_file_and_removes_handler(self):
+        logging_helper.setup_file_logging(str(self.path))
+        (file_handler,) = logging_helper._file_listener.handlers
+        queue_handler = logging_helper._file_queue_handler
+
+        logging_helper.stop_file_logging()
+
+        self.assertIsNone(file_handler.stream)
+        self.assertNotIn(queue_handler, logging_helper.file_logger.handlers)
+        self.assertIsNone(logging_helper._file_queue_handler)
+
+    def test_records_after_stop_are_not_queued(self):
+        logging_helper.setup_file_logging(str(self.path))
+        queue_handler = logging_helper._file_queue_handler
+        logging_helper.stop_file_logging()
+
+        logging_helper.get_file_logger().info("dropped")
+
+        self.assertTrue(queue_handler.queue.empty())
+
+    def test_stop_without_setup(self):
+        logging_helper.stop_file_logging()
+        logging_helper.stop_file_logging()
+
+        self.assertIsNone(logging_helper._file_listener)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,278 @@
+"""Copyright (C) 2026 Network RADIUS SAS (legal@networkradius.com)
+
+This software may not be redistributed in any form without the prior
+written consent of Network RADIUS.
+
+THIS SOFTWARE IS PROVIDED BY THE AUTHOR AND CONTRIBUTORS ``AS IS'' AND
+ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+ARE DISCLAIMED.  IN NO EVENT SHALL THE AUTHOR OR CONTRIBUTORS BE LIABLE
+FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS
+OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)
+HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY
+OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF
+SUCH DAMAGE."""
+"""
+Tests for building the tests to run against each compose file.
+"""
+
+import asyncio
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from src import multi_server_test
+from src.multi_server_test import (
+    build_tests,
+    list_yml_files,
+    parse_args,
+    parse_tests,
+    run_compose_files,
+    run_main,
+    run_tests,
+)
+
+# The repository's example test configurations
+TEST_CONFIGS = Path(__file__).parent.parent / "tests"
+
+# A configuration with an action missing its required target
+INVALID_CONFIG = """
+states:
+  state_1:
+    host:
+      radius-client:
+        actions:
+        - access_request:
+            secret: testing123
+    verify:
+      timeout: 1
+"""
+
+
+class ListYmlFilesTests(unittest.TestCase):
+    def test_matches_glob_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            directory = Path(directory)
+            for name in ("a.yml", ".hidden.yml", "b.yaml", "c.yml.bak"):
+                (directory / name).touch()
+            (directory / "dir.yml").mkdir()
+            (directory / "link.yml").symlink_to(directory / "a.yml")
+            (directory / "broken.yml").symlink_to(directory / "missing.yml")
+
+            self.assertEqual(
+                sorted(path.name for path in list_yml_files(directory)),
+                [".hidden.yml", "a.yml", "link.yml"],
+            )
+            self.assertEqual(
+                sorted(list_yml_files(directory)),
+                sorted(
+                    path for path in directory.glob("*.yml") if path.is_file()
+                ),
+            )
+
+
+class BuildTestsTestCase(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+
+        self.configs = self.directory / "configs"
+        self.configs.mkdir()
+        shutil.copy(TEST_CONFIGS / "foo.yml", self.configs)
+
+        patches = (
+            mock.patch.object(multi_server_test, "listener_dir", self.directory),
+            mock.patch.dict(os.environ),
+        )
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+
+class ParseTestsTests(BuildTestsTestCase):
+    def test_skips_invalid_files(self):
+        (self.configs / "invalid.yml").write_text(INVALID_CONFIG, encoding="utf-8")
+
+        parsed = parse_tests(self.configs, Path("compose.yml"))
+
+        self.assertEqual([test[0] for test in parsed], ["foo-compose"])
+        self.assertEqual(parsed[0][2], self.directory / "foo-compose.sock")
+
+    def test_invalid_config_raises(self):
+        config = self.configs / "invalid.yml"
+        config.write_text(INVALID_CONFIG, encoding="utf-8")
+
+        with self.assertRaises(ValueError):
+            parse_tests(config, Path("compose.yml"))
+
+    def test_file_listener_destination(self):
+        parsed = parse_tests(
+            self.configs / "foo.yml",
+            Path("compose.yml"),
+            listener_type=multi_server_test.ListenerType.FILE,
+        )
+
+        self.assertEqual(parsed[0][0], "custom_test-compose")
+        self.assertEqual(parsed[0][2], self.directory / "custom_test-compose.txt")
+
+
+class CreateTestsTests(BuildTestsTestCase):
+    async def test_build_tests(self):
+        loop = asyncio.get_running_loop()
+
+        tests = build_tests(loop, self.configs, Path("compose.yml"))
+
+        self.assertEqual([test.name for test in tests], ["foo-compose"])
+        self.assertEqual(
+            [state.name for state in tests[0].states], ["state_1", "state_2"]
+        )
+        self.assertIs(tests[0].states[0].state_completed.get_loop(), loop)
+
+    async def test_futures_created_on_loop_thread(self):
+        loop = asyncio.get_running_loop()
+        create_future = loop.create_future
+        threads = []
+
+        def record_thread():
+            threads.append(threading.get_ident())
+            return create_future()
+
+        run_tests = mock.AsyncMock()
+        with (
+            mock.patch.object(loop, "create_future", side_effect=record_thread),
+            mock.patch.object(multi_server_test, "run_tests", run_tests),
+        ):
+            await run_compose_files(
+                loop, self.configs, [Path("one.yml"), Path("two.yml")]
+            )
+
+        self.assertEqual(run_tests.await_count, 2)
+        names = sorted(
+            test.name for call in run_tests.await_args_list for test in call.args[0]
+        )
+        self.assertEqual(names, ["foo-one", "foo-two"])
+
+        # Each test and each of its states creates a future
+        self.assertGreaterEqual(len(threads), 6)
+        self.assertEqual(set(threads), {threading.get_ident()})
+
+
+class FakeTest:
+    """A test recording how many tests run with it."""
+
+    running = 0
+    most_running = 0
+
+    def __init__(self, error: BaseException | None = None) -> None:
+        self.error = error
+        self.finished = False
+
+    async def run(self, log_containers: bool) -> None:
+        FakeTest.running += 1
+        FakeTest.most_running = max(FakeTest.most_running, FakeTest.running)
+        try:
+            await asyncio.sleep(0.01 if self.error is None else 0)
+            if self.error is not None:
+                raise self.error
+            self.finished = True
+        finally:
+            FakeTest.running -= 1
+
+
+class RunTestsTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        FakeTest.running = FakeTest.most_running = 0
+
+    async def test_unlimited(self):
+        await run_tests([FakeTest() for _ in range(5)])
+
+        self.assertEqual(FakeTest.most_running, 5)
+
+    async def test_limited(self):
+        await run_tests([FakeTest() for _ in range(5)], asyncio.Semaphore(2))
+
+        self.assertEqual(FakeTest.most_running, 2)
+
+    async def test_limit_shared_by_compose_files(self):
+        slots = asyncio.Semaphore(3)
+
+        await asyncio.gather(
+            run_tests([FakeTest() for _ in range(4)], slots),
+            run_tests([FakeTest() for _ in range(4)], slots),
+        )
+
+        self.assertEqual(FakeTest.most_running, 3)
+
+
+class JobsTests(unittest.IsolatedAsyncioTestCase):
+    def test_default(self):
+        self.assertEqual(
+            parse_args([]).jobs, multi_server_test.MAX_PARALLEL_TESTS
+        )
+
+    def test_positive(self):
+        self.assertEqual(parse_args(["-j", "3"]).jobs, 3)
+
+    def test_rejects_invalid_values(self):
+        for value in ("0", "-3", "many"):
+            with (
+                self.subTest(value=value),
+                contextlib.redirect_stderr(io.StringIO()) as stderr,
+                self.assertRaises(SystemExit),
+            ):
+                parse_args(["-j", value])
+
+            self.assertIn("is not a positive integer", stderr.getvalue())
+
+    async def test_run_main_limits_tests(self):
+        FakeTest.running = FakeTest.most_running = 0
+        tests = [FakeTest() for _ in range(5)]
+
+        with (
+            tempfile.NamedTemporaryFile(suffix=".yml") as compose_file,
+            mock.patch.object(multi_server_test, "build_tests", return_value=tests),
+        ):
+            await run_main(Path(compose_file.name), {}, jobs=3)
+
+        self.assertEqual(FakeTest.most_running, 3)
+        self.assertTrue(all(test.finished for test in tests))
+
+class RunTestsErrorTests(unittest.IsolatedAsyncioTestCase):
+    async def test_value_errors_logged(self):
+        tests = [FakeTest(ValueError("bad config")), FakeTest()]
+
+        with self.assertLogs(multi_server_test.logger, "ERROR") as cm:
+            await run_tests(tests)
+
+        self.assertIn("bad config", cm.output[0])
+        self.assertTrue(tests[1].finished)
+
+    async def test_other_errors_raised_after_all_tests(self):
+        error = RuntimeError("unexpected")
+        tests = [FakeTest(error), FakeTest(), FakeTest()]
+
+        with self.assertRaises(ExceptionGroup) as cm:
+            await run_tests(tests)
+
+        self.assertEqual(cm.exception.exceptions, (error,))
+        self.assertTrue(all(test.finished for test in tests[1:]))
+
+    async def test_cancelled_test_ignored(self):
+        tests = [FakeTest(asyncio.CancelledError()), FakeTest()]
+
+        await run_tests(tests)
+
+        self.assertTrue(tests[1].finished)
+
+
+if __name__ == "__main__":
+    unittest.main()
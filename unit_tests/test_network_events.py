@@ -0,0 +1,136 @@
+"""Copyright (C) 2026 Network RADIUS SAS (legal@networkradius.com)
+
+This software may not be redistributed in any form without the prior
+written consent of Network RADIUS.
+
+THIS SOFTWARE IS PROVIDED BY THE AUTHOR AND CONTRIBUTORS ``AS IS'' AND
+ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+ARE DISCLAIMED.  IN NO EVENT SHALL THE AUTHOR OR CONTRIBUTORS BE LIABLE
+FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS
+OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)
+HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY
+OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF
+SUCH DAMAGE."""
+"""
+Tests for the network events.
+"""
+
+import asyncio
+import logging
+import threading
+import unittest
+from unittest import mock
+
+from python_on_whales.exceptions import DockerException
+
+from src.events import NetworkEvents
+
+logger = logging.getLogger("unit_tests")
+
+
+class PacketLossTests(unittest.TestCase):
+    def setUp(self):
+        patch = mock.patch.object(NetworkEvents, "exec_in")
+        self.exec_in = patch.start()
+        self.addCleanup(patch.stop)
+
+    def test_applies_and_verifies_in_one_exec(self):
+        self.exec_in.return_value = (
+            "qdisc netem 8001: root refcnt 2 limit 1000 loss 100%\n"
+        )
+
+        with self.assertNoLogs(logger, logging.ERROR):
+            NetworkEvents.packet_loss("test-freeradius-1", "eth0", 100, logger)
+
+        self.exec_in.assert_called_once_with(
+            "test-freeradius-1",
+            [
+                "bash",
+                "-c",
+                "tc qdisc replace dev eth0 root netem loss 100% "
+                "&& tc qdisc show dev eth0",
+            ],
+            detach=False,
+        )
+
+    def test_loss_not_applied(self):
+        self.exec_in.return_value = "qdisc noqueue 0: root refcnt 2\n"
+
+        with self.assertLogs(logger, logging.ERROR) as cm:
+            NetworkEvents.packet_loss("test-freeradius-1", "eth0", 50, logger)
+
+        self.assertIn("Failed to verify packet loss", cm.output[0])
+
+    def test_command_fails(self):
+        self.exec_in.side_effect = DockerException(["docker", "exec"], 1)
+
+        with self.assertLogs(logger, logging.ERROR) as cm:
+            NetworkEvents.packet_loss("test-freeradius-1", "eth0", 50, logger)
+
+        self.assertIn("Failed to apply packet loss", cm.output[0])
+
+
+class DisconnectTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        patch = mock.patch.object(NetworkEvents, "docker")
+        self.docker = patch.start()
+        self.addCleanup(patch.stop)
+
+    async def test_disconnects_source_without_targets(self):
+        await NetworkEvents.disconnect("test-network", "test-freeradius-1", logger)
+
+        self.docker.network.disconnect.assert_called_once_with(
+            "test-network", "test-freeradius-1"
+        )
+        self.docker.network.connect.assert_not_called()
+
+    async def test_disconnects_single_target(self):
+        await NetworkEvents.disconnect(
+            "test-network", "test-freeradius-1", logger, "test-client-1"
+        )
+
+        self.docker.network.disconnect.assert_called_once_with(
+            "test-network", "test-client-1"
+        )
+
+    async def test_disconnects_targets_concurrently(self):
+        targets = ["test-client-1", "test-client-2", "test-client-3"]
+        barrier = threading.Barrier(len(targets), timeout=5)
+        self.docker.network.disconnect.side_effect = lambda *_: barrier.wait()
+
+        await NetworkEvents.disconnect(
+            "test-network", "test-freeradius-1", logger, targets
+        )
+
+        self.assertCountEqual(
+            self.docker.network.disconnect.call_args_list,
+            [mock.call("test-network", target) for target in targets],
+        )
+
+    async def test_reconnects_after_timeout(self):
+        targets = ["test-client-1", "test-client-2"]
+
+        with mock.patch.object(asyncio, "sleep", mock.AsyncMock()) as sleep:
+            await NetworkEvents.disconnect(
+                "test-network", "test-freeradius-1", logger, targets, timeout=2.5
+            )
+
+        sleep.assert_awaited_once_with(2.5)
+        self.assertCountEqual(
+            self.docker.network.connect.call_args_list,
+            [mock.call("test-network", target) for target in targets],
+        )
+
+    async def test_reconnects_source_without_targets(self):
+        await NetworkEvents.reconnect("test-network", "test-freeradius-1", logger)
+
+        self.docker.network.connect.assert_called_once_with(
+            "test-network", "test-freeradius-1"
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+"""Copyright (C) 2026 Network RADIUS SAS (legal@networkradius.com)
+
+This software may not be redistributed in any form without the prior
+written consent of Network RADIUS.
+
+THIS SOFTWARE IS PROVIDED BY THE AUTHOR AND CONTRIBUTORS ``AS IS'' AND
+ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+ARE DISCLAIMED.  IN NO EVENT SHALL THE AUTHOR OR CONTRIBUTORS BE LIABLE
+FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS
+OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)
+HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY
+OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF
+SUCH DAMAGE."""
+"""
+Tests for the RADIUS events.
+"""
+
+import logging
+import unittest
+from unittest import mock
+
+from src.events import RADIUSEvents
+
+logger = logging.getLogger("unit_tests")
+
+
+class AccessRequestTests(unittest.TestCase):
+    def test_runs_radtest_without_shell(self):
+        with mock.patch.object(RADIUSEvents, "exec_in") as exec_in:
+            RADIUSEvents.access_request(
+                "test-client-1",
+                "test-freeradius-1",
+                "secret; rm -rf /",
+                "user name",
+                "$pass's word",
+                logger,
+            )
+
+        exec_in.assert_called_once_with(
+            "test-client-1",
+            [
+                "radtest",
+                "user name",
+                "$pass's word",
+                "test-freeradius-1",
+                "0",
+                "secret; rm -rf /",
+            ],
+            detach=True,
+        )
+
+    def test_non_string_values(self):
+        with mock.patch.object(RADIUSEvents, "exec_in") as exec_in:
+            RADIUSEvents.access_request("client", "server", 123, 42, 1.5, logger)
+
+        self.assertEqual(
+            exec_in.call_args.args[1],
+            ["radtest", "42", "1.5", "server", "0", "123"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
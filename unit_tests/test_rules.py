@@ -0,0 +1,246 @@
+"""Copyright (C) 2026 Network RADIUS SAS (legal@networkradius.com)
+
+This software may not be redistributed in any form without the prior
+written consent of Network RADIUS.
+
+THIS SOFTWARE IS PROVIDED BY THE AUTHOR AND CONTRIBUTORS ``AS IS'' AND
+ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+ARE DISCLAIMED.  IN NO EVENT SHALL THE AUTHOR OR CONTRIBUTORS BE LIABLE
+FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS
+OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)
+HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY
+OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF
+SUCH DAMAGE."""
+"""
+Tests for the rule functions.
+"""
+
+import logging
+import unittest
+
+from src.rules import rules
+
+logger = logging.getLogger("unit_tests")
+
+
+class CompileBlockTests(unittest.TestCase):
+    def test_compiles_once(self):
+        block = "return string == 'compiled once'"
+
+        func = rules._compile_block(block)
+
+        self.assertIs(rules._compile_block(block), func)
+        self.assertTrue(func("compiled once", logger))
+        self.assertFalse(func("other", logger))
+
+    def test_takes_string_and_logger(self):
+        func = rules._compile_block("logger.info(string)\nreturn len(string)")
+
+        with self.assertLogs(logger, logging.INFO) as cm:
+            self.assertEqual(func("abc", logger), 3)
+        self.assertEqual(cm.records[0].getMessage(), "abc")
+
+    def test_locals_not_shared(self):
+        func = rules._compile_block(
+            "try:\n    seen\nexcept NameError:\n    seen = string\nreturn seen"
+        )
+
+        self.assertEqual(func("first", logger), "first")
+        self.assertEqual(func("second", logger), "second")
+
+    def test_empty_block(self):
+        self.assertIsNone(rules._compile_block("# Nothing to check")("x", logger))
+
+    def test_syntax_error(self):
+        with self.assertRaises(SyntaxError):
+            rules._compile_block("return (")
+
+
+class CodeTests(unittest.TestCase):
+    def test_result(self):
+        with self.assertLogs(logger, logging.WARNING):
+            self.assertTrue(rules.code("return 'a' in string", logger, "cat"))
+            self.assertFalse(rules.code("return 'a' in string", logger, "dog"))
+
+    def test_decodes_bytes(self):
+        with self.assertLogs(logger, logging.WARNING):
+            self.assertEqual(
+                rules.code("return string", logger, "é".encode() + b"\xff"), "é"
+            )
+
+    def test_errors_fail(self):
+        for block in ("return (", "raise ValueError('bad')"):
+            with self.subTest(block), self.assertLogs(logger, logging.ERROR):
+                self.assertFalse(rules.code(block, logger, "x"))
+
+
+# A json rule checking a field, a nested object's field, and a field after it
+NESTED_CONDITIONS = {
+    "a": {"range": {"minimum": 1, "maximum": 2}},
+    "b": {"json": {"c": {"pattern": {"reg_pattern": "x+$"}}}},
+    "d": {"pattern": {"reg_pattern": "y"}},
+}
+
+
+class CompileJsonConditionsTests(unittest.TestCase):
+    def test_flattens_nested_conditions(self):
+        range_args = NESTED_CONDITIONS["a"]["range"]
+
+        self.assertEqual(
+            rules.compile_json_conditions(NESTED_CONDITIONS),
+            (
+                (rules._JSON_KEY, "a"),
+                (rules._JSON_CHECK, "range", rules.within_range, range_args),
+                (rules._JSON_KEY, "b"),
+                (rules._JSON_DESCEND,),
+                (rules._JSON_KEY, "c"),
+                (rules._JSON_CHECK, "pattern", rules.pattern, {"reg_pattern": "x+$"}),
+                (rules._JSON_ASCEND,),
+                (rules._JSON_KEY, "d"),
+                (rules._JSON_CHECK, "pattern", rules.pattern, {"reg_pattern": "y"}),
+            ),
+        )
+
+    def test_unknown_condition(self):
+        self.assertEqual(
+            rules.compile_json_conditions({"a": {"bogus": {}}}),
+            ((rules._JSON_KEY, "a"), (rules._JSON_CHECK, "bogus", None, {})),
+        )
+
+
+class CheckJsonTests(unittest.TestCase):
+    def check(self, conditions: dict, document: str) -> bool:
+        compiled = rules.compile_json_conditions(conditions)
+        result = rules.compiled_json_rule(compiled, logger, document)
+
+        # The uncompiled rule has the same result
+        self.assertEqual(rules.json_rule(logger, document, **conditions), result)
+        return result
+
+    def test_nested(self):
+        cases = {
+            '{"a": 1, "b": {"c": "xx"}, "d": "y"}': True,
+            '{"a": 3, "b": {"c": "xx"}, "d": "y"}': False,
+            '{"a": 1, "b": {"c": "xz"}, "d": "y"}': False,
+            '{"a": 1, "b": {"c": "xx"}, "d": "z"}': False,
+            '{"a": 1, "b": {"c": "xx"}}': False,
+            '{"a": 1, "b": {}, "d": "y"}': False,
+            '{"a": 1, "b": "xx", "d": "y"}': False,
+            '{"a": 1, "b": {"c": "xx"}, "c": "", "d": "y"}': True,
+        }
+        for document, expected in cases.items():
+            with self.subTest(document):
+                self.assertEqual(self.check(NESTED_CONDITIONS, document), expected)
+
+    def test_key_after_nested_object(self):
+        # The key is looked up in the outer object again once the nested one is done
+        conditions = {
+            "b": {"json": {"d": {"pattern": {"reg_pattern": "inner"}}}},
+            "d": {"pattern": {"reg_pattern": "outer"}},
+        }
+
+        self.assertTrue(self.check(conditions, '{"b": {"d": "inner"}, "d": "outer"}'))
+        self.assertFalse(self.check(conditions, '{"b": {"d": "outer"}, "d": "outer"}'))
+
+    def test_deeply_nested(self):
+        conditions = {"c": {"range": {"minimum": 2, "maximum": 2}}}
+        document = '{"c": 2}'
+        for _ in range(50):
+            conditions = {"n": {"json": conditions}}
+            document = f'{{"n": {document}}}'
+
+        self.assertTrue(self.check(conditions, document))
+        self.assertFalse(self.check(conditions, document.replace("2", "3")))
+
+    def test_unknown_condition(self):
+        self.assertFalse(self.check({"a": {"bogus": {}}}, '{"a": 1}'))
+        self.assertTrue(self.check({"z": {}}, '{"z": 1}'))
+
+    def test_invalid_documents(self):
+        for document in ("not json", "{}", b"[1]"):
+            with self.subTest(document):
+                self.assertFalse(self.check({"a": {}}, document))
+
+    def test_bytes(self):
+        self.assertTrue(
+            self.check({"a": {"pattern": {"reg_pattern": "x"}}}, b'{"a": "x"}')
+        )
+
+
+def range_rules(*bounds: tuple) -> list[callable]:
+    """Build a range rule for each (minimum, maximum)."""
+    methods = []
+    for minimum, maximum in bounds:
+        method = lambda x, minimum=minimum, maximum=maximum: rules.within_range(
+            minimum, maximum, logger, x
+        )
+        method.friendly_str = f"range: minimum={minimum}, maximum={maximum}"
+        methods.append(method)
+    return methods
+
+
+class RangeTests(unittest.TestCase):
+    # Values for each kind of string a message can hold
+    VALUES = (5, 5.5, "5", b"5", "x:7", b"x:7:9", "x:", "x", b"", "\u0665", "٥".encode(), None)
+
+    def test_parse_number(self):
+        cases = {
+            5: 5,
+            "5.5": 5.5,
+            b"5": 5.0,
+            " 6 ": 6.0,
+            "x:7": 7.0,
+            b"x:7:9": 7.0,
+            "٥": 5.0,
+            "٥".encode(): 5.0,
+            "x:": None,
+            "x": None,
+            b"": None,
+        }
+        for string, expected in cases.items():
+            with self.subTest(string):
+                self.assertEqual(rules.parse_number(string), expected)
+
+    def test_all_within_ranges(self):
+        bounds = ((1, 6), (5, 10))
+        methods = range_rules(*bounds)
+
+        for value in ("5", b"x:6", 5.5, "7", "0", "x", b"\xff"):
+            with self.subTest(value):
+                try:
+                    expected = rules.all_pass(methods, logger, value)
+                except rules.SingleRuleFailure as e:
+                    with self.assertRaises(rules.SingleRuleFailure) as cm:
+                        rules.all_within_ranges(bounds, methods, logger, value)
+                    self.assertEqual(cm.exception.message, e.message)
+                else:
+                    self.assertEqual(
+                        rules.all_within_ranges(bounds, methods, logger, value),
+                        expected,
+                    )
+
+    def test_all_within_ranges_reports_failing_range(self):
+        bounds = ((1, 6), (5, 10))
+
+        with self.assertRaises(rules.SingleRuleFailure) as cm:
+            rules.all_within_ranges(bounds, range_rules(*bounds), logger, "7")
+
+        self.assertEqual(cm.exception.message, "all: range: minimum=1, maximum=6")
+
+    def test_any_within_ranges(self):
+        bounds = ((1, 2), (5, 10))
+        methods = range_rules(*bounds)
+
+        for value in ("1", b"x:6", 5.5, "3", "11", "x", b"\xff"):
+            with self.subTest(value):
+                self.assertEqual(
+                    rules.any_within_ranges(bounds, logger, value),
+                    rules.any_pass(methods, logger, value),
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,460 @@
+"""Copyright (C) 2026 Network RADIUS SAS (legal@networkradius.com)
+
+This software may not be redistributed in any form without the prior
+written consent of Network RADIUS.
+
+THIS SOFTWARE IS PROVIDED BY THE AUTHOR AND CONTRIBUTORS ``AS IS'' AND
+ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+ARE DISCLAIMED.  IN NO EVENT SHALL THE AUTHOR OR CONTRIBUTORS BE LIABLE
+FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS
+OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)
+HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY
+OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF
+SUCH DAMAGE."""
+"""
+Tests for building rules from their configuration.
+"""
+
+import logging
+import re
+import unittest
+from unittest import mock
+
+from src.rules import rules, rules_tools
+from src.rules.rules_tools import (
+    bind_rule,
+    build_rule,
+    combine_patterns,
+    compile_bytes_pattern,
+    compile_pattern,
+    pattern_engine,
+    prune_constant_rules,
+)
+
+logger = logging.getLogger("unit_tests")
+
+# An Arabic-Indic digit, matched by \d in the re module but not in RE2
+ARABIC_INDIC_THREE = "٣"
+
+
+class EngineTests(unittest.TestCase):
+    def test_re_by_default(self):
+        compiled = compile_pattern(r"\d+")
+
+        self.assertIsInstance(compiled, re.Pattern)
+        self.assertEqual(pattern_engine(compiled), "re")
+
+    def test_rule_uses_re_by_default(self):
+        rule = build_rule("pattern", {"reg_pattern": r"\d+"}, logger)
+
+        self.assertEqual(pattern_engine(rule.rule_params["reg_pattern"]), "re")
+        self.assertTrue(rule(ARABIC_INDIC_THREE))
+
+    def test_unknown_engine(self):
+        with self.assertRaises(ValueError):
+            build_rule("pattern", {"reg_pattern": "a", "engine": "pcre"}, logger)
+
+    def test_re2_not_installed(self):
+        with (
+            mock.patch.object(rules_tools, "re2", None),
+            self.assertLogs(logger, logging.WARNING),
+        ):
+            rule = build_rule(
+                "pattern", {"reg_pattern": r"\d+", "engine": "re2"}, logger
+            )
+
+        self.assertEqual(pattern_engine(rule.rule_params["reg_pattern"]), "re")
+        self.assertTrue(rule(ARABIC_INDIC_THREE))
+
+
+def rule_func(first, second, logger, string, third="c", fourth="d"):
+    return (first, second, logger, string, third, fourth)
+
+
+def keyword_rule(logger, string, **kwargs):
+    return (logger, string, kwargs)
+
+
+class BindRuleTests(unittest.TestCase):
+    def test_binds_parameters(self):
+        cases = {
+            "required only": (
+                {"first": 1, "second": 2},
+                (1, 2, logger, "x", "c", "d"),
+            ),
+            "optional": (
+                {"first": 1, "second": 2, "third": 3},
+                (1, 2, logger, "x", 3, "d"),
+            ),
+            "later optional": (
+                {"first": 1, "second": 2, "fourth": 4},
+                (1, 2, logger, "x", "c", 4),
+            ),
+            "all": (
+                {"second": 2, "first": 1, "fourth": 4, "third": 3},
+                (1, 2, logger, "x", 3, 4),
+            ),
+        }
+        for name, (params, expected) in cases.items():
+            with self.subTest(name):
+                self.assertEqual(bind_rule(rule_func, params, logger)("x"), expected)
+
+    def test_keyword_parameters(self):
+        rule = bind_rule(keyword_rule, {"a": {"b": 1}}, logger)
+
+        self.assertEqual(rule("x"), (logger, "x", {"a": {"b": 1}}))
+
+    def test_missing_parameter(self):
+        with self.assertRaises(TypeError):
+            bind_rule(rule_func, {"first": 1}, logger)("x")
+
+    def test_unknown_parameter(self):
+        with self.assertRaises(TypeError):
+            bind_rule(rule_func, {"first": 1, "second": 2, "fifth": 5}, logger)("x")
+
+    def test_positional_values_bound(self):
+        params = {"first": 1, "second": 2}
+        rule = bind_rule(rule_func, params, logger)
+
+        params["first"] = 10
+
+        self.assertEqual(rule("x")[0], 1)
+
+
+class AnchorTests(unittest.TestCase):
+    def test_anchors(self):
+        strings = ("ab", "xab", "abx")
+        expected = {
+            "match": (True, False, True),
+            "fullmatch": (True, False, False),
+            "search": (True, True, True),
+        }
+        for anchor, results in expected.items():
+            rule = build_rule("pattern", {"reg_pattern": "ab", "anchor": anchor}, logger)
+            with self.subTest(anchor):
+                self.assertEqual(tuple(rule(s) for s in strings), results)
+                self.assertEqual(tuple(rule(s.encode()) for s in strings), results)
+
+    def test_unknown_anchor(self):
+        with self.assertRaises(ValueError):
+            build_rule("pattern", {"reg_pattern": "a", "anchor": "start"}, logger)
+
+    def test_json_rule_keyed_anchor(self):
+        rule = build_rule(
+            "json",
+            {"anchor": {"pattern": {"reg_pattern": "x+", "anchor": "fullmatch"}}},
+            logger,
+        )
+
+        self.assertTrue(rule('{"anchor": "xx"}'))
+        self.assertFalse(rule('{"anchor": "xy"}'))
+        self.assertFalse(rule('{"other": "xx"}'))
+
+
+class JsonRuleTests(unittest.TestCase):
+    def test_compiles_conditions(self):
+        params = {"a": {"json": {"b": {"range": {"minimum": 1, "maximum": 1}}}}}
+
+        rule = build_rule("json", params, logger)
+
+        self.assertEqual(
+            rule.rule_params, {"conditions": rules.compile_json_conditions(params)}
+        )
+        self.assertTrue(rule('{"a": {"b": 1}}'))
+        self.assertFalse(rule('{"a": {"b": 2}}'))
+        self.assertEqual(rule.friendly_str, f"json: a={params['a']}")
+
+
+class RangeRuleTests(unittest.TestCase):
+    PARAMS = {
+        "range": {"minimum": 1, "maximum": 6},
+        "may_range": {"minimum": 5, "maximum": 10},
+    }
+
+    def test_all_ranges(self):
+        rule = build_rule("all", self.PARAMS, logger)
+
+        self.assertTrue(rule("5"))
+        self.assertTrue(rule(b"x:6"))
+        with self.assertRaises(rules.SingleRuleFailure) as cm:
+            rule("7")
+        self.assertEqual(cm.exception.message, "all: range: minimum=1, maximum=6")
+        with self.assertRaises(rules.SingleRuleFailure):
+            rule("x")
+
+    def test_any_ranges(self):
+        rule = build_rule("any", self.PARAMS, logger)
+
+        self.assertTrue(rule("2"))
+        self.assertTrue(rule(b"9"))
+        self.assertFalse(rule("11"))
+        self.assertFalse(rule("x"))
+
+    def test_mixed_rules(self):
+        rule = build_rule(
+            "all",
+            {"range": {"minimum": 1, "maximum": 6}, "pattern": {"reg_pattern": "5"}},
+            logger,
+        )
+
+        self.assertTrue(rule("5"))
+        with self.assertRaises(rules.SingleRuleFailure) as cm:
+            rule("4")
+        self.assertEqual(cm.exception.message, "all: pattern: reg_pattern=5")
+
+
+class BytesPatternTests(unittest.TestCase):
+    PATTERNS = (
+        r"\w+", r"\d+$", r"[a-z]+", r"\bfoo\b", "(?i)abc", r"\W", "a.c", r"\x1c"
+    )
+    STRINGS = (b"foo bar", b"FOO", b"ABC", b"a\nc", b"123", b"a\x1cc", b"_", b"")
+
+    def test_compiles_ascii_patterns(self):
+        compiled = compile_bytes_pattern(r"(\w+) request sent")
+
+        self.assertEqual(compiled.pattern, rb"(\w+) request sent")
+        self.assertTrue(compiled.match(b"abc request sent"))
+
+    def test_unusable_patterns(self):
+        for pattern in ("é+", r"\s", r"a\S", r"\N{DIGIT ONE}", "("):
+            with self.subTest(pattern):
+                self.assertIsNone(compile_bytes_pattern(pattern))
+
+    def test_matches_like_decoded_string(self):
+        for pattern in self.PATTERNS:
+            rule = build_rule(
+                "pattern", {"reg_pattern": pattern, "anchor": "search"}, logger
+            )
+            self.assertIn("bytes_pattern", rule.rule_params)
+            for string in self.STRINGS:
+                with self.subTest(pattern=pattern, string=string):
+                    self.assertEqual(rule(string), rule(string.decode("ascii")))
+
+    def test_non_ascii_bytes_decoded(self):
+        rule = build_rule("pattern", {"reg_pattern": r"\w+$"}, logger)
+
+        self.assertTrue(rule("é".encode()))
+        self.assertFalse(rule(b"\xff"))
+
+    def test_whitespace_pattern_decoded(self):
+        rule = build_rule("pattern", {"reg_pattern": r"a\sb"}, logger)
+
+        self.assertNotIn("bytes_pattern", rule.rule_params)
+        self.assertTrue(rule(b"a\x1cb"))
+        self.assertTrue(rule("a\x1cb"))
+
+
+def constant_rules(*conditions: str) -> list[callable]:
+    """Build a rule for each condition, with only a message parameter."""
+    return [build_rule(c, {"msg": c}, logger) for c in conditions]
+
+
+class PruneConstantRulesTests(unittest.TestCase):
+    def names(self, methods: list[callable]) -> list[str]:
+        return [m.friendly_str.partition(":")[0] for m in methods]
+
+    def test_all(self):
+        methods = constant_rules("pass", "never_fire", "fire") + pattern_rules("a")
+        methods.insert(1, pattern_rules("b")[0])
+
+        # Passing rules are dropped, and nothing after a failing rule is reached
+        self.assertEqual(
+            self.names(prune_constant_rules(rules.all_pass, methods)),
+            ["pattern", "never_fire"],
+        )
+
+    def test_any(self):
+        methods = constant_rules("fail", "pass", "never_fire") + pattern_rules("a")
+        methods.insert(1, pattern_rules("b")[0])
+
+        # Failing rules are dropped, and nothing after a passing rule is reached
+        self.assertEqual(
+            self.names(prune_constant_rules(rules.any_pass, methods)),
+            ["pattern", "pass"],
+        )
+
+    def test_keeps_order(self):
+        methods = pattern_rules("a", "b", "c")
+
+        self.assertEqual(prune_constant_rules(rules.all_pass, methods), methods)
+        self.assertEqual(prune_constant_rules(rules.any_pass, methods), methods)
+
+    def test_other_function(self):
+        methods = constant_rules("pass", "fail")
+
+        self.assertIs(prune_constant_rules(rules.within_range, methods), methods)
+
+    def test_rules_with_other_params_not_constant(self):
+        method = build_rule("pass", {"msg": "x", "extra": 1}, logger)
+
+        self.assertFalse(hasattr(method, "constant_result"))
+        self.assertEqual(prune_constant_rules(rules.all_pass, [method]), [method])
+
+
+class ConstantControlRuleTests(unittest.TestCase):
+    def test_results(self):
+        cases = {
+            ("all", ("pass", "fire")): True,
+            ("all", ()): True,
+            ("any", ("fail", "never_fire")): False,
+            ("any", ("fail", "pass")): True,
+            ("any", ()): False,
+        }
+        for (control, conditions), expected in cases.items():
+            rule = build_rule(
+                control, {c: {"msg": c} for c in conditions}, logger
+            )
+            with self.subTest(control=control, conditions=conditions):
+                self.assertIs(rule.constant_result, expected)
+                self.assertIs(rule("x"), expected)
+
+    def test_not_constant(self):
+        rule = build_rule(
+            "any", {"fail": {"msg": "no"}, "pattern": {"reg_pattern": "a"}}, logger
+        )
+
+        self.assertFalse(hasattr(rule, "constant_result"))
+        self.assertTrue(rule("a"))
+        self.assertFalse(rule("b"))
+
+    def test_all_fails_on_constant_rule(self):
+        rule = build_rule(
+            "all", {"pattern": {"reg_pattern": "a"}, "fail": {"msg": "no"}}, logger
+        )
+
+        with self.assertRaises(rules.SingleRuleFailure) as cm:
+            rule("a")
+        self.assertEqual(cm.exception.message, "all: fail: msg=no")
+
+    def test_friendly_string_lists_pruned_rules(self):
+        rule = build_rule(
+            "all", {"pass": {"msg": "yes"}, "pattern": {"reg_pattern": "a"}}, logger
+        )
+
+        self.assertEqual(
+            rule.friendly_str, "all: pass: msg=yes, pattern: reg_pattern=a"
+        )
+        self.assertEqual(len(rule.rule_params["methods"]), 1)
+
+
+def pattern_rules(*patterns: str) -> list[callable]:
+    """Build a pattern rule for each pattern."""
+    return [build_rule("pattern", {"reg_pattern": p}, logger) for p in patterns]
+
+
+class CombinePatternsTests(unittest.TestCase):
+    def test_combines_patterns(self):
+        combined = combine_patterns(pattern_rules("a+", "b+"))
+
+        self.assertEqual(combined.pattern, "(?:a+)|(?:b+)")
+
+    def test_not_combined(self):
+        cases = {
+            "single pattern": pattern_rules("a"),
+            "group reference": pattern_rules(r"(a)\1", "b"),
+            "named group reference": pattern_rules("(?P<x>a)(?P=x)", "b"),
+            "global flags": pattern_rules("(?i)a", "b"),
+            "global flags in a later pattern": pattern_rules("a", "(?s)b"),
+            "duplicate group names": pattern_rules("(?P<x>a)", "(?P<x>b)"),
+            "anchor": [
+                build_rule("pattern", {"reg_pattern": "a", "anchor": "search"}, logger),
+                *pattern_rules("b"),
+            ],
+            "other rule": [
+                *pattern_rules("a"),
+                build_rule("range", {"minimum": 1, "maximum": 2}, logger),
+            ],
+        }
+        for name, methods in cases.items():
+            with self.subTest(name):
+                self.assertIsNone(combine_patterns(methods))
+
+    def test_combines_scoped_flags(self):
+        combined = combine_patterns(pattern_rules("(?i:a)", "b"))
+
+        self.assertEqual(combined.pattern, "(?:(?i:a))|(?:b)")
+        self.assertTrue(combined.match("A"))
+        self.assertFalse(combined.match("B"))
+
+    def test_any_rule_keeps_global_flags_to_their_pattern(self):
+        rule = build_rule(
+            "any",
+            {"pattern": {"reg_pattern": "(?i)x"}, "may_pattern": {"reg_pattern": "y"}},
+            logger,
+        )
+
+        self.assertTrue(rule("X"))
+        self.assertTrue(rule("y"))
+        self.assertFalse(rule("Y"))
+
+    def test_any_rule_matches_bytes(self):
+        rule = build_rule(
+            "any",
+            {"pattern": {"reg_pattern": "x+"}, "may_pattern": {"reg_pattern": "y+"}},
+            logger,
+        )
+
+        self.assertTrue(rule(b"yy"))
+        self.assertTrue(rule("xx"))
+        self.assertFalse(rule(b"zz"))
+
+
+@unittest.skipIf(rules_tools.re2 is None, "google-re2 isn't installed")
+class Re2EngineTests(unittest.TestCase):
+    def test_rule_opts_in(self):
+        rule = build_rule(
+            "pattern", {"reg_pattern": r"\d+", "engine": "re2"}, logger
+        )
+
+        self.assertNotIn("engine", rule.rule_params)
+        self.assertEqual(pattern_engine(rule.rule_params["reg_pattern"]), "re2")
+        self.assertEqual(pattern_engine(rule.rule_params["bytes_pattern"]), "re2")
+        self.assertTrue(rule("123"))
+        self.assertTrue(rule(b"123"))
+        self.assertFalse(rule(ARABIC_INDIC_THREE))
+
+    def test_unsupported_pattern_uses_re(self):
+        compiled = compile_pattern(r"(a)\1", "re2")
+
+        self.assertEqual(pattern_engine(compiled), "re")
+        self.assertTrue(compiled.match("aa"))
+
+    def test_combines_same_engine(self):
+        methods = [
+            build_rule("pattern", {"reg_pattern": p, "engine": "re2"}, logger)
+            for p in ("a+", "b+")
+        ]
+
+        combined = combine_patterns(methods)
+
+        self.assertEqual(pattern_engine(combined), "re2")
+        self.assertEqual(combined.pattern, "(?:a+)|(?:b+)")
+
+    def test_does_not_combine_engines(self):
+        methods = [
+            build_rule("pattern", {"reg_pattern": "a+", "engine": "re2"}, logger),
+            build_rule("pattern", {"reg_pattern": "b+"}, logger),
+        ]
+
+        self.assertIsNone(combine_patterns(methods))
+
+    def test_any_rule_keeps_each_engine(self):
+        rule = build_rule(
+            "any",
+            {
+                "pattern": {"reg_pattern": r"x\d", "engine": "re2"},
+                "may_pattern": {"reg_pattern": r"y\d"},
+            },
+            logger,
+        )
+
+        self.assertTrue(rule("x1"))
+        self.assertFalse(rule("x" + ARABIC_INDIC_THREE))
+        self.assertTrue(rule("y" + ARABIC_INDIC_THREE))
+
+
+if __name__ == "__main__":
+    unittest.main()
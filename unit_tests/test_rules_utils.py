@@ -0,0 +1,92 @@
+"""Copyright (C) 2026 Network RADIUS SAS (legal@networkradius.com)
+
+This software may not be redistributed in any form without the prior
+written consent of Network RADIUS.
+
+THIS SOFTWARE IS PROVIDED BY THE AUTHOR AND CONTRIBUTORS ``AS IS'' AND
+ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+ARE DISCLAIMED.  IN NO EVENT SHALL THE AUTHOR OR CONTRIBUTORS BE LIABLE
+FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS
+OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)
+HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY
+OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF
+SUCH DAMAGE."""
+"""
+Tests for the rule utility functions.
+"""
+
+import base64
+import logging
+import unittest
+from unittest import mock
+
+from src.rules import utils
+from src.rules.utils import safe_json_load
+
+logger = logging.getLogger("unit_tests")
+
+
+def encoded(value: str) -> str:
+    """Base64-encode a latin1 string, as safe_json_load does for octets."""
+    return base64.b64encode(value.encode("latin1")).decode("ascii")
+
+
+class SafeJsonLoadTests(unittest.TestCase):
+    def test_without_octets(self):
+        self.assertEqual(
+            safe_json_load(logger, b'{"a": {"type": "string", "value": "x"}}'),
+            {"a": {"type": "string", "value": "x"}},
+        )
+
+    def test_encodes_octets(self):
+        data = safe_json_load(
+            logger,
+            b'{"a": [{"b": {"type": "octets", "value": "\xff\x7f"}}], "c": 1}',
+        )
+
+        self.assertEqual(
+            data,
+            {"a": [{"b": {"type": "octets", "value": encoded("\xff\x7f")}}], "c": 1},
+        )
+
+    def test_encodes_escaped_octets(self):
+        data = safe_json_load(
+            logger, '{"a": {"type": "\\u006fctets", "value": "\\u00ff"}}'
+        )
+
+        self.assertEqual(data, {"a": {"type": "octets", "value": encoded("\xff")}})
+
+    def test_escapes_without_octets(self):
+        self.assertEqual(
+            safe_json_load(logger, '{"a": "line\\nbreak"}'), {"a": "line\nbreak"}
+        )
+
+    def test_deeply_nested(self):
+        depth = 500
+        raw_data = '{"a": ' * depth + '{"type": "octets", "value": "x"}' + "}" * depth
+
+        data = safe_json_load(logger, raw_data)
+        for _ in range(depth):
+            data = data["a"]
+
+        self.assertEqual(data, {"type": "octets", "value": encoded("x")})
+
+    def test_invalid_json(self):
+        self.assertEqual(safe_json_load(logger, b"{not json"), {})
+
+    def test_without_orjson(self):
+        with mock.patch.object(utils, "orjson", None):
+            self.assertEqual(
+                safe_json_load(logger, '{"a": {"type": "octets", "value": "x"}}'),
+                {"a": {"type": "octets", "value": encoded("x")}},
+            )
+
+    def test_orjson_rejected_documents(self):
+        self.assertEqual(safe_json_load(logger, '{"a": NaN}').keys(), {"a"})
+
+
+if __name__ == "__main__":
+    unittest.main()
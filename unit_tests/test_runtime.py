@@ -0,0 +1,109 @@
+"""Copyright (C) 2026 Network RADIUS SAS (legal@networkradius.com)
+
+This software may not be redistributed in any form without the prior
+written consent of Network RADIUS.
+
+THIS SOFTWARE IS PROVIDED BY THE AUTHOR AND CONTRIBUTORS ``AS IS'' AND
+ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+ARE DISCLAIMED.  IN NO EVENT SHALL THE AUTHOR OR CONTRIBUTORS BE LIABLE
+FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS
+OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)
+HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY
+OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF
+SUCH DAMAGE."""
+"""
+Tests for the event loop setup.
+"""
+
+import asyncio
+import logging
+import unittest
+from unittest import mock
+
+from src import runtime
+
+logger = logging.getLogger("unit_tests")
+
+
+class NewEventLoopTests(unittest.TestCase):
+    def new_event_loop(self) -> asyncio.AbstractEventLoop:
+        loop = runtime.new_event_loop()
+        self.addCleanup(loop.close)
+        return loop
+
+    def test_uses_uvloop_when_available(self):
+        uvloop = mock.Mock()
+        uvloop.new_event_loop.side_effect = asyncio.new_event_loop
+
+        with (
+            mock.patch.object(runtime, "uvloop", uvloop),
+            mock.patch.object(runtime.sys, "platform", "linux"),
+        ):
+            self.assertTrue(runtime.uvloop_available())
+            self.new_event_loop()
+
+        uvloop.new_event_loop.assert_called_once_with()
+
+    def test_falls_back_without_uvloop(self):
+        with mock.patch.object(runtime, "uvloop", None):
+            self.assertFalse(runtime.uvloop_available())
+            loop = self.new_event_loop()
+
+        self.assertIsInstance(loop, asyncio.AbstractEventLoop)
+        self.assertEqual(loop.run_until_complete(asyncio.sleep(0, "done")), "done")
+
+    def test_skips_uvloop_on_windows(self):
+        uvloop = mock.Mock()
+
+        with (
+            mock.patch.object(runtime, "uvloop", uvloop),
+            mock.patch.object(runtime.sys, "platform", "win32"),
+        ):
+            self.assertFalse(runtime.uvloop_available())
+            self.new_event_loop()
+
+        uvloop.new_event_loop.assert_not_called()
+
+    def test_sets_eager_task_factory(self):
+        factory = mock.Mock()
+
+        with (
+            mock.patch.object(runtime, "uvloop", None),
+            mock.patch.object(asyncio, "eager_task_factory", factory, create=True),
+        ):
+            loop = self.new_event_loop()
+
+        self.assertIs(loop.get_task_factory(), factory)
+
+    def test_default_task_factory_without_eager_tasks(self):
+        with mock.patch.object(runtime, "uvloop", None):
+            if hasattr(asyncio, "eager_task_factory"):
+                with mock.patch.object(asyncio, "eager_task_factory", None):
+                    loop = self.new_event_loop()
+            else:
+                loop = self.new_event_loop()
+
+        self.assertIsNone(loop.get_task_factory())
+
+    @unittest.skipUnless(
+        hasattr(asyncio, "eager_task_factory"), "eager tasks need Python 3.12+"
+    )
+    def test_tasks_start_eagerly(self):
+        loop = self.new_event_loop()
+        started = []
+
+        async def task():
+            started.append(True)
+
+        async def create():
+            loop.create_task(task())
+            return list(started)
+
+        self.assertEqual(loop.run_until_complete(create()), [True])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+"""Copyright (C) 2026 Network RADIUS SAS (legal@networkradius.com)
+
+This software may not be redistributed in any form without the prior
+written consent of Network RADIUS.
+
+THIS SOFTWARE IS PROVIDED BY THE AUTHOR AND CONTRIBUTORS ``AS IS'' AND
+ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+ARE DISCLAIMED.  IN NO EVENT SHALL THE AUTHOR OR CONTRIBUTORS BE LIABLE
+FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS
+OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)
+HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY
+OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF
+SUCH DAMAGE."""
+"""
+Tests for the persistent container shells.
+
+The shells are started with a local bash instead of `docker exec`.
+"""
+
+import os
+import subprocess
+import unittest
+from unittest import mock
+
+from python_on_whales.exceptions import DockerException
+
+from src.events import _shell_pool
+
+_popen = subprocess.Popen
+
+
+def local_bash(args, **kwargs):
+    """Start bash locally in place of the `docker exec -i <container> bash` shell."""
+    return _popen(["bash"], **kwargs)
+
+
+class ShellExecTests(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(_shell_pool.subprocess, "Popen", side_effect=local_bash)
+        self.popen = patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.shell = _shell_pool.ShellExec("container")
+        self.addCleanup(self.shell.close)
+
+    def test_returns_stdout(self):
+        self.assertEqual(self.shell.run("echo hello; echo world"), "hello\nworld")
+
+    def test_output_without_trailing_newline(self):
+        self.assertEqual(self.shell.run("printf abc"), "abc")
+
+    def test_stderr_not_in_output(self):
+        self.assertEqual(self.shell.run("echo out; echo err >&2"), "out")
+
+    def test_failure_includes_stderr(self):
+        with self.assertRaises(DockerException) as raised:
+            self.shell.run("echo partial; echo 'it broke' >&2; exit 4")
+
+        self.assertEqual(raised.exception.return_code, 4)
+        self.assertEqual(raised.exception.stdout, "partial\n")
+        self.assertEqual(raised.exception.stderr, "it broke\n")
+        self.assertEqual(
+            raised.exception.docker_command[:3], ["docker", "exec", "container"]
+        )
+
+    def test_stderr_is_per_command(self):
+        with self.assertRaises(DockerException):
+            self.shell.run("echo first >&2; false")
+
+        with self.assertRaises(DockerException) as raised:
+            self.shell.run("echo second >&2; false")
+
+        self.assertEqual(raised.exception.stderr, "second\n")
+
+    def test_commands_share_one_shell(self):
+        self.shell.run("true")
+        self.shell.run("true")
+
+        self.assertEqual(self.popen.call_count, 1)
+
+    def test_commands_dont_change_shell_state(self):
+        self.shell.run("cd /; FOO=bar")
+
+        self.assertEqual(self.shell.run('echo "${FOO:-unset}"'), "unset")
+
+    def test_commands_dont_read_following_input(self):
+        self.assertEqual(self.shell.run("cat"), "")
+        self.assertEqual(self.shell.run("echo next"), "next")
+
+    def test_close_removes_stderr_file(self):
+        path = self.shell.run(f'echo "${_shell_pool.STDERR_VARIABLE}"')
+        self.assertTrue(os.path.exists(path))
+
+        self.shell.close()
+
+        self.assertFalse(os.path.exists(path))
+
+    def test_restarts_after_shell_exits(self):
+        with self.assertRaises(DockerException):
+            self.shell.run("kill -9 $$")
+
+        self.assertEqual(self.shell.run("echo again"), "again")
+        self.assertEqual(self.popen.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+"""Copyright (C) 2026 Network RADIUS SAS (legal@networkradius.com)
+
+This software may not be redistributed in any form without the prior
+written consent of Network RADIUS.
+
+THIS SOFTWARE IS PROVIDED BY THE AUTHOR AND CONTRIBUTORS ``AS IS'' AND
+ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+ARE DISCLAIMED.  IN NO EVENT SHALL THE AUTHOR OR CONTRIBUTORS BE LIABLE
+FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS
+OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)
+HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY
+OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF
+SUCH DAMAGE."""
+"""
+Tests for loading test configurations and generating their states.
+"""
+
+import copy
+import logging
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from src.states.state_tools import (
+    action_parameters,
+    load_test_config,
+    parse_test_configs,
+)
+
+logger = logging.getLogger("unit_tests")
+
+# The repository's example test configurations
+TEST_CONFIGS = Path(__file__).parent.parent / "tests"
+
+
+class ActionParametersTests(unittest.TestCase):
+    def test_arguments_only(self):
+        def action(target, secret, *args, logger=None, **kwargs):
+            local = target
+            return local
+
+        self.assertEqual(action_parameters(action), {"target", "secret", "logger"})
+
+    def test_cached(self):
+        def action(source):
+            pass
+
+        parameters = action_parameters(action)
+
+        self.assertIs(action_parameters(action), parameters)
+
+
+class LoadTestConfigTests(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.config = Path(directory.name, "test.yml")
+        self.config.write_text("timeout: 10\n", encoding="utf-8")
+
+    def test_reuses_parsed_config(self):
+        config = load_test_config(self.config)
+
+        self.assertEqual(config, {"timeout": 10})
+        self.assertIs(load_test_config(self.config), config)
+
+    def test_reloads_changed_config(self):
+        config = load_test_config(self.config)
+
+        self.config.write_text("timeout: 200\n", encoding="utf-8")
+
+        self.assertEqual(load_test_config(self.config), {"timeout": 200})
+        self.assertIsNot(load_test_config(self.config), config)
+
+    def test_reloads_same_size_config(self):
+        load_test_config(self.config)
+        stat = self.config.stat()
+
+        self.config.write_text("timeout: 20\n", encoding="utf-8")
+        os.utime(self.config, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+
+        self.assertEqual(load_test_config(self.config), {"timeout": 20})
+
+    def test_missing_config(self):
+        with self.assertRaises(FileNotFoundError):
+            load_test_config(self.config.with_name("missing.yml"))
+
+
+class ParseTestConfigsTests(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.config = Path(shutil.copy(TEST_CONFIGS / "foo.yml", directory.name))
+
+    def test_does_not_modify_shared_config(self):
+        raw_config = copy.deepcopy(load_test_config(self.config))
+
+        for test_name in ("first", "second"):
+            timeout, state_order, states = parse_test_configs(
+                self.config, test_name, logger
+            )
+
+        self.assertEqual(load_test_config(self.config), raw_config)
+        self.assertEqual((timeout, state_order), (40, "sequence"))
+        self.assertEqual([state["name"] for state in states], ["state_1", "state_2"])
+
+    def test_actions_use_their_test_name(self):
+        calls = []
+
+        def access_request(target, source, secret, username, password, logger):
+            calls.append((target, source))
+
+        with mock.patch(
+            "src.states.state_tools.get_events",
+            return_value={"access_request": access_request},
+        ):
+            configs = [
+                parse_test_configs(self.config, test_name, logger)[2]
+                for test_name in ("first", "second")
+            ]
+        for states in configs:
+            states[0]["actions"][0](logger)
+
+        # Each test's actions run against their own containers
+        self.assertEqual(
+            calls,
+            [
+                ("first-freeradius-1", "first-radius-client-1"),
+                ("second-freeradius-1", "second-radius-client-1"),
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,237 @@
+"""Copyright (C) 2026 Network RADIUS SAS (legal@networkradius.com)
+
+This software may not be redistributed in any form without the prior
+written consent of Network RADIUS.
+
+THIS SOFTWARE IS PROVIDED BY THE AUTHOR AND CONTRIBUTORS ``AS IS'' AND
+ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+ARE DISCLAIMED.  IN NO EVENT SHALL THE AUTHOR OR CONTRIBUTORS BE LIABLE
+FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS
+OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)
+HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY
+OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF
+SUCH DAMAGE."""
+"""
+Tests for validating messages against a state's rules.
+"""
+
+import asyncio
+import logging
+import re
+import unittest
+from unittest import mock
+
+from src.listener import FastQueue
+from src.rules.rules_tools import build_rule, generate_rules_map
+from src.Validator import MissingRuleError, Validator
+
+logger = logging.getLogger("unit_tests")
+
+# Colors are added when the output is a terminal
+ANSI_ESCAPE = re.compile(r"\x1b\[[0-9;]*m")
+
+# A must, a never and a may rule, each for their own trigger
+STATE = {
+    "verify": {
+        "triggers": [
+            {"must": {"pattern": {"reg_pattern": "x"}}},
+            {"never": {"never_fire": {"msg": "no"}}},
+            {"maybe": {"may_pattern": {"reg_pattern": "y"}}},
+        ]
+    }
+}
+
+
+def uncalled_rule(friendly_str: str, constant_result: bool = None) -> mock.Mock:
+    """A rule that fails the test when it's called."""
+    rule = mock.Mock(side_effect=AssertionError("Rule was called"))
+    rule.friendly_str = friendly_str
+    rule.constant_result = constant_result
+    return rule
+
+
+class ValidatorTestCase(unittest.IsolatedAsyncioTestCase):
+    def validator(self, rules_map: dict | None = None) -> Validator:
+        if rules_map is None:
+            rules_map = generate_rules_map(state=STATE, logger=logger)
+        return Validator(
+            rules_map, asyncio.get_running_loop().create_future(), logger
+        )
+
+    def results(self, validator: Validator, detailed: bool = False) -> list[str]:
+        """The lines of the results between the separators."""
+        output = ANSI_ESCAPE.sub("", validator.get_results_str(detailed))
+        return output.split("-" * len("Validation Results") + "\n")[2].splitlines()
+
+
+class PlanTests(ValidatorTestCase):
+    async def test_initial_tracking(self):
+        validator = self.validator()
+
+        # Never rules start out passed, must rules failed and may rules untracked
+        self.assertEqual(
+            self.results(validator, detailed=True),
+            ["never:", "    never_fire: msg=no", "must:", "    pattern: reg_pattern=x"],
+        )
+
+    async def test_must_rule_passes(self):
+        validator = self.validator()
+
+        self.assertFalse(validator.validate("must", "z"))
+        self.assertTrue(validator.validate("must", "x"))
+
+        self.assertEqual(self.results(validator), ["never: 1/1", "must: 1/1"])
+
+    async def test_never_rule_fails(self):
+        validator = self.validator()
+
+        self.assertFalse(validator.validate("never", "x"))
+
+        self.assertEqual(
+            self.results(validator, detailed=True),
+            ["never:", "    never_fire: msg=no", "must:", "    pattern: reg_pattern=x"],
+        )
+        self.assertEqual(
+            self.results(validator),
+            ["never: 0/1", "must:", "    pattern: reg_pattern=x"],
+        )
+
+    async def test_may_rule_passes(self):
+        validator = self.validator()
+
+        self.assertTrue(validator.validate("maybe", "y"))
+
+        self.assertEqual(
+            self.results(validator),
+            ["never: 1/1", "maybe: 1/1", "must:", "    pattern: reg_pattern=x"],
+        )
+
+    async def test_missing_rule(self):
+        with self.assertRaises(MissingRuleError) as cm:
+            self.validator().validate("unknown", "x")
+
+        self.assertEqual(cm.exception.attribute, "unknown")
+
+    async def test_constant_rules_not_called(self):
+        never = uncalled_rule("may_fail: msg=no", constant_result=False)
+        fire = uncalled_rule("may_fire: msg=yes", constant_result=True)
+        validator = self.validator({"a": [never, fire]})
+
+        self.assertTrue(validator.validate("a", "x"))
+        never.assert_not_called()
+        fire.assert_not_called()
+
+    async def test_rules_without_constant_result_called(self):
+        # The name alone doesn't make a rule constant
+        rule = mock.Mock(return_value=True)
+        rule.friendly_str = "fail: msg=no"
+        rule.constant_result = None
+        validator = self.validator({"a": [rule]})
+
+        self.assertTrue(validator.validate("a", "x"))
+        rule.assert_called_once_with("x")
+
+    async def test_constant_control_rule(self):
+        # All the sub-rules are pruned, so the 'all' rule always passes
+        built = build_rule("all", {"pass": {"msg": "yes"}}, logger)
+        rule = uncalled_rule(built.friendly_str, built.constant_result)
+        validator = self.validator(
+            {"a": [rule, uncalled_rule("pattern: reg_pattern=x")]}
+        )
+
+        self.assertTrue(validator.validate("a", "x"))
+        rule.assert_not_called()
+
+    async def test_rules_after_passing_rule_not_evaluated(self):
+        later = uncalled_rule("pattern: reg_pattern=x")
+        validator = self.validator(
+            {"a": [build_rule("pass", {"msg": "yes"}, logger), later]}
+        )
+
+        self.assertTrue(validator.validate("a", "x"))
+
+        # The unreachable rule is still reported as unmatched
+        self.assertEqual(
+            self.results(validator, detailed=True),
+            ["a:", "    pass: msg=yes", "    pattern: reg_pattern=x"],
+        )
+
+    async def test_start_validating(self):
+        loop = asyncio.get_running_loop()
+        state_completed = loop.create_future()
+        validator = Validator(
+            generate_rules_map(state=STATE, logger=logger), state_completed, logger
+        )
+        queue = FastQueue()
+
+        task = asyncio.create_task(validator.start_validating(queue))
+        queue.put_many([("unknown", b"x"), ("must", b"z"), ("must", b"x")])
+        await asyncio.sleep(0)
+        self.assertEqual(self.results(validator), ["never: 1/1", "must: 1/1"])
+
+        state_completed.set_result(True)
+        queue.put_nowait(("never", b"x"))
+        async with asyncio.timeout(1):
+            await task
+
+        # The batch waking the validator is still validated before it finishes
+        self.assertEqual(self.results(validator), ["never: 0/1", "must: 1/1"])
+        self.assertTrue(queue.empty())
+
+
+class ResultsCacheTests(ValidatorTestCase):
+    async def test_reuses_results(self):
+        validator = self.validator()
+
+        results = validator.get_results_str()
+
+        self.assertIs(validator.get_results_str(), results)
+        self.assertIsNot(validator.get_results_str(detailed=True), results)
+        self.assertIs(
+            validator.get_results_str(detailed=True),
+            validator.get_results_str(detailed=True),
+        )
+
+    async def test_passing_rule_updates_results(self):
+        validator = self.validator()
+        self.assertEqual(
+            self.results(validator),
+            ["never: 1/1", "must:", "    pattern: reg_pattern=x"],
+        )
+        detailed = validator.get_results_str(detailed=True)
+
+        validator.validate("must", "x")
+
+        self.assertEqual(self.results(validator), ["never: 1/1", "must: 1/1"])
+        self.assertNotEqual(validator.get_results_str(detailed=True), detailed)
+
+    async def test_failing_rule_updates_results(self):
+        validator = self.validator()
+        self.assertEqual(self.results(validator)[0], "never: 1/1")
+
+        validator.validate("never", "x")
+
+        self.assertEqual(self.results(validator)[0], "never: 0/1")
+
+    async def test_start_validating_updates_results(self):
+        loop = asyncio.get_running_loop()
+        state_completed = loop.create_future()
+        validator = Validator(
+            generate_rules_map(state=STATE, logger=logger), state_completed, logger
+        )
+        queue = FastQueue()
+        self.assertEqual(self.results(validator)[1], "must:")
+
+        task = asyncio.create_task(validator.start_validating(queue))
+        self.addCleanup(task.cancel)
+        queue.put_nowait(("must", b"x"))
+        await asyncio.sleep(0)
+
+        self.assertEqual(self.results(validator)[1], "must: 1/1")
+
+
+if __name__ == "__main__":
+    unittest.main()